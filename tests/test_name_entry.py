@@ -0,0 +1,79 @@
+"""
+Inserimento del nome a fine partita quando il nome è già in classifica (sovrascrivi / numera).
+"""
+import ast
+import builtins
+import os
+import sys
+
+VOLCANO_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "volcano")
+sys.path.insert(0, VOLCANO_DIR)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from save_system import add_score, force_add_score, add_score_with_number, load_high_scores
+
+
+@pytest.fixture
+def screen(tmp_path, monkeypatch):
+    # I punteggi si salvano nella cartella corrente (resource_path): un file nuovo per ogni test
+    monkeypatch.chdir(tmp_path)
+    pygame.init()
+    yield pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.quit()
+
+
+@pytest.fixture
+def ui():
+    from ui_system import UISystem
+    return UISystem()
+
+
+def press(key):
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, unicode="", mod=0, scancode=0))
+
+
+def test_duplicate_name_overwrite(screen, ui):
+    add_score("Lava", 100)
+    result, _ = add_score("Lava", 500)
+    assert result == 'duplicate'
+    press(pygame.K_s)
+    assert ui.confirm_overwrite(screen, "Lava") is True
+    force_add_score("Lava", 500)
+    assert [(s['name'], s['score']) for s in load_high_scores()] == [("Lava", 500)]
+
+
+def test_duplicate_name_numbered(screen, ui):
+    add_score("Lava", 100)
+    result, _ = add_score("Lava", 500)
+    assert result == 'duplicate'
+    # Tasti diversi da S/N vengono ignorati finché non arriva la risposta
+    press(pygame.K_x)
+    press(pygame.K_n)
+    assert ui.confirm_overwrite(screen, "Lava") is False
+    add_score_with_number("Lava", 500)
+    assert [(s['name'], s['score']) for s in load_high_scores()] == [("Lava2", 500), ("Lava", 100)]
+
+
+def test_main_names_are_defined():
+    """Ogni nome letto a livello di modulo in main.py è importato, definito o builtin (niente NameError)."""
+    with open(os.path.join(VOLCANO_DIR, "main.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    defined = set(dir(builtins)) | {"__file__", "__name__"}
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            defined.update((alias.asname or alias.name).split('.')[0] for alias in node.names)
+        elif isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            defined.add(node.name)
+        elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            defined.add(node.id)
+        elif isinstance(node, ast.arg):
+            defined.add(node.arg)
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            defined.add(node.name)
+    used = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load)}
+    assert used <= defined, sorted(used - defined)
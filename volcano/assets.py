@@ -0,0 +1,24 @@
+"""
+Caricamento immagini condiviso: ogni immagine viene letta e scalata una sola volta per processo
+"""
+import pygame
+import sys, os
+
+# Funzione per path portatile (PyInstaller)
+def resource_path(relative_path):
+    if hasattr(sys, '_MEIPASS'):
+        return os.path.join(sys._MEIPASS, relative_path)
+    return os.path.join(os.path.abspath("."), relative_path)
+
+_image_cache = {}
+
+def load_scaled_image(relative_path, size, alpha=True):
+    """Carica un'immagine scalata a size. La superficie è condivisa: non va modificata."""
+    key = (relative_path, size, alpha)
+    image = _image_cache.get(key)
+    if image is None:
+        image = pygame.image.load(resource_path(relative_path))
+        image = image.convert_alpha() if alpha else image.convert()
+        image = pygame.transform.scale(image, size)
+        _image_cache[key] = image
+    return image
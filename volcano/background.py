@@ -6,6 +6,7 @@ import math
 import random
 from volcano.constants import *
 from levels import *
+from sprite_cache import circle_sprite
 
 def draw_enhanced_background(world_offset, screen):
     """Draw the enhanced background with smooth transitions."""
@@ -68,10 +69,8 @@ def add_environmental_effects(surface, level, world_offset):
             size = 2 + (particle_seed % 4)
             alpha = 50 + (particle_seed % 101)
 
-            particle_surface = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
             color_variation = 100 + (particle_seed % 101)
-            color = (255, color_variation, 0, alpha)
-            pygame.draw.circle(particle_surface, color, (size, size), size)
+            particle_surface = circle_sprite(size, (255, color_variation, 0), alpha)
             surface.blit(particle_surface, (x-size, y-size))
 
     elif level == LEVEL_CROSTA:
@@ -129,12 +128,10 @@ def add_environmental_effects(surface, level, world_offset):
                 x = max(0, min(SCREEN_WIDTH, x))
             
             size = 1 + (spark_seed % 4)
-            spark_surface = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
             
             intensity = 0.5 + height_ratio * 0.5
-            color = (255, int(255 * intensity), random.randint(0, int(100 * intensity)), 
-                    random.randint(100, 255))
-            pygame.draw.circle(spark_surface, color, (size, size), size)
+            color = (255, int(255 * intensity), random.randint(0, int(100 * intensity)))
+            spark_surface = circle_sprite(size, color, random.randint(100, 255))
             surface.blit(spark_surface, (x-size, y-size))
 
 def draw_transition_effects(progress, from_level, to_level, screen):
@@ -150,8 +147,7 @@ def draw_transition_effects(progress, from_level, to_level, screen):
             color_intensity = 1 - progress
             color = (int(255 * color_intensity), int(100 * color_intensity), 0)
 
-            effect_surface = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-            pygame.draw.circle(effect_surface, (*color, int(100 * progress)), (size, size), size, 2)
+            effect_surface = circle_sprite(size, color, int(100 * progress), width=2)
             screen.blit(effect_surface, (x-size, y-size))
 
     elif from_level == LEVEL_CROSTA and to_level == LEVEL_VULCANO:
@@ -8,11 +8,15 @@ def resource_path(relative_path):
     return os.path.join(os.path.abspath("."), relative_path)
 import math
 import random
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT
-from fountain import Fountain
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, BASE_TICK_RATE
+from timer_system import tick_scale
+from assets import load_scaled_image
+from cone import ConeProfile
 
 
 class BackgroundManager:
+    TRANSITION_FADE_FRAMES = 40  # durata dissolvenza tra livelli (frame a 60 Hz)
+
     def __init__(self):
         # Percorsi immagini dei livelli principali
         self.level_images = [
@@ -23,33 +27,29 @@ class BackgroundManager:
 
         self.tiles_per_level = 3  # quante "finestre" per livello
         self.layers = []          # struttura: layers[level][tile_index]
-        self.tile_offsets = []    # offset verticale di ciascun tile
+        self.tile_scroll = []     # scroll accumulato dai tile di ogni livello (vedi tile_offsets)
         self.current_index = 0    # indice livello corrente
 
         # Carica e scala le immagini
         for img_path in self.level_images:
-            img = pygame.image.load(resource_path(img_path)).convert_alpha()
-            img = pygame.transform.scale(img, (SCREEN_WIDTH, SCREEN_HEIGHT))
-            self.layers.append([img.copy() for _ in range(self.tiles_per_level)])
-            self.tile_offsets.append([i * SCREEN_HEIGHT for i in range(self.tiles_per_level)])
+            img = load_scaled_image(img_path, (SCREEN_WIDTH, SCREEN_HEIGHT))
+            # I tile non vengono mai modificati: condividono la stessa superficie
+            self.layers.append([img] * self.tiles_per_level)
+            self.tile_scroll.append(0)
 
         # Tile per i muri vulcanici
-        wall_img = pygame.image.load(resource_path("assets/RoundedBlocks/stoneWall.png")).convert_alpha()
-        self.wall_tile = pygame.transform.scale(wall_img, (32, 32))
+        self.wall_tile = load_scaled_image("assets/RoundedBlocks/stoneWall.png", (32, 32))
 
         # Immagine paesaggio esterno per il vulcano (scroll lento)
-        self.landscape_bg = pygame.image.load(resource_path("assets/vector_ambient.png")).convert()
-        self.landscape_bg = pygame.transform.scale(self.landscape_bg, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.landscape_bg = load_scaled_image("assets/vector_ambient.png", (SCREEN_WIDTH, SCREEN_HEIGHT), alpha=False)
         self.landscape_scroll = 0  # Scroll separato per il paesaggio
 
-        # Fontana di lava per il cratere
+        # Cratere raggiunto: la fontana è quella della vittoria (VictoryState in fountain.py)
         self.fountain_active = False
         self.crater_mode = False
-        self.fountain = None
 
         # Parametri per il cono vulcanico (solo nel livello 2 - Vulcano)
         self.volcano_level_index = 2  # Livello vulcano
-        self.cone_walls = []  # Lista delle pareti del cono per ogni tile
 
         # Tracking assoluto per il vulcano (non dipende dal riciclaggio tile)
         self.volcano_total_scroll = 0
@@ -64,37 +64,8 @@ class BackgroundManager:
         
     def setup_volcano_cone(self):
         """Configura la forma del cono vulcanico per i 3 tile del livello vulcano."""
-        self.cone_walls = []
-        
-        # Parametri del cono - forma di vulcano che si restringe verso l'alto
-        base_width = SCREEN_WIDTH  # Larghezza alla base (larga come schermo)
-        crater_width = 120  # Larghezza del cratere in cima (stretto)
-        tiles_count = self.tiles_per_level  # 3 tile
-        total_height = tiles_count * SCREEN_HEIGHT  # Altezza totale del vulcano
-        
-        # Calcola il tasso di restringimento per pixel (1 pixel per pixel di altezza)
-        width_reduction_per_pixel = (base_width - crater_width) / total_height
-        
-        # Calcola la larghezza delle pareti per ogni tile
-        for tile_idx in range(tiles_count):
-            # Altezza dall'inizio del vulcano a questo tile
-            height_from_base = tile_idx * SCREEN_HEIGHT
-            
-            # Larghezza del passaggio a questa altezza (si restringe salendo)
-            passage_width = base_width - (width_reduction_per_pixel * height_from_base)
-            wall_thickness = (SCREEN_WIDTH - passage_width) / 2
-            
-            # Coordinate delle pareti
-            left_wall_end = wall_thickness
-            right_wall_start = SCREEN_WIDTH - wall_thickness
-            
-            self.cone_walls.append({
-                'left_wall_end': left_wall_end,
-                'right_wall_start': right_wall_start,
-                'passage_width': passage_width,
-                'wall_thickness': wall_thickness,
-                'height_from_base': height_from_base
-            })
+        # Unica fonte della geometria del cono: disegno, collisioni e piattaforme leggono da qui
+        self.cone = ConeProfile(self.tiles_per_level * SCREEN_HEIGHT)
 
     def update(self, dy, total_scroll_distance=0):
         """Scroll verticale dei tile e aggiornamento livello."""
@@ -121,20 +92,31 @@ class BackgroundManager:
             # Scroll più lento per il paesaggio (1/3 della velocità)
             self.landscape_scroll += dy * 0.33
                 
-        # Aggiorna offset dei tile del livello corrente
-        self.tile_offsets[int(self.current_index)] = [
-            offset + dy for offset in self.tile_offsets[int(self.current_index)]
-        ]
-        # Aggiorna offset anche per il prossimo livello se in transizione
+        # Scroll dei tile del livello corrente (e del prossimo se in transizione)
+        self.tile_scroll[int(self.current_index)] += dy
         if self.transitioning and self.next_level_index is not None:
-            self.tile_offsets[int(self.next_level_index)] = [
-                offset + dy for offset in self.tile_offsets[int(self.next_level_index)]
-            ]
+            self.tile_scroll[int(self.next_level_index)] += dy
 
-        # Riporta i tile sopra se escono sotto
-        for i, offset in enumerate(self.tile_offsets[int(self.current_index)]):
-            if offset >= SCREEN_HEIGHT:
-                self.tile_offsets[int(self.current_index)][i] -= self.tiles_per_level * SCREEN_HEIGHT
+    def tile_offsets(self, level):
+        """y sullo schermo dei tile di un livello: si ripetono ogni tiles_per_level schermi,
+        e un tile che esce sotto lo schermo rientra sopra (offset sempre in [-2H, H))."""
+        span = self.tiles_per_level * SCREEN_HEIGHT
+        scroll = int(self.tile_scroll[level])
+        return [(i * SCREEN_HEIGHT + scroll + span - SCREEN_HEIGHT) % span - (span - SCREEN_HEIGHT)
+                for i in range(self.tiles_per_level)]
+
+    def tick(self, dt=1.0 / BASE_TICK_RATE):
+        """Avanza gli effetti a tempo (dissolvenza tra livelli) di un tick di simulazione."""
+        if self.transitioning and self.next_level_index is not None:
+            # Fading: alpha da 0 a 255 in 0.7s (~40 frame a 60 Hz)
+            self.transition_frames += tick_scale(dt)
+            # Quando alpha è pieno, termina la transizione
+            if self.transition_frames >= self.TRANSITION_FADE_FRAMES:
+                self.current_index = self.next_level_index
+                self.transitioning = False
+                self.transition_alpha = 0.0
+                self.transition_frames = 0
+                self.next_level_index = None
 
     def is_crater_mode(self):
         """Restituisce True se siamo in modalità cratere (goccia sostituita dalla fontana)."""
@@ -148,14 +130,10 @@ class BackgroundManager:
         if self.fountain_active:
             return True  # Già attiva
             
-        # Calcola se il player è arrivato al cratere (zona dove le pareti finiscono)
-        total_height = self.tiles_per_level * SCREEN_HEIGHT
-        crater_height = total_height * 0.9  # 90% dell'altezza totale del vulcano
-        
-        # Il player è al cratere se ha scrollato abbastanza verso l'alto
+        # Il player è al cratere (zona dove le pareti finiscono) se ha scrollato abbastanza verso l'alto
         player_absolute_height = self.volcano_total_scroll + (SCREEN_HEIGHT - player_y)
         
-        if player_absolute_height >= crater_height:
+        if player_absolute_height >= self.cone.crater_height:
             self.fountain_active = True
             self.crater_mode = True  # Attiva modalità cratere
             print("🌋 CRATERE RAGGIUNTO! Fontana di lava attivata! Goccia sostituita dalla fontana.")
@@ -183,214 +161,126 @@ class BackgroundManager:
         return True
 
 
-    def draw(self, screen):
-        """Disegna tutti i tile del livello corrente e le pareti del cono vulcanico se necessario."""
+    def draw(self, screen, y_offset=0):
+        """Disegna tutti i tile del livello corrente e le pareti del cono vulcanico se necessario.
+
+        y_offset: spostamento verticale di rendering (interpolazione dello scroll).
+        """
         idx = int(self.current_index)
         # Se in transizione, disegna entrambi i background con alpha
         if self.transitioning and self.next_level_index is not None:
-            # Fading: alpha da 0 a 255 in 0.7s (~40 frame)
-            fade_frames = 40
-            self.transition_frames += 1
-            alpha = int(255 * (self.transition_frames / fade_frames))
+            alpha = int(255 * (self.transition_frames / self.TRANSITION_FADE_FRAMES))
             alpha = min(255, alpha)
             # Disegna background vecchio
-            for offset in self.tile_offsets[idx]:
-                screen.blit(self.layers[idx][0], (0, offset))
+            for offset in self.tile_offsets(idx):
+                screen.blit(self.layers[idx][0], (0, offset + y_offset))
             # Crea superficie temporanea per il nuovo livello
             temp_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            for offset in self.tile_offsets[self.next_level_index]:
-                temp_surface.blit(self.layers[self.next_level_index][0], (0, offset))
+            for offset in self.tile_offsets(self.next_level_index):
+                temp_surface.blit(self.layers[self.next_level_index][0], (0, offset + y_offset))
             temp_surface.set_alpha(alpha)
             screen.blit(temp_surface, (0, 0))
-            # Quando alpha è pieno, termina la transizione
-            if self.transition_frames >= fade_frames:
-                self.current_index = self.next_level_index
-                self.transitioning = False
-                self.transition_alpha = 0.0
-                self.transition_frames = 0
-                self.next_level_index = None
         else:
             # Cambio livello normale
             if idx == self.volcano_level_index:
-                self.draw_volcano_backgrounds(screen)
-                if self.fountain_active:
-                    if self.fountain is None:
-                        self.fountain = Fountain(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-                    self.fountain.emit()
-                    self.fountain.update()
-                    self.fountain.draw(screen)
+                self.draw_volcano_backgrounds(screen, y_offset)
             else:
-                for offset in self.tile_offsets[idx]:
-                    screen.blit(self.layers[idx][0], (0, offset))
+                for offset in self.tile_offsets(idx):
+                    screen.blit(self.layers[idx][0], (0, offset + y_offset))
             # Pareti vulcano
             if idx == self.volcano_level_index:
-                self.draw_volcano_cone(screen)
+                self.draw_volcano_cone(screen, y_offset)
 
-    def draw_volcano_backgrounds(self, screen):
+    def draw_volcano_backgrounds(self, screen, y_offset=0):
         """Disegna i background del vulcano: vector_ambient esterno e shardRock interno."""
         # Disegna vector_ambient con scroll lento (tile unico)
-        landscape_y = int(self.landscape_scroll % SCREEN_HEIGHT)
+        landscape_y = int((self.landscape_scroll + y_offset * 0.33) % SCREEN_HEIGHT)
         screen.blit(self.landscape_bg, (0, landscape_y))
         screen.blit(self.landscape_bg, (0, landscape_y - SCREEN_HEIGHT))  # Tile per continuità
         
         # Poi disegna shardRock solo nell'area interna definita dalle pareti
-        # Parametri del cono
-        base_width = SCREEN_WIDTH
-        crater_width = 120
-        total_height = self.tiles_per_level * SCREEN_HEIGHT
         tile_h = 32  # Altezza dei tile delle pareti
+        cone = self.cone
+        left, right = cone.left, cone.right
+        scroll = self.volcano_total_scroll
+        inner = self.layers[self.volcano_level_index][0]
         
-        if total_height <= 0:
-            return
-            
-        width_reduction_per_pixel = (base_width - crater_width) / total_height
-        
-        for tile_idx, offset in enumerate(self.tile_offsets[self.volcano_level_index]):
-            # Disegna shardRock a strisce per efficienza
-            for y in range(offset, offset + SCREEN_HEIGHT, tile_h):
-                if y >= -tile_h and y < SCREEN_HEIGHT + tile_h:  # Solo se visibile
-                    # Calcola l'altezza assoluta dal fondo del vulcano
-                    absolute_height = self.volcano_total_scroll + (SCREEN_HEIGHT - y)
-                    absolute_height = max(0, min(absolute_height, total_height))
-                    
-                    # Calcola la larghezza del passaggio con convergenza al cratere
-                    if absolute_height >= total_height * 0.9:  # Ultimi 10% = cratere
-                        passage_width = crater_width  # Pareti dritte al cratere
-                    else:
-                        passage_width = base_width - (width_reduction_per_pixel * absolute_height)
-                        passage_width = max(crater_width, min(passage_width, base_width))
-                    
-                    # Centro dello schermo per simmetria perfetta
-                    center = SCREEN_WIDTH / 2
-                    half_passage = passage_width / 2
-                    
-                    left_wall_end = int(center - half_passage)
-                    right_wall_start = int(center + half_passage)
-                    
-                    # Assicura coordinate valide
-                    left_wall_end = max(0, left_wall_end)
-                    right_wall_start = min(SCREEN_WIDTH, right_wall_start)
-                    
-                    # Disegna una striscia di shardRock nell'area interna
-                    if right_wall_start > left_wall_end:
-                        inner_width = right_wall_start - left_wall_end
-                        inner_rect = pygame.Rect(left_wall_end, y, inner_width, tile_h)
-                        
-                        # Crea una superficie temporanea per shardRock
-                        if inner_width > 0 and tile_h > 0:
-                            source_rect = pygame.Rect(left_wall_end % SCREEN_WIDTH, y % SCREEN_HEIGHT, 
-                                                    min(inner_width, SCREEN_WIDTH), min(tile_h, SCREEN_HEIGHT))
-                            if source_rect.width > 0 and source_rect.height > 0:
-                                try:
-                                    inner_surface = self.layers[self.volcano_level_index][0].subsurface(source_rect)
-                                    screen.blit(inner_surface, (left_wall_end, y))
-                                except:
-                                    # Se fallisce subsurface, usa un colore solido
-                                    pygame.draw.rect(screen, (100, 100, 100), inner_rect)
-
-    def draw_fountain(self, screen):
-        """Disegna la fontana di lava al cratere."""
-        # Prima disegna fumo
-        for p in self.smoke_particles:
-            p.draw(screen)
-        # Poi lava in primo piano
-        for p in self.lava_particles:
-            p.draw(screen)
+        for offset in self.tile_offsets(self.volcano_level_index):
+            # Disegna shardRock a strisce per efficienza, solo quelle visibili
+            for y in self._visible_rows(offset, tile_h):
+                # Pareti all'altezza assoluta della striscia (nel cratere: passaggio dritto)
+                h = cone.index(y, scroll)
+                left_wall_end = max(0, int(left[h]))
+                right_wall_start = min(SCREEN_WIDTH, int(right[h]))
+                
+                # Disegna una striscia di shardRock nell'area interna
+                if right_wall_start > left_wall_end:
+                    inner_width = right_wall_start - left_wall_end
+                    source_rect = pygame.Rect(left_wall_end % SCREEN_WIDTH, y % SCREEN_HEIGHT,
+                                              min(inner_width, SCREEN_WIDTH), tile_h)
+                    try:
+                        screen.blit(inner.subsurface(source_rect), (left_wall_end, y + y_offset))
+                    except ValueError:
+                        # Se fallisce subsurface (striscia oltre il bordo dell'immagine), usa un colore solido
+                        pygame.draw.rect(screen, (100, 100, 100), (left_wall_end, y + y_offset, inner_width, tile_h))
+
+    @staticmethod
+    def _visible_rows(offset, tile_h):
+        """Righe y (passo tile_h) di un tile a quota offset che cadono nello schermo, con un tile di margine."""
+        first = offset
+        if first < -tile_h:
+            first += (-tile_h - first + tile_h - 1) // tile_h * tile_h
+        return range(first, min(offset + SCREEN_HEIGHT, SCREEN_HEIGHT + tile_h), tile_h)
 
     def draw_volcano_interior(self, screen):
         """Disegna l'interno del vulcano (shardRock) solo nell'area tra le pareti."""
         # Disegna prima tutto shardRock, poi le pareti copriranno l'esterno
-        for offset in self.tile_offsets[self.volcano_level_index]:
+        for offset in self.tile_offsets(self.volcano_level_index):
             screen.blit(self.layers[self.volcano_level_index][0], (0, offset))
 
-    def draw_volcano_cone(self, screen):
+    def draw_volcano_cone(self, screen, y_offset=0):
         """Disegna le pareti del cono vulcanico inclinate e simmetriche."""
         tile_w, tile_h = self.wall_tile.get_size()
+        cone = self.cone
+        left, right = cone.left, cone.right
+        scroll = self.volcano_total_scroll
         
-        # Parametri del cono
-        base_width = SCREEN_WIDTH  # Largo dove entra la goccia (in basso)
-        crater_width = 120  # Stretto al cratere (in cima)
-        total_height = self.tiles_per_level * SCREEN_HEIGHT
-        crater_height = total_height * 0.9  # 90% dell'altezza = inizio cratere
-        
-        if total_height <= 0:
-            return
-            
-        width_reduction_per_pixel = (base_width - crater_width) / total_height
-        
-        for tile_idx, offset in enumerate(self.tile_offsets[self.volcano_level_index]):
-            # Disegna le pareti tile per tile per performance migliori
-            for y in range(offset, offset + SCREEN_HEIGHT, tile_h):
-                if y >= -tile_h and y < SCREEN_HEIGHT + tile_h:  # Solo se visibile
-                    # Calcola l'altezza assoluta dal fondo del vulcano
-                    # Più si sale (y diminuisce), più il cono si restringe
-                    absolute_height = self.volcano_total_scroll + (SCREEN_HEIGHT - y)
-                    absolute_height = max(0, min(absolute_height, total_height))
-                    # Non disegnare pareti se siamo al cratere (zona dritta)
-                    if absolute_height >= crater_height:
-                        continue  # Salta questo tile, siamo nel cratere
-                    passage_width = base_width - (width_reduction_per_pixel * absolute_height)
-                    passage_width = max(crater_width, min(passage_width, base_width))
-                    # Centro dello schermo per simmetria perfetta
-                    center = SCREEN_WIDTH / 2
-                    half_passage = passage_width / 2
-                    left_wall_end = int(center - half_passage)
-                    right_wall_start = int(center + half_passage)
-                    # Disegna parete sinistra (solo 2 tile di spessore)
-                    tiles_left = min(2, left_wall_end // tile_w)  # Massimo 2 tile
-                    for i in range(tiles_left):
-                        x = left_wall_end - (i + 1) * tile_w  # Parte dal bordo interno
-                        if x >= 0:  # Solo se dentro lo schermo
-                            screen.blit(self.wall_tile, (x, y))
-                    # Disegna parete destra (solo 2 tile di spessore, speculare)
-                    tiles_right = min(2, (SCREEN_WIDTH - right_wall_start) // tile_w)  # Massimo 2 tile
-                    for i in range(tiles_right):
-                        x = right_wall_start + i * tile_w  # Parte dal bordo interno
-                        if x < SCREEN_WIDTH:  # Solo se dentro lo schermo
-                            screen.blit(self.wall_tile, (x, y))
-        # Fontana centralizzata: aggiorna e disegna se attiva
-        if self.fountain_active:
-            if self.fountain is None:
-                self.fountain = Fountain(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-            self.fountain.emit()
-            self.fountain.update()
-            self.fountain.draw(screen)
+        for offset in self.tile_offsets(self.volcano_level_index):
+            # Disegna le pareti tile per tile, solo le righe visibili
+            for y in self._visible_rows(offset, tile_h):
+                # Più si sale (y diminuisce), più il cono si restringe; nel cratere (-1) niente pareti
+                h = cone.wall_index(y, scroll)
+                if h < 0:
+                    continue
+                left_wall_end = int(left[h])
+                right_wall_start = int(right[h])
+                # Disegna parete sinistra (solo 2 tile di spessore)
+                tiles_left = min(2, left_wall_end // tile_w)  # Massimo 2 tile
+                for i in range(tiles_left):
+                    x = left_wall_end - (i + 1) * tile_w  # Parte dal bordo interno
+                    if x >= 0:  # Solo se dentro lo schermo
+                        screen.blit(self.wall_tile, (x, y + y_offset))
+                # Disegna parete destra (solo 2 tile di spessore, speculare)
+                tiles_right = min(2, (SCREEN_WIDTH - right_wall_start) // tile_w)  # Massimo 2 tile
+                for i in range(tiles_right):
+                    x = right_wall_start + i * tile_w  # Parte dal bordo interno
+                    if x < SCREEN_WIDTH:  # Solo se dentro lo schermo
+                        screen.blit(self.wall_tile, (x, y + y_offset))
+
+    def volcano_wall_index(self, y_position):
+        """Indice in self.cone delle pareti alla posizione Y, o -1 se non ci sono (fuori dal vulcano o al cratere)."""
+        if self.current_index != self.volcano_level_index:
+            return -1
+        return self.cone.wall_index(y_position, self.volcano_total_scroll)
 
     def get_volcano_walls_at_y(self, y_position):
         """Restituisce le coordinate delle pareti del vulcano alla posizione Y specificata."""
-        if self.current_index != self.volcano_level_index:
+        h = self.volcano_wall_index(y_position)
+        if h < 0:
             return None
-        
-        # Parametri del cono (stessi del metodo draw)
-        base_width = SCREEN_WIDTH
-        crater_width = 120
-        total_height = self.tiles_per_level * SCREEN_HEIGHT
-        crater_height = total_height * 0.9  # 90% dell'altezza = inizio cratere
-        
-        if total_height <= 0:
-            return None
-            
-        # Usa l'altezza assoluta dal fondo del vulcano
-        absolute_height = self.volcano_total_scroll + (SCREEN_HEIGHT - y_position)
-        absolute_height = max(0, min(absolute_height, total_height))
-        
-        # Se siamo al cratere, non ci sono più pareti
-        if absolute_height >= crater_height:
-            return None
-            
-        width_reduction_per_pixel = (base_width - crater_width) / total_height
-        
-        # Calcola larghezza del passaggio con convergenza al cratere
-        passage_width = base_width - (width_reduction_per_pixel * absolute_height)
-        passage_width = max(crater_width, min(passage_width, base_width))
-        
-        # Centro dello schermo per simmetria perfetta
-        center = SCREEN_WIDTH / 2
-        half_passage = passage_width / 2
-        
-        left_wall_end = center - half_passage
-        right_wall_start = center + half_passage
-        
+        left_wall_end = self.cone.left[h]
+        right_wall_start = self.cone.right[h]
+        passage_width = right_wall_start - left_wall_end
         return {
             'left_wall_end': left_wall_end,
             'right_wall_start': right_wall_start,
@@ -398,46 +288,31 @@ class BackgroundManager:
             'wall_thickness': (SCREEN_WIDTH - passage_width) / 2
         }
 
-    def check_volcano_collision(self, player):
-        """Controlla e gestisce le collisioni del player con i blocchetti di tile delle pareti del vulcano."""
-        if self.current_index != self.volcano_level_index:
-            return False
-        
-        # Usa il metodo get_volcano_walls_at_y per consistenza
-        walls = self.get_volcano_walls_at_y(player.y)
-        if walls is None:
+    def check_volcano_collision(self, player, y_offset=0):
+        """Controlla e gestisce le collisioni del player con i blocchetti di tile delle pareti del vulcano.
+
+        y_offset: offset della telecamera, per passare dalla y del player (mondo) a quella sullo schermo.
+        """
+        # Stessa tabella usata per disegnare le pareti
+        h = self.volcano_wall_index(player.y + y_offset)
+        if h < 0:
             return False
         
-        tile_w, tile_h = self.wall_tile.get_size()
-        
-        # Posizione del player
-        player_left = player.x - player.radius
-        player_right = player.x + player.radius
-        
-        collision = False
-        
-        left_wall_end = walls['left_wall_end']
-        right_wall_start = walls['right_wall_start']
-        
-        # Controlla collisione con i tile della parete sinistra (solo 2 tile)
-        if player_left < left_wall_end:
-            # Trova il bordo esterno della parete sinistra (massimo 2 tile)
-            tiles_left = min(2, int(left_wall_end // tile_w))
-            wall_outer_edge = left_wall_end - tiles_left * tile_w
-            player.x = left_wall_end + player.radius  # Rimbalza sul bordo interno
+        # Controlla collisione con la parete sinistra: rimbalza sul bordo interno
+        left_wall_end = self.cone.left[h]
+        if player.x - player.radius < left_wall_end:
+            player.x = left_wall_end + player.radius
             player.vx = abs(player.vx) * 0.8  # Rimbalzo attenuato
-            collision = True
+            return True
         
-        # Controlla collisione con i tile della parete destra (solo 2 tile, speculare)
-        elif player_right > right_wall_start:
-            # Trova il bordo esterno della parete destra (massimo 2 tile)
-            tiles_right = min(2, int((SCREEN_WIDTH - right_wall_start) // tile_w))
-            wall_outer_edge = right_wall_start + tiles_right * tile_w
-            player.x = right_wall_start - player.radius  # Rimbalza sul bordo interno
+        # Controlla collisione con la parete destra (speculare)
+        right_wall_start = self.cone.right[h]
+        if player.x + player.radius > right_wall_start:
+            player.x = right_wall_start - player.radius
             player.vx = -abs(player.vx) * 0.8  # Rimbalzo attenuato
-            collision = True
+            return True
         
-        return collision
+        return False
 
     def reset(self):
         """Torna al livello iniziale e azzera offset."""
@@ -446,6 +321,4 @@ class BackgroundManager:
         self.landscape_scroll = 0  # Reset scroll paesaggio
         self.fountain_active = False  # Reset fontana
         self.crater_mode = False  # Reset modalità cratere
-    # Fountain centralizzata: nessuna lista particelle qui
-        for i in range(len(self.tile_offsets)):
-            self.tile_offsets[i] = [j * SCREEN_HEIGHT for j in range(self.tiles_per_level)]
+        self.tile_scroll = [0] * len(self.tile_scroll)
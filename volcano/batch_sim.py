@@ -0,0 +1,156 @@
+"""
+Simulatore batch: esegue molte partite headless con seed diversi su un pool di processi
+e salva le metriche di ogni partita in un file colonnare compresso (.npz, una colonna per metrica).
+
+Esempi:
+    python batch_sim.py --runs 10000 --policy seek --out risultati.npz
+    python batch_sim.py --runs 2000 --set platform.min_gap=30 --set enemy.spawn_weights.quarzo=20
+
+Lettura dei risultati:
+    data = numpy.load("risultati.npz"); data["altitude"].mean()
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from constants import GAME_TIME, SIM_TICK_RATE, PLAYING
+from enemies import penalties
+
+MINERALS = sorted(penalties)
+# Durata massima di una partita: tutto il timer di raffreddamento più la fontana finale
+DEFAULT_MAX_TICKS = (GAME_TIME + 15) * SIM_TICK_RATE
+
+
+def parse_value(text):
+    """Interpreta il valore di --set come JSON (numeri, liste...) o, in mancanza, come stringa."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _init_worker(quiet):
+    """Inizializzazione di ogni processo del pool: display dummy una volta sola."""
+    if quiet:
+        # Il gioco stampa molti messaggi di debug: nei worker li scartiamo
+        sys.stdout = open(os.devnull, 'w')
+    from headless import init_headless_display
+    init_headless_display()
+
+
+def run_one(task):
+    """Esegue una partita completa e restituisce le sue metriche."""
+    seed, policy_name, max_ticks, difficulty = task
+    from game_session import GameSession
+    from bots import make_policy
+
+    session = GameSession(difficulty=difficulty)
+    policy = make_policy(policy_name)
+    policy.reset(seed)
+    obs = session.reset(seed)
+    start = time.perf_counter()
+    while obs['state'] == PLAYING and obs['tick'] < max_ticks:
+        obs = session.step(policy(session, obs))
+    elapsed = time.perf_counter() - start
+
+    crater_time = (session.crater_tick / SIM_TICK_RATE) if session.crater_tick is not None else float('nan')
+    metrics = {
+        'seed': seed,
+        'ticks': obs['tick'],
+        'altitude': obs['altitude'],
+        'score': obs['score'],
+        'outcome': obs['state'],
+        'crater_time': crater_time,
+        'ticks_per_sec': obs['tick'] / elapsed if elapsed > 0 else 0.0,
+    }
+    for mineral in MINERALS:
+        metrics[f'hits_{mineral}'] = session.enemy_hits.get(mineral, 0)
+    return metrics
+
+
+COLUMN_TYPES = {
+    'seed': 'i8', 'ticks': 'i4', 'altitude': 'i4', 'score': 'i4', 'outcome': 'i1',
+    'crater_time': 'f4', 'ticks_per_sec': 'f4',
+}
+
+
+def save_columns(path, rows, params):
+    """Scrive le metriche per colonne (una colonna numpy per metrica) più i parametri usati."""
+    import numpy as np
+    rows = sorted(rows, key=lambda r: r['seed'])
+    columns = {}
+    for name in rows[0]:
+        columns[name] = np.array([r[name] for r in rows], dtype=COLUMN_TYPES.get(name, 'i4'))
+    columns['params'] = np.array(json.dumps(params))
+    np.savez_compressed(path, **columns)
+
+
+def run_batch(runs, policy, workers=None, seed_start=0, max_ticks=DEFAULT_MAX_TICKS,
+              difficulty=None, quiet=True, progress=True):
+    """Distribuisce `runs` partite sul pool di processi e restituisce la lista delle metriche."""
+    tasks = [(seed, policy, max_ticks, difficulty or {}) for seed in range(seed_start, seed_start + runs)]
+    workers = workers or os.cpu_count() or 1
+    # Blocchi non troppo grandi: le partite hanno durate molto diverse
+    chunksize = max(1, min(16, runs // (workers * 8)))
+    results = []
+    pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(quiet,))
+    try:
+        for i, metrics in enumerate(pool.imap_unordered(run_one, tasks, chunksize=chunksize), 1):
+            results.append(metrics)
+            if progress and (i % 100 == 0 or i == runs):
+                print(f"\r{i}/{runs} partite", end='', file=sys.stderr, flush=True)
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+    if progress:
+        print(file=sys.stderr)
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simulatore batch headless di Volcano")
+    parser.add_argument("--runs", type=int, default=1000, help="numero di partite")
+    parser.add_argument("--workers", type=int, default=None, help="processi del pool (default: tutti i core)")
+    parser.add_argument("--seed-start", type=int, default=0, help="primo seed (le partite usano seed consecutivi)")
+    parser.add_argument("--policy", default="seek", help="politica di input: idle, zigzag, seek")
+    parser.add_argument("--max-ticks", type=int, default=DEFAULT_MAX_TICKS, help="tick massimi per partita")
+    parser.add_argument("--set", action="append", default=[], metavar="CHIAVE=VALORE",
+                        help="sovrascrive un parametro di difficoltà, es. platform.min_gap=30")
+    parser.add_argument("--out", default="batch_results.npz", help="file dei risultati (.npz)")
+    parser.add_argument("--verbose", action="store_true", help="non silenziare l'output di debug del gioco")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    difficulty = {}
+    for item in args.set:
+        key, sep, value = item.partition('=')
+        if not sep:
+            raise SystemExit(f"--set richiede CHIAVE=VALORE, ricevuto: {item}")
+        difficulty[key] = parse_value(value)
+
+    start = time.perf_counter()
+    results = run_batch(args.runs, args.policy, args.workers, args.seed_start, args.max_ticks,
+                        difficulty, quiet=not args.verbose)
+    elapsed = time.perf_counter() - start
+
+    params = {'policy': args.policy, 'seed_start': args.seed_start, 'max_ticks': args.max_ticks,
+              'difficulty': difficulty}
+    save_columns(args.out, results, params)
+
+    total_ticks = sum(r['ticks'] for r in results)
+    reached_crater = sum(1 for r in results if r['crater_time'] == r['crater_time'])
+    mean_altitude = sum(r['altitude'] for r in results) / len(results)
+    print(f"{len(results)} partite in {elapsed:.1f}s ({total_ticks / elapsed:.0f} tick/s complessivi), "
+          f"salita media {mean_altitude:.0f}px, cratere raggiunto {reached_crater} volte -> {args.out}")
+
+
+if __name__ == '__main__':
+    main()
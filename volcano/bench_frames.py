@@ -0,0 +1,241 @@
+"""
+Benchmark dei tempi di frame: riproduce partite scriptate o registrate (replay) lungo lo stesso
+percorso di main.py (GameSession.step per update_game, GameSession.render per draw_game) e
+riporta p50/p95/p99/max del tempo di frame per fase, per sottosistema e per tratto di gioco.
+
+Esempi:
+    python bench_frames.py --out baseline.json
+    python bench_frames.py --baseline baseline.json --tolerance 0.15
+    python bench_frames.py --scenario salita --replay partita.vrp
+
+Con --baseline esce con codice 1 se una metrica peggiora oltre la tolleranza.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+
+from headless import init_headless_display
+
+SCENARIOS = {
+    # Partita completa: Mantello -> Crosta -> Vulcano -> cratere con la fontana di vittoria
+    'salita': {'seed': 1, 'policy': 'seek', 'assist': True, 'max_ticks': 6000},
+    # Partita senza aiuti: Mantello e Crosta con cadute, nemici e piattaforme crollanti
+    'libera': {'seed': 4, 'policy': 'seek', 'assist': False, 'max_ticks': 3000},
+}
+DEFAULT_WARMUP = 30
+METRICS = ('p50', 'p95', 'p99', 'max')
+COMPARED_METRICS = ('p50', 'p95', 'p99')
+GROUPS = ('frame', 'phases', 'subsystems', 'segments')
+
+
+def climb_assist(session):
+    """Aiuto per le partite scriptate: il timer non scade e, se il bot scende troppo,
+    riceve un salto più alto del normale che fa comunque scorrere lo schermo.
+    Così la salita arriva sempre fino al cratere, anche senza piattaforme raggiungibili."""
+    from constants import SCREEN_HEIGHT, GAME_TIME
+    player = session.player
+    if player.vy > 0 and session.camera.to_screen(player.y) > SCREEN_HEIGHT * 0.6:
+        player.vy = -player.jump_strength * 1.4
+    session.cooling_time = GAME_TIME
+
+
+def percentile(sorted_values, p):
+    """Percentile con metodo nearest-rank su una lista già ordinata."""
+    index = max(0, math.ceil(p / 100.0 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(values):
+    """Statistiche in millisecondi di una lista di durate in secondi."""
+    values = sorted(values)
+    stats = {'frames': len(values)}
+    for metric in METRICS:
+        q = 100 if metric == 'max' else int(metric[1:])
+        stats[metric] = round(percentile(values, q) * 1000.0, 4)
+    return stats
+
+
+def load_inputs(spec):
+    """Restituisce (seed, funzione input per tick, assist) di uno scenario."""
+    from bots import make_policy
+    if 'replay' in spec:
+        from replay import load_replay
+        replay = load_replay(spec['replay'])
+        inputs = replay.inputs()
+        return replay.seed, lambda session, obs: next(inputs, None), False
+    policy = make_policy(spec['policy'])
+    policy.reset(spec['seed'])
+    return spec['seed'], policy, spec.get('assist', False)
+
+
+def run_scenario(spec, screen, warmup=DEFAULT_WARMUP, flip=True):
+    """Gioca uno scenario un tick per frame e restituisce i tempi di ogni frame."""
+    import pygame
+    from constants import PLAYING
+    from game_session import GameSession
+    from profiler import FrameProfiler
+    from timer_system import FixedTimestep
+
+    dt = FixedTimestep().dt
+    session = GameSession()
+    prof = FrameProfiler(history=None)
+    session.profiler = prof
+    seed, next_input, assist = load_inputs(spec)
+    obs = session.reset(seed)
+    max_ticks = spec.get('max_ticks')
+
+    frames = []
+    while obs['state'] == PLAYING and (max_ticks is None or obs['tick'] < max_ticks):
+        prof.begin_frame()
+        input_state = next_input(session, obs)
+        if input_state is None:
+            break  # replay finito
+        if assist:
+            climb_assist(session)
+        prof.skip()
+        pygame.event.pump()
+        prof.lap('events')
+        obs = session.step(input_state, dt)   # update_game
+        session.render(screen, 1.0)            # draw_game
+        if flip:
+            pygame.display.flip()
+            prof.lap('flip')
+        frame_time, sections = prof.end_frame()
+        segment = 'Cratere' if obs['victory'] else obs['level']
+        frames.append((segment, frame_time, sections))
+    return frames[warmup:], obs
+
+
+def build_report(frames):
+    """Aggrega i frame di uno scenario in statistiche per fase, sottosistema e tratto."""
+    from profiler import phase_of
+    phases = {}
+    subsystems = {}
+    segments = {}
+    for segment, frame_time, sections in frames:
+        segments.setdefault(segment, []).append(frame_time)
+        frame_phases = {}
+        for section, seconds in sections.items():
+            subsystems.setdefault(section, []).append(seconds)
+            phase = phase_of(section)
+            frame_phases[phase] = frame_phases.get(phase, 0.0) + seconds
+        for phase, seconds in frame_phases.items():
+            phases.setdefault(phase, []).append(seconds)
+    return {
+        'frame': summarize([frame_time for _, frame_time, _ in frames]),
+        'phases': {name: summarize(values) for name, values in sorted(phases.items())},
+        'subsystems': {name: summarize(values) for name, values in sorted(subsystems.items())},
+        'segments': {name: summarize(values) for name, values in segments.items()},
+    }
+
+
+def compare(report, baseline, tolerance, min_delta_ms):
+    """Confronta con la baseline. Restituisce la lista delle regressioni (righe di testo)."""
+    regressions = []
+    for name, scenario in report['scenarios'].items():
+        base_scenario = baseline.get('scenarios', {}).get(name)
+        if base_scenario is None:
+            continue
+        for group in GROUPS:
+            current = {'frame': scenario['frame']} if group == 'frame' else scenario[group]
+            base = {'frame': base_scenario['frame']} if group == 'frame' else base_scenario.get(group, {})
+            for key, stats in current.items():
+                base_stats = base.get(key)
+                if base_stats is None:
+                    continue
+                for metric in COMPARED_METRICS:
+                    now, before = stats[metric], base_stats[metric]
+                    if now > before * (1.0 + tolerance) and now - before > min_delta_ms:
+                        regressions.append(f"{name} {group}/{key} {metric}: {before:.3f} -> {now:.3f} ms "
+                                           f"(+{(now / before - 1.0) * 100 if before else float('inf'):.0f}%)")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dei tempi di frame di Volcano")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario scriptato da eseguire (ripetibile, default: tutti)")
+    parser.add_argument("--replay", action="append", default=[], metavar="FILE",
+                        help="aggiunge una partita registrata con main.py --record (ripetibile)")
+    parser.add_argument("--max-ticks", type=int, default=None, help="limita la durata di ogni scenario")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="frame iniziali esclusi dalle statistiche")
+    parser.add_argument("--no-flip", action="store_true", help="non misura pygame.display.flip")
+    parser.add_argument("--out", default=None, help="scrive il report JSON in questo file (default: stdout)")
+    parser.add_argument("--baseline", default=None, help="report JSON di riferimento da confrontare")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="peggioramento relativo ammesso rispetto alla baseline (default: 0.15 = 15%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05,
+                        help="differenze assolute sotto questa soglia non sono regressioni (rumore)")
+    parser.add_argument("--verbose", action="store_true", help="non silenziare l'output di debug del gioco")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    import pygame
+    screen = init_headless_display()
+
+    scenarios = {name: dict(SCENARIOS[name]) for name in (args.scenario or SCENARIOS)}
+    for path in args.replay:
+        scenarios[os.path.splitext(os.path.basename(path))[0]] = {'replay': path}
+    if args.max_ticks is not None:
+        for spec in scenarios.values():
+            spec['max_ticks'] = args.max_ticks
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'warmup': args.warmup,
+            'flip': not args.no_flip,
+        },
+        'scenarios': {},
+    }
+    stdout = sys.stdout
+    for name, spec in scenarios.items():
+        print(f"scenario {name}...", file=sys.stderr, flush=True)
+        if not args.verbose:
+            sys.stdout = open(os.devnull, 'w')
+        try:
+            frames, obs = run_scenario(spec, screen, args.warmup, flip=not args.no_flip)
+        finally:
+            if sys.stdout is not stdout:
+                sys.stdout.close()
+                sys.stdout = stdout
+        if not frames:
+            print(f"scenario {name}: nessun frame dopo il warmup", file=sys.stderr)
+            continue
+        scenario_report = build_report(frames)
+        scenario_report['spec'] = spec
+        scenario_report['end'] = {'tick': obs['tick'], 'level': obs['level'], 'altitude': obs['altitude'],
+                                  'victory': obs['victory']}
+        report['scenarios'][name] = scenario_report
+        frame = scenario_report['frame']
+        print(f"scenario {name}: {frame['frames']} frame, p50 {frame['p50']:.2f} ms, p99 {frame['p99']:.2f} ms, "
+              f"max {frame['max']:.2f} ms, tratti {', '.join(scenario_report['segments'])}", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"REGRESSIONI (tolleranza {args.tolerance:.0%}):", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+        print(f"Nessuna regressione rispetto a {args.baseline} (tolleranza {args.tolerance:.0%})", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
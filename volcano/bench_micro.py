@@ -0,0 +1,222 @@
+"""
+Microbenchmark dei punti caldi: ogni funzione viene misurata da sola, su uno stato di gioco
+realistico generato con un seed fisso e su una superficie fuori schermo.
+
+Esempi:
+    python bench_micro.py                        # tutti i benchmark
+    python bench_micro.py -k platforms -k draw   # solo quelli il cui nome contiene "platforms" o "draw"
+    python bench_micro.py --out prima.json       # salva i risultati...
+    python bench_micro.py --compare prima.json   # ...e dopo la modifica confronta
+
+Per ogni benchmark lo stato viene ricreato a ogni ripetizione (fuori dalla misura), quindi
+le chiamate che modificano lo stato (update, generazione) restano confrontabili.
+"""
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import sys
+import time
+
+from headless import init_headless_display
+
+SEED = 1
+DT = 1.0 / 60
+
+
+# --- Stati di partenza ---
+
+def _quiet():
+    """Silenzia le stampe di debug del gioco durante la preparazione e la misura."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def make_session(ticks=0, policy='seek', seed=SEED):
+    """Sessione con seed fisso, fatta avanzare di `ticks` tick dal bot indicato."""
+    from game_session import GameSession
+    from bots import make_policy
+    session = GameSession()
+    bot = make_policy(policy)
+    bot.reset(seed)
+    obs = session.reset(seed)
+    for _ in range(ticks):
+        obs = session.step(bot(session, obs))
+    return session
+
+
+def make_volcano_session():
+    """Sessione portata nel livello Vulcano, a metà del cono."""
+    from constants import LEVEL_HEIGHT
+    session = make_session()
+    bm = session.background_manager
+    bm.current_index = bm.volcano_level_index
+    bm.volcano_total_scroll = 800
+    session.level_manager.update(LEVEL_HEIGHT * bm.volcano_level_index)
+    session.total_scroll_distance = LEVEL_HEIGHT * bm.volcano_level_index
+    session.platform_manager.generate_initial_platforms(session.player, session.level_manager, depth_multiplier=8)
+    return session
+
+
+def make_fountain(frames=150):
+    """Fontana a regime: `frames` emissioni e aggiornamenti dopo l'avvio."""
+    from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+    from fountain import Fountain
+    from rng import RngStreams
+    fountain = Fountain(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, RngStreams(SEED).fountain)
+    for _ in range(frames):
+        fountain.emit()
+        fountain.update()
+    return fountain
+
+
+def make_surface():
+    """Superficie fuori schermo nel formato del display."""
+    import pygame
+    from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+    return pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+
+
+class Context:
+    """Contenitore degli oggetti usati da un benchmark."""
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def ctx_session(ticks=0):
+    def setup():
+        session = make_session(ticks)
+        return Context(session=session, pm=session.platform_manager, em=session.enemy_manager,
+                       cm=session.collectible_manager, player=session.player, lm=session.level_manager)
+    return setup
+
+
+def ctx_platforms_draw():
+    context = ctx_session()()
+    context.surface = make_surface()
+    return context
+
+
+def ctx_enemies():
+    """Partita avviata più un gruppo di nemici: circa quelli presenti a metà Crosta."""
+    context = ctx_session(ticks=600)()
+    context.em.spawn_cluster(6)
+    return context
+
+
+def ctx_enemy_swarm():
+    """Molti nemici insieme (oltre la soglia dell'update a colonne di EnemyManager)."""
+    context = ctx_session(ticks=600)()
+    while len(context.em.enemies) < 48:
+        context.em.spawn_cluster(6)
+    return context
+
+
+def ctx_volcano():
+    session = make_volcano_session()
+    return Context(session=session, bm=session.background_manager, surface=make_surface())
+
+
+def ctx_fountain():
+    return Context(fountain=make_fountain(), surface=make_surface())
+
+
+def ctx_player():
+    session = make_session(ticks=120)
+    return Context(player=session.player, surface=make_surface())
+
+
+def ctx_menu():
+    from ui_system import UISystem
+    return Context(ui=UISystem(), surface=make_surface())
+
+
+# --- Benchmark: nome -> (preparazione, funzione misurata, chiamate per ripetizione) ---
+
+BENCHMARKS = {
+    'platforms.update': (ctx_session(), lambda c: c.pm.update(c.lm, DT), 200),
+    'platforms.update_scroll': (ctx_session(), lambda c: (c.pm.camera.scroll(4), c.pm.update(c.lm, dt=0)), 200),
+    'platforms.check_collision': (ctx_session(), lambda c: c.pm.check_collision(c.player), 500),
+    'platforms.generate_initial': (ctx_session(),
+                                   lambda c: c.pm.generate_initial_platforms(c.player, c.lm, depth_multiplier=8), 10),
+    'platforms.draw': (ctx_platforms_draw, lambda c: c.pm.draw(c.surface), 200),
+    'platforms.update_volcano': (ctx_volcano,
+                                 lambda c: c.session.platform_manager.update(c.session.level_manager, DT), 200),
+    'enemies.update': (ctx_enemies, lambda c: c.em.update(DT, 3000, 'Crosta'), 200),
+    'enemies.check_collision': (ctx_enemies, lambda c: c.em.check_collision(c.player), 500),
+    'enemies.update_swarm': (ctx_enemy_swarm, lambda c: c.em.update(DT, 3000, 'Crosta'), 200),
+    'collectibles.check_collision': (ctx_session(), lambda c: c.cm.check_collision(c.player), 500),
+    'collectibles.update': (ctx_session(), lambda c: c.cm.update(DT, -50, 850), 200),
+    'collectibles.draw': (ctx_platforms_draw, lambda c: c.cm.draw(c.surface, 0, c.pm), 50),
+    'background.draw_volcano_cone': (ctx_volcano, lambda c: c.bm.draw_volcano_cone(c.surface), 50),
+    'background.draw_volcano_backgrounds': (ctx_volcano, lambda c: c.bm.draw_volcano_backgrounds(c.surface), 50),
+    'fountain.update': (ctx_fountain, lambda c: c.fountain.update(), 20),
+    'fountain.draw': (ctx_fountain, lambda c: c.fountain.draw(c.surface), 5),
+    'player.draw_trail': (ctx_player, lambda c: c.player.draw_trail(c.surface), 200),
+    'player.draw_wobbly': (ctx_player, lambda c: c.player.draw_wobbly(c.surface, 1.0), 200),
+    'ui.draw_menu': (ctx_menu, lambda c: c.ui.draw_menu(c.surface), 50),
+    'ui.draw_cooling_bar': (ctx_menu, lambda c: c.ui.draw_cooling_bar(c.surface, 187.4, 300), 500),
+}
+
+
+def run_benchmark(setup, fn, number, repeat):
+    """Restituisce i tempi per chiamata (secondi) di ogni ripetizione."""
+    times = []
+    for _ in range(repeat):
+        with _quiet():
+            ctx = setup()
+            start = time.perf_counter()
+            for _ in range(number):
+                fn(ctx)
+            elapsed = time.perf_counter() - start
+        times.append(elapsed / number)
+    return times
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmark dei sottosistemi di Volcano")
+    parser.add_argument("-k", dest="filters", action="append", default=[],
+                        help="esegue solo i benchmark il cui nome contiene questo testo (ripetibile)")
+    parser.add_argument("--repeat", type=int, default=5, help="ripetizioni per benchmark (stato ricreato ogni volta)")
+    parser.add_argument("--scale", type=float, default=1.0, help="moltiplica il numero di chiamate per ripetizione")
+    parser.add_argument("--list", action="store_true", help="elenca i benchmark disponibili")
+    parser.add_argument("--out", default=None, help="salva i risultati in JSON")
+    parser.add_argument("--compare", default=None, help="confronta con un JSON salvato in precedenza con --out")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    names = [name for name in BENCHMARKS if not args.filters or any(f in name for f in args.filters)]
+    if args.list:
+        print('\n'.join(names))
+        return 0
+    init_headless_display()
+    previous = {}
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)['results']
+
+    results = {}
+    print(f"{'benchmark':<38} {'min µs':>10} {'mediana µs':>11} {'prima µs':>10} {'diff':>7}")
+    for name in names:
+        setup, fn, number = BENCHMARKS[name]
+        times = run_benchmark(setup, fn, max(1, int(number * args.scale)), args.repeat)
+        best = min(times) * 1e6
+        median = statistics.median(times) * 1e6
+        results[name] = {'min_us': round(best, 3), 'median_us': round(median, 3)}
+        line = f"{name:<38} {best:>10.1f} {median:>11.1f}"
+        if name in previous:
+            before = previous[name]['min_us']
+            line += f" {before:>10.1f} {(best / before - 1.0) * 100 if before else 0.0:>+6.0f}%"
+        print(line, flush=True)
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({'seed': SEED, 'repeat': args.repeat, 'scale': args.scale, 'results': results}, f, indent=2)
+            f.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
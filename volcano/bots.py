@@ -0,0 +1,85 @@
+"""
+Politiche di input automatiche per guidare una GameSession senza tastiera (batch, benchmark)
+"""
+import random
+from game_session import InputState, NO_INPUT
+
+JUMP_REACH_Y = 190   # altezza raggiungibile con un salto (~ jump_strength² / 2·gravità)
+JUMP_REACH_X = 250   # spostamento orizzontale possibile durante la salita
+STEER_DEADZONE = 8
+
+
+class IdlePolicy:
+    """Nessun comando: la goccia rimbalza dove capita."""
+    def reset(self, seed=None):
+        pass
+
+    def __call__(self, session, obs):
+        return NO_INPUT
+
+
+class ZigzagPolicy:
+    """Script fisso: alterna sinistra e destra ogni `period` tick."""
+    def __init__(self, period=120):
+        self.period = period
+
+    def reset(self, seed=None):
+        pass
+
+    def __call__(self, session, obs):
+        going_left = (obs['tick'] // self.period) % 2 == 0
+        return InputState(left=going_left, right=not going_left)
+
+
+class SeekPolicy:
+    """Bot semplice: in salita punta alla piattaforma raggiungibile più alta,
+    in caduta a quella più vicina sotto di sé. Un po' di rumore evita partite identiche."""
+    def __init__(self, noise=0.05):
+        self.noise = noise
+        self.rng = random.Random()
+
+    def reset(self, seed=None):
+        self.rng.seed(seed)
+
+    def choose_target(self, session):
+        player = session.player
+        bottom = player.y + player.radius
+        best = None
+        best_score = None
+        for p in session.platform_manager.platforms:
+            dx = abs(p.rect.centerx - player.x)
+            dy = bottom - p.rect.top  # > 0: piattaforma sopra i piedi
+            if player.vy < 0:
+                if not (0 < dy < JUMP_REACH_Y and dx < JUMP_REACH_X):
+                    continue
+                score = dy - dx * 0.3
+            else:
+                if dy > 0 or dx > JUMP_REACH_X:
+                    continue
+                score = dy - dx * 0.5
+            if best_score is None or score > best_score:
+                best, best_score = p, score
+        return best
+
+    def __call__(self, session, obs):
+        if self.rng.random() < self.noise:
+            return NO_INPUT
+        target = self.choose_target(session)
+        if target is None:
+            return NO_INPUT
+        dx = target.rect.centerx - session.player.x
+        return InputState(left=dx < -STEER_DEADZONE, right=dx > STEER_DEADZONE)
+
+
+POLICIES = {
+    'idle': IdlePolicy,
+    'zigzag': ZigzagPolicy,
+    'seek': SeekPolicy,
+}
+
+
+def make_policy(name):
+    try:
+        return POLICIES[name]()
+    except KeyError:
+        raise ValueError(f"Politica sconosciuta: {name} (disponibili: {', '.join(POLICIES)})")
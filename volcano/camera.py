@@ -0,0 +1,29 @@
+"""
+Telecamera verticale: le entità restano in coordinate del mondo e al disegno si applica
+un solo offset.
+
+y schermo = y mondo + camera.y. Quando la goccia sale la telecamera scrolla (camera.y cresce
+e il mondo scende sullo schermo): costa un'addizione invece di spostare ogni entità.
+"""
+
+
+class Camera:
+    def __init__(self, y=0):
+        self.y = y
+        self.prev_y = y  # posizione all'inizio del tick (per l'interpolazione del rendering)
+
+    def save_previous_state(self):
+        self.prev_y = self.y
+
+    def scroll(self, dy):
+        self.y += dy
+
+    def to_screen(self, world_y):
+        return world_y + self.y
+
+    def to_world(self, screen_y):
+        return screen_y - self.y
+
+    def offset(self, alpha=1.0):
+        """Offset di disegno (da sommare alle y del mondo) interpolato tra gli ultimi due tick."""
+        return self.y - round((1.0 - alpha) * (self.y - self.prev_y))
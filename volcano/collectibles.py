@@ -1,77 +1,109 @@
 import random
 import pygame
 from constants import SCREEN_HEIGHT
+from spatial import SpatialGrid, neighborhood
+from pool import ObjectPool
+from sprite_cache import circle_sprite
 
-# --- Gestione bolle di magma e collectibles globali ---
-collectibles = []
-block_on_demand_collectibles = False
-
-def spawn_magma_bubbles_on_platforms(platform_manager, density=1.0):
-    """Posiziona una bolla di magma su tutte le piattaforme."""
-    global collectibles
-    collectibles = []
-    for plat in platform_manager.platforms:
-        if not any(c.type == 'magma_bubble' and c.platform == plat for c in collectibles):
-            x = plat.rect.centerx
-            radius = 10  # Deve corrispondere a Collectible.radius
-            offset = 16  # Spazio extra tra piattaforma e bolla
-            y_bubble = plat.rect.top - offset - radius
-            bubble = Collectible(x, y_bubble, value=200)
-            bubble.type = 'magma_bubble'
-            bubble.platform = plat  # Associa la piattaforma
-            collectibles.append(bubble)
-
-def add_magma_bubble_for_platform(plat):
-    """Aggiunge SEMPRE una bolla di magma su ogni nuova piattaforma, senza offset y."""
-    global collectibles
-    if not any(c.type == 'magma_bubble' and c.platform == plat for c in collectibles):
+GRID_LAYER = 'collectibles'  # layer dei collectibles nella griglia spaziale condivisa
+POPUP_COLOR = (255, 255, 0)  # testo "+valore" che compare alla raccolta
+BUBBLE_VALUE = 200  # valore di una bolla di magma
+
+# --- Gestione bolle di magma e collectibles ---
+class CollectibleManager:
+    """Bolle di magma di una partita, una per piattaforma.
+
+    Le bolle stanno in un dict piattaforma -> bolla e seguono la vita della piattaforma tramite
+    le callback di PlatformManager (vedi follow_platforms): nessun controllo per frame.
+    """
+    def __init__(self, rng=None, grid=None, popups=None):
+        # Generatore casuale di bolle e particelle (default: modulo random globale)
+        self.rng = rng if rng is not None else random
+        # Griglia spaziale per le collisioni col player (condivisa con i nemici)
+        self.grid = grid if grid is not None else SpatialGrid()
+        self.collectibles = {}  # piattaforma -> bolla
+        # Bolle delle piattaforme uscite dal gioco, riusate per le nuove
+        self.pool = ObjectPool(Collectible)
+        # Testi "+valore" alla raccolta (popups.PopupManager, condiviso con la partita)
+        self.popups = popups
+        self.platform_manager = None
+
+    def follow_platforms(self, platform_manager):
+        """Crea una bolla su ogni piattaforma presente e su ogni nuova, e la toglie con la piattaforma."""
+        self.platform_manager = platform_manager
+        platform_manager.on_platform_added.append(self.add_magma_bubble_for_platform)
+        platform_manager.on_platform_removed.append(self.remove_for_platform)
+        for plat in platform_manager.platforms:
+            self.add_magma_bubble_for_platform(plat)
+
+    def add_magma_bubble_for_platform(self, plat):
+        """Aggiunge una bolla di magma sopra la piattaforma, se non ne ha già una."""
+        if plat in self.collectibles:
+            return
         x = plat.rect.centerx
         radius = 10  # Deve corrispondere a Collectible.radius
         offset = 16  # Spazio extra tra piattaforma e bolla
         y = plat.rect.top - offset - radius
-        bubble = Collectible(x, y, value=200)
+        bubble = self.pool.acquire(x, y, BUBBLE_VALUE, self.rng)
         bubble.type = 'magma_bubble'
         bubble.platform = plat  # Associa la piattaforma
-        collectibles.append(bubble)
-
-def update_collectibles(dt):
-    global collectibles
-    for c in collectibles:
-        c.update(dt)
-
-def draw_collectibles(screen, world_offset, platform_manager):
-    global collectibles
-    from collectibles import prune_orphaned_or_offscreen
-    prune_orphaned_or_offscreen(collectibles, platform_manager, world_offset, SCREEN_HEIGHT)
-    for c in collectibles:
-        c.draw(screen, world_offset)
-
-def check_collectibles_collision(player):
-    global collectibles
-    collected = 0
-    for c in collectibles:
-        if not c.collected and c.type == 'magma_bubble' and c.check_collision(player):
-            c.collected = True
-            c.trigger_float_text(f'+{c.value}')
-            collected += c.value
-    return collected
-
-def get_world_offset():
-    return 0
-@staticmethod
-def prune_orphaned_or_offscreen(collectibles, platform_manager, world_offset, screen_height):
-    """Rimuove collectibles se la piattaforma associata non è più attiva o sono fuori schermo."""
-    active_platforms = set(platform_manager.platforms)
-    def is_collectible_visible(c):
-        if c.platform is not None:
-            if c.platform not in active_platforms:
-                return False
-            plat_y = c.platform.rect.top + world_offset
-            return -50 < plat_y < screen_height + 50
+        self.collectibles[plat] = bubble
+        if plat.moving:
+            # Segue la piattaforma in orizzontale: registrata su tutta la riga
+            self.grid.insert_row(bubble, bubble.bounds(), GRID_LAYER)
         else:
-            y = c.y + world_offset
-            return -50 < y < screen_height + 50
-    collectibles[:] = [c for c in collectibles if is_collectible_visible(c)]
+            self.grid.insert(bubble, bubble.bounds(), GRID_LAYER)
+
+    def remove_for_platform(self, plat):
+        """Toglie la bolla della piattaforma (uscita dal fondo o crollata)."""
+        bubble = self.collectibles.pop(plat, None)
+        if bubble is not None:
+            self.grid.remove(bubble)
+            self.pool.release(bubble)
+
+    def update(self, dt, top=None, bottom=None):
+        """Anima le bolle; con top/bottom (y del mondo) solo quelle delle piattaforme in quella fascia."""
+        if top is None or self.platform_manager is None:
+            for c in self.collectibles.values():
+                c.update(dt)
+            return
+        # Le bolle fuori schermo non si vedono: niente animazione né particelle
+        collectibles = self.collectibles
+        for plat in self.platform_manager.platforms.in_band(top, bottom):
+            c = collectibles.get(plat)
+            if c is not None:
+                c.update(dt)
+
+    def draw(self, screen, world_offset, platform_manager):
+        """world_offset: offset della telecamera (camera.offset), da sommare alle y del mondo."""
+        # Solo le bolle delle piattaforme nella fascia visibile (con margine per bolla e testo)
+        collectibles = self.collectibles
+        for plat in platform_manager.platforms.in_band(-world_offset - 50, SCREEN_HEIGHT - world_offset + 50):
+            c = collectibles.get(plat)
+            if c is not None:
+                c.draw(screen, world_offset)
+
+    def check_collision(self, player, nearby=None):
+        """Raccoglie le bolle toccate dal player e restituisce il valore raccolto.
+
+        nearby: risultato della query del player sulla griglia condivisa (None: la fa qui).
+        """
+        if nearby is None:
+            nearby = self.grid.query(neighborhood(player))
+        grid = self.grid
+        collected = 0
+        for c in nearby.layer(GRID_LAYER):
+            if not c.collected and c.type == 'magma_bubble' and c.check_collision(player):
+                c.collected = True
+                position = c.text_position()
+                if self.popups is not None and position is not None:
+                    self.popups.show(f'+{c.value}', *position, POPUP_COLOR)
+                collected += c.value
+                grid.remove(c)  # raccolta: non serve più nelle query
+        return collected
+
+    def __len__(self):
+        return len(self.collectibles)
 import pygame
 import random
 import math
@@ -80,42 +112,40 @@ from constants import SCREEN_HEIGHT
 
 
 class Collectible:
-    def __init__(self, x, y, value=100):
+    # Colori per tipo (uguali per tutte le istanze)
+    colors = {
+        'crystal': (0, 255, 255),
+        'gem': (255, 0, 255),
+        'mineral': (255, 215, 0),
+        'magma_bubble': (255, 120, 0)
+    }
+
+    def __init__(self, x, y, value=100, rng=random):
+        self.lava_particles = []  # particelle decorative
+        self.reset(x, y, value, rng)
+
+    def reset(self, x, y, value=100, rng=random):
+        """Riporta il collectible allo stato iniziale (riuso dal pool, vedi pool.py)."""
         self.x = x
         self.y = y
         self.value = value
+        self.rng = rng
         self.collected = False
         self.radius = 10
         self.animation_time = 0
-        self.type = random.choice(['crystal', 'gem', 'mineral', 'magma_bubble'])
+        self.type = self.rng.choice(['crystal', 'gem', 'mineral', 'magma_bubble'])
         self.platform = None  # riferimento alla piattaforma su cui si trova
-        self.float_text = None  # testo che sale e si dissolve
-        self.float_timer = 0
-        self.float_y = 0
-        self.lava_particles = []  # particelle decorative
-
-        self.colors = {
-            'crystal': (0, 255, 255),
-            'gem': (255, 0, 255),
-            'mineral': (255, 215, 0),
-            'magma_bubble': (255, 120, 0)
-        }
+        self.lava_particles.clear()
 
     def update(self, dt):
         self.animation_time += dt * 4
-        # Se la bolla è raccolta, aggiorna il testo che sale
-        if self.float_text:
-            self.float_timer += dt
-            self.float_y -= 30 * dt  # sale verso l'alto
-            if self.float_timer > 1.0:
-                self.float_text = None
 
         # Aggiorna particelle lava decorative
         if self.type == 'magma_bubble' and not self.collected:
             # Aggiungi nuove particelle decorative ancorate alla piattaforma
-            if random.random() < 0.15:
-                angle = random.uniform(0, 2*math.pi)
-                speed = random.uniform(8, 18)
+            if self.rng.random() < 0.15:
+                angle = self.rng.uniform(0, 2*math.pi)
+                speed = self.rng.uniform(8, 18)
                 vx = math.cos(angle) * speed * 0.1
                 vy = math.sin(angle) * speed * 0.1 - 0.5
                 self.lava_particles.append({
@@ -123,9 +153,9 @@ class Collectible:
                     'rel_y': 0,
                     'vx': vx,
                     'vy': vy,
-                    'life': random.uniform(0.3, 0.7),
+                    'life': self.rng.uniform(0.3, 0.7),
                     'age': 0,
-                    'radius': random.randint(2, 4)
+                    'radius': self.rng.randint(2, 4)
                 })
             # Aggiorna e rimuovi particelle vecchie (relative alla bolla)
             for p in self.lava_particles:
@@ -137,7 +167,6 @@ class Collectible:
 
 
     def draw(self, surface, world_offset):
-        # Testo che sale e si dissolve
         # Calcola la posizione reale ancorata alla piattaforma (se presente)
         plat_x = self.x
         plat_y = self.y
@@ -153,14 +182,6 @@ class Collectible:
             else:
                 y_draw = plat_y + world_offset
 
-            # Testo che sale e si dissolve
-            if self.float_text:
-                font = pygame.font.SysFont(None, 32)
-                alpha = max(0, 255 - int(self.float_timer * 255))
-                text_surf = font.render(self.float_text, True, (255,255,0))
-                text_surf.set_alpha(alpha)
-                surface.blit(text_surf, (plat_x-18, y_draw + self.float_y))
-
             if self.collected:
                 return
 
@@ -171,15 +192,12 @@ class Collectible:
                     # Particelle lava decorative ancorate alla piattaforma
                     for p in self.lava_particles:
                         alpha = int(255 * (1 - p['age']/p['life']))
-                        color = (255, 120, 0, alpha)
-                        s = pygame.Surface((p['radius']*2, p['radius']*2), pygame.SRCALPHA)
-                        pygame.draw.circle(s, color, (p['radius'], p['radius']), p['radius'])
+                        s = circle_sprite(p['radius'], (255, 120, 0), alpha)
                         # Le particelle sono sempre relative alla piattaforma
                         surface.blit(s, (plat_x + p['rel_x'] - p['radius'], plat_y + p['rel_y'] - p['radius'] - vertical_gap - self.radius + world_offset))
                     # Bolla
                     pygame.draw.circle(surface, (255, 120, 0), (int(plat_x), int(y_draw)), self.radius)
-                    glow_surf = pygame.Surface((self.radius*2+8, self.radius*2+8), pygame.SRCALPHA)
-                    pygame.draw.circle(glow_surf, (255, 200, 80, 80), (self.radius+4, self.radius+4), self.radius+4)
+                    glow_surf = circle_sprite(self.radius+4, (255, 200, 80), 80)
                     surface.blit(glow_surf, (int(plat_x)-self.radius-4, int(y_draw)-self.radius-4), special_flags=pygame.BLEND_RGBA_ADD)
                     pygame.draw.circle(surface, (255, 255, 180), (int(plat_x)-4, int(y_draw)-4), 5)
                     pygame.draw.circle(surface, (180, 60, 0), (int(plat_x), int(y_draw)), self.radius, 2)
@@ -210,26 +228,32 @@ class Collectible:
                         py = screen_y + (((particle_seed + 31) % 31) - 15)  # -15 a +15
                         size = 1 + (particle_seed % 3)  # 1-3
                         alpha = int(255 * ((particle_seed % 100) / 100.0))  # 0-255
-                        sparkle_surface = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-                        pygame.draw.circle(sparkle_surface, (*color, alpha), (size, size), size)
-                        surface.blit(sparkle_surface, (px-size, py-size))
+                        surface.blit(circle_sprite(size, color, alpha), (px-size, py-size))
+
+    def anchor(self):
+        """Centro usato per la raccolta: ancorato alla piattaforma, se c'è."""
+        if self.platform is not None:
+            return self.platform.rect.centerx, self.platform.rect.top - 28
+        return self.x, self.y
+
+    def bounds(self):
+        """Rettangolo attorno al centro di raccolta, per la griglia spaziale."""
+        x, y = self.anchor()
+        return pygame.Rect(x - self.radius, y - self.radius, 2 * self.radius, 2 * self.radius)
 
     def check_collision(self, player):
-        if self.collected or self.float_text:
+        if self.collected:
             return False
         # Usa la posizione ancorata alla piattaforma
-        plat_x = self.x
-        plat_y = self.y
-        if self.platform is not None:
-            plat_x = self.platform.rect.centerx
-            plat_y = self.platform.rect.top - 28
+        plat_x, plat_y = self.anchor()
         distance = math.hypot(player.x - plat_x, player.y - plat_y)
         # Raccogli solo se il player è sopra la piattaforma (non se la piattaforma copre la bolla)
         if player.y + player.radius < plat_y:
             return False
         return distance < (self.radius + player.radius)
 
-    def trigger_float_text(self, text='+100'):
-        self.float_text = text
-        self.float_timer = 0
-        self.float_y = 0
\ No newline at end of file
+    def text_position(self):
+        """Angolo in alto a sinistra (nel mondo) del testo che compare alla raccolta, o None."""
+        if self.platform is None:
+            return None
+        return self.platform.rect.centerx - 18, self.platform.rect.top - 10 - self.radius
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""
+Profilo del cono del vulcano: x delle due pareti per ogni pixel di altezza assoluta,
+calcolate una volta sola in due array compatti.
+
+L'altezza assoluta si misura dal fondo del vulcano: volcano_total_scroll + (SCREEN_HEIGHT - y).
+Disegno delle pareti e dello sfondo interno, collisione del player e limiti delle piattaforme
+leggono tutti da questa tabella, quindi coincidono sempre al pixel.
+"""
+import math
+from array import array
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+CRATER_WIDTH = 120    # larghezza del passaggio al cratere
+CRATER_RATIO = 0.9    # il cratere inizia al 90% dell'altezza del vulcano
+
+
+class ConeProfile:
+    """Tabella delle pareti del cono, indicizzata per altezza assoluta intera."""
+
+    def __init__(self, total_height, base_width=SCREEN_WIDTH, crater_width=CRATER_WIDTH, crater_ratio=CRATER_RATIO):
+        self.total_height = int(total_height)
+        self.crater_height = total_height * crater_ratio
+        self.base_width = base_width
+        self.crater_width = crater_width
+        # Prima altezza intera del cratere: da qui in su non ci sono pareti
+        self.crater_index = min(self.total_height + 1, math.ceil(self.crater_height))
+
+        # left[h] = fine della parete sinistra, right[h] = inizio della parete destra.
+        # Nel cratere il passaggio è dritto e largo crater_width (usato dallo sfondo interno).
+        center = SCREEN_WIDTH / 2
+        reduction = (base_width - crater_width) / total_height if total_height > 0 else 0.0
+        self.left = array('d')
+        self.right = array('d')
+        for h in range(self.total_height + 1):
+            if h >= self.crater_index:
+                passage_width = crater_width
+            else:
+                passage_width = max(crater_width, min(base_width - reduction * h, base_width))
+            self.left.append(center - passage_width / 2)
+            self.right.append(center + passage_width / 2)
+
+    def index(self, y, scroll):
+        """Altezza assoluta (indice nella tabella) della coordinata schermo y."""
+        h = int(scroll + (SCREEN_HEIGHT - y))
+        if h < 0:
+            return 0
+        if h > self.total_height:
+            return self.total_height
+        return h
+
+    def wall_index(self, y, scroll):
+        """Come index, ma -1 se a quell'altezza non ci sono pareti (cratere)."""
+        h = self.index(y, scroll)
+        return -1 if h >= self.crater_index else h
@@ -13,6 +13,12 @@ SCREEN_HEIGHT = 800
 FPS = 60
 GRAVITY = 0.98
 
+# Simulazione a passo fisso (vedi timer_system.py)
+SIM_TICK_RATE = 60      # tick di simulazione al secondo
+BASE_TICK_RATE = 60     # frequenza su cui sono tarate le costanti "per frame" (gravità, velocità, timer)
+MAX_FRAME_TIME = 0.25   # tempo reale massimo accumulato per frame (evita la spirale di recupero)
+MAX_SIM_STEPS = 8       # tick massimi simulati in un singolo frame di rendering
+
 # Game States
 MENU = 0
 PLAYING = 1
@@ -44,6 +50,7 @@ ENABLE_VOLCANO_DEBUG = False
 ENABLE_INPUT_DEBUG = False
 ENABLE_COLLISION_DEBUG = False
 SHOW_CRATER_DEBUG = False
+SHOW_PROFILER_OVERLAY = False  # overlay dei tempi di frame visibile all'avvio (F3 per mostrarlo/nasconderlo)
 
 # Physics constants
 GRAVITY = 0.25
@@ -1,7 +1,15 @@
 import pygame
 import random
 import math
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, BASE_TICK_RATE
+from timer_system import tick_scale, lerp
+from movers import HAVE_NUMPY, EnemyMovers
+from camera import Camera
+from pool import ObjectPool
+from spatial import SpatialGrid, neighborhood
+from fonts import get_font
+
+GRID_LAYER = 'enemies'  # layer dei nemici nella griglia spaziale condivisa
 
 # penalità secondi per tipo minerale
 penalties = {
@@ -61,8 +69,13 @@ mineral_properties = {
 }
 
 class Enemy(pygame.sprite.Sprite):
-    def __init__(self, x, y, kind="olivina"):
+    def __init__(self, x, y, kind="olivina", rng=random):
         super().__init__()
+        self._set_kind(kind)
+        self.rect = self.image.get_rect(center=(x, y))
+        self.reset(x, y, kind, rng)
+
+    def _set_kind(self, kind):
         self.kind = kind
         self.properties = mineral_properties[kind]
         
@@ -72,23 +85,27 @@ class Enemy(pygame.sprite.Sprite):
         
         # Disegna il minerale
         self._draw_mineral()
-        
-        self.rect = self.image.get_rect(center=(x, y))
+
+    def reset(self, x, y, kind="olivina", rng=random):
+        """Riporta il nemico allo stato iniziale (riuso dal pool: l'immagine resta se il minerale è lo stesso)."""
+        if kind != self.kind:
+            self._set_kind(kind)
+            self.rect.size = self.image.get_size()
+        self.rect.center = (x, y)
+        # Posizione in virgola mobile e posizione al tick precedente (per l'interpolazione)
+        self.fx, self.fy = float(self.rect.x), float(self.rect.y)
+        self.prev_x, self.prev_y = self.fx, self.fy
         
         # Movimento più naturale
-        self.speedx = random.uniform(-0.8, 0.8)
-        self.speedy = random.uniform(1.0, 2.5)
-        self.rotation = random.uniform(0, 360)
-        self.rotation_speed = random.uniform(-2, 2)
+        self.speedx = rng.uniform(-0.8, 0.8)
+        self.speedy = rng.uniform(1.0, 2.5)
+        self.rotation = rng.uniform(0, 360)
+        self.rotation_speed = rng.uniform(-2, 2)
         
         # Oscillazione durante la caduta
-        self.oscillation = random.uniform(0, math.pi * 2)
-        self.oscillation_speed = random.uniform(0.02, 0.05)
-        
-        # Testo animato
-        self.float_text = None
-        self.float_timer = 0
-        self.float_y = 0
+        self.oscillation = rng.uniform(0, math.pi * 2)
+        self.oscillation_speed = rng.uniform(0.02, 0.05)
+
 
     def _draw_mineral(self):
         """Disegna il minerale con forma caratteristica."""
@@ -155,7 +172,7 @@ class Enemy(pygame.sprite.Sprite):
             pygame.draw.polygon(self.image, accent, points, 2)
         
         # Aggiungi il nome del minerale sotto
-        font = pygame.font.Font(None, 16)
+        font = get_font(16)
         text = font.render(self.kind.capitalize(), True, (255, 255, 255))
         text_rect = text.get_rect(center=(center_x, size + 15))
         
@@ -164,62 +181,65 @@ class Enemy(pygame.sprite.Sprite):
         self.image.blit(shadow, (text_rect.x + 1, text_rect.y + 1))
         self.image.blit(text, text_rect)
 
-    def trigger_float_text(self, text="PENALITÀ!"):
-
-        self.float_text = text
-        self.float_timer = 0
-        self.float_y = 0
-
-    def update(self):
+    def update(self, dt=1.0 / BASE_TICK_RATE):
+        k = tick_scale(dt)
+        self.prev_x, self.prev_y = self.fx, self.fy
         # Movimento con oscillazione naturale
-        self.oscillation += self.oscillation_speed
+        self.oscillation += self.oscillation_speed * k
         oscillation_offset = math.sin(self.oscillation) * 0.5
         
-        self.rect.y += self.speedy
-        self.rect.x += self.speedx + oscillation_offset
+        self.fy += self.speedy * k
+        self.fx += (self.speedx + oscillation_offset) * k
+        self.rect.x, self.rect.y = round(self.fx), round(self.fy)
         
         # Rotazione
-        self.rotation += self.rotation_speed
+        self.rotation += self.rotation_speed * k
         
         # Rimbalzo sui bordi con perdita di energia
         if self.rect.left < 50:
             self.rect.left = 50
+            self.fx = float(self.rect.x)
             self.speedx = abs(self.speedx) * 0.8
         elif self.rect.right > SCREEN_WIDTH - 50:
             self.rect.right = SCREEN_WIDTH - 50
+            self.fx = float(self.rect.x)
             self.speedx = -abs(self.speedx) * 0.8
 
-        # Aggiorna testo animato
-        if self.float_text:
-            self.float_timer += 0.016  # ~60 FPS
-            self.float_y -= 30 * 0.016
-            if self.float_timer > 1.0:
-                self.float_text = None
+    def draw(self, screen, alpha=1.0, y_offset=0):
+        # Posizione interpolata tra gli ultimi due tick, spostata dalla telecamera
+        x = round(lerp(self.prev_x, self.fx, alpha))
+        y = round(lerp(self.prev_y, self.fy, alpha))
+        self.draw_at(screen, x, y + y_offset)
 
-    def draw(self, screen):
+    def draw_at(self, screen, x, y):
+        """Disegna il nemico con l'angolo in alto a sinistra in (x, y) sullo schermo."""
+        draw_rect = self.rect.move(x - self.rect.x, y - self.rect.y)
         # Disegna con rotazione se necessario
         if abs(self.rotation_speed) > 0.1:
             # Ruota l'immagine
             rotated = pygame.transform.rotate(self.image, self.rotation)
-            rotated_rect = rotated.get_rect(center=self.rect.center)
+            rotated_rect = rotated.get_rect(center=draw_rect.center)
             screen.blit(rotated, rotated_rect)
-            draw_pos = rotated_rect.center
         else:
-            screen.blit(self.image, self.rect.topleft)
-            draw_pos = self.rect.center
-
-        # Testo animato rosso stile collectibles
-        if self.float_text:
-            font = pygame.font.SysFont(None, 32)
-            alpha = max(0, 255 - int(self.float_timer * 255))
-            text_surf = font.render(self.float_text, True, (255,0,0))
-            text_surf.set_alpha(alpha)
-            x, y = draw_pos
-            screen.blit(text_surf, (x-18, y + self.float_y))
+            screen.blit(self.image, draw_rect.topleft)
 
 class EnemyManager:
-    def __init__(self):
+    """Nemici in coordinate del mondo: lo scroll sposta solo la telecamera (camera.py)."""
+    # Sotto questo numero di nemici l'update per oggetto costa meno delle operazioni NumPy
+    VECTOR_MIN_ENEMIES = 32
+
+    def __init__(self, rng=None, camera=None, grid=None):
+        self.camera = camera if camera is not None else Camera()
+        # Griglia spaziale per le collisioni col player (condivisa con i collectibles)
+        self.grid = grid if grid is not None else SpatialGrid()
+        # Generatore casuale degli spawn (default: modulo random globale)
+        self.rng = rng if rng is not None else random
         self.enemies = pygame.sprite.Group()
+        # Con NumPy e molti nemici, posizioni e velocità passano in colonne aggiornate in blocco (movers.py)
+        self.movers = EnemyMovers() if HAVE_NUMPY else None
+        self.vectorized = False
+        # Nemici usciti dallo schermo, riusati per minerale (l'immagine è già disegnata)
+        self.pool = ObjectPool(Enemy, max_free=16)
         self.spawn_timer = 0
         self.base_spawn_interval = 1.5  # secondi base tra spawn (dimezzato)
         self.spawn_variation = 1.0  # variazione casuale (dimezzato)
@@ -237,29 +257,29 @@ class EnemyManager:
 
     def _calculate_next_spawn(self):
         """Calcola il tempo per il prossimo spawn con variazione casuale."""
-        variation = random.uniform(-self.spawn_variation, self.spawn_variation)
+        variation = self.rng.uniform(-self.spawn_variation, self.spawn_variation)
         return self.base_spawn_interval + variation
 
     def _get_weighted_mineral(self):
         """Seleziona un minerale basato sui pesi di probabilità."""
         minerals = list(self.spawn_weights.keys())
         weights = list(self.spawn_weights.values())
-        return random.choices(minerals, weights=weights)[0]
+        return self.rng.choices(minerals, weights=weights)[0]
 
-    def update(self, dt, scroll_offset=0, total_scroll_distance=0, current_level_name=None):
+    def update(self, dt, total_scroll_distance=0, current_level_name=None):
         self.spawn_timer += dt
+        # Nemici usciti sotto lo schermo (y del mondo)
+        bottom = self.camera.to_world(SCREEN_HEIGHT + 50)
 
         # Blocca o riduci drasticamente la generazione di nemici nel vulcano
         if current_level_name == "Vulcano":
             max_enemies = 2
             if len(self.enemies) > max_enemies:
                 # Solo aggiorna e rimuovi, non spawnare
-                for enemy in list(self.enemies):
-                    enemy.update()
-                    if scroll_offset > 0:
-                        enemy.rect.y += scroll_offset
-                    if enemy.rect.top > SCREEN_HEIGHT + 50:
-                        self.enemies.remove(enemy)
+                if self._use_movers():
+                    self._update_movers(dt, bottom)
+                    return
+                self._update_enemies(dt, bottom)
                 return
 
         # Difficoltà: più si sale, più spawn veloci (min 0.7s tra spawn)
@@ -280,42 +300,97 @@ class EnemyManager:
             self.next_spawn_time = self._calculate_next_spawn()
 
         # Aggiorna tutti i nemici
+        if self._use_movers():
+            self._update_movers(dt, bottom)
+            return
+        self._update_enemies(dt, bottom)
+
+    def _update_enemies(self, dt, bottom):
+        """Update per oggetto: muove i nemici anche nella griglia e toglie quelli sotto `bottom`."""
+        grid = self.grid
         for enemy in list(self.enemies):
-            enemy.update()
-            # Applica offset di scroll per effetto salita del player
-            if scroll_offset > 0:
-                enemy.rect.y += scroll_offset
+            enemy.update(dt)
             # Rimuovi nemici fuori schermo
-            if enemy.rect.top > SCREEN_HEIGHT + 50:
-                self.enemies.remove(enemy)
+            if enemy.rect.top > bottom:
+                self._remove(enemy)
+            else:
+                grid.move(enemy, enemy.rect)
+
+    def _use_movers(self):
+        """Passa dall'update per oggetto a quello a colonne (e viceversa) in base al numero di nemici."""
+        if self.movers is None:
+            return False
+        count = len(self.enemies)
+        if not self.vectorized and count >= self.VECTOR_MIN_ENEMIES:
+            # Con le colonne i Rect non sono aggiornati: i nemici escono dalla griglia
+            self.movers.load(self.enemies)
+            for enemy in self.enemies:
+                self.grid.remove(enemy)
+            self.vectorized = True
+        elif self.vectorized and count < self.VECTOR_MIN_ENEMIES // 2:
+            self.movers.flush()
+            self.movers.clear()
+            for enemy in self.enemies:
+                self.grid.insert(enemy, enemy.rect, GRID_LAYER)
+            self.vectorized = False
+        return self.vectorized
+
+    def _update_movers(self, dt, bottom):
+        """Come il ciclo di update per nemico, ma su tutte le righe di self.movers insieme."""
+        self.movers.step(tick_scale(dt))
+        for enemy in self.movers.remove_below(bottom):
+            self._remove(enemy)
+
+    def _remove(self, enemy):
+        self.enemies.remove(enemy)
+        self.grid.remove(enemy)
+        self.pool.release(enemy, key=enemy.kind)
+
+    def _new_enemy(self, x, y, kind):
+        return self.pool.acquire(x, y, kind, self.rng, key=kind)
+
+    def _add(self, enemy):
+        self.enemies.add(enemy)
+        if self.vectorized:
+            self.movers.add(enemy)
+        else:
+            self.grid.insert(enemy, enemy.rect, GRID_LAYER)
 
     def spawn_single_enemy(self):
         """Spawna un singolo nemico in posizione casuale."""
         kind = self._get_weighted_mineral()
-        x = random.randint(80, SCREEN_WIDTH - 80)
-        y = random.randint(-100, -50)  # Varia l'altezza di spawn
+        x = self.rng.randint(80, SCREEN_WIDTH - 80)
+        y = self.camera.to_world(self.rng.randint(-100, -50))  # Varia l'altezza di spawn, sopra lo schermo
         
-        self.enemies.add(Enemy(x, y, kind))
+        self._add(self._new_enemy(x, y, kind))
 
     def spawn_cluster(self, num_enemies=3):
         """Spawna un gruppo di nemici vicini (per eventi speciali)."""
-        center_x = random.randint(100, SCREEN_WIDTH - 100)
+        center_x = self.rng.randint(100, SCREEN_WIDTH - 100)
         
         for i in range(num_enemies):
             kind = self._get_weighted_mineral()
             # Posizioni vicine ma non sovrapposte
-            x = center_x + random.randint(-60, 60)
-            y = random.randint(-150, -50) - i * 40
+            x = center_x + self.rng.randint(-60, 60)
+            y = self.camera.to_world(self.rng.randint(-150, -50) - i * 40)
             x = max(80, min(SCREEN_WIDTH - 80, x))  # Mantieni nei limiti
             
-            self.enemies.add(Enemy(x, y, kind))
+            self._add(self._new_enemy(x, y, kind))
 
-    def check_collision(self, player):
-        """Controlla collisioni con il player."""
+    def check_collision(self, player, nearby=None):
+        """Controlla collisioni con il player.
+
+        nearby: risultato della query del player sulla griglia condivisa (None: la fa qui).
+        Con l'update a colonne i nemici non sono nella griglia e il test è già in blocco.
+        """
         player_rect = player.get_rect()
+        if self.vectorized:
+            return self.movers.colliding(player_rect, player.radius)
+        if nearby is None:
+            nearby = self.grid.query(neighborhood(player))
         hits = []
         
-        for enemy in self.enemies:
+        for enemy in nearby.layer(GRID_LAYER):
             # Collisione più precisa considerando la forma del minerale
             if enemy.rect.colliderect(player_rect):
                 # Controllo distanza per collisione più realistica
@@ -329,10 +404,13 @@ class EnemyManager:
         
         return hits
 
-    def draw(self, screen):
-        """Disegna tutti i nemici."""
+    def draw(self, screen, alpha=1.0, y_offset=0):
+        """Disegna tutti i nemici (alpha: interpolazione tra gli ultimi due tick; y_offset: telecamera)."""
+        if self.vectorized:
+            self.movers.draw(screen, alpha, y_offset)
+            return
         for enemy in self.enemies:
-            enemy.draw(screen)
+            enemy.draw(screen, alpha, y_offset)
 
     def get_enemy_count(self):
         """Restituisce il numero di nemici attivi."""
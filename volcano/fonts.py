@@ -0,0 +1,192 @@
+"""
+Registro dei font: ogni (faccia, dimensione, grassetto) viene caricato una sola volta per processo.
+
+La faccia None è il font incluso in pygame (lo stesso che restituisce SysFont(None, ...)) e si
+apre direttamente, senza cercare tra i font di sistema; un percorso .ttf/.otf viene caricato da
+file (resource_path, come le immagini di assets.py); qualunque altro nome è un font di sistema,
+cercato con SysFont una sola volta. preload() all'avvio carica tutte le combinazioni usate dal
+gioco, così durante i frame get_font() è solo una lettura da dizionario.
+
+I font sono condivisi: chi li riceve non deve cambiarne lo stile (set_bold, set_italic, ...).
+"""
+from collections import OrderedDict
+
+import pygame
+
+from assets import resource_path
+
+TITLE_FACE = "Comic Sans MS"  # titolo e sottotitolo del menu principale
+
+# (dimensione, faccia, grassetto) di tutti i testi del gioco
+PRELOAD = (
+    (16, None, False),        # nome del minerale sotto i nemici
+    (20, None, False),        # timer della barra di raffreddamento, overlay del profiler
+    (24, None, False),        # etichetta della barra di raffreddamento, testi piccoli dei menu
+    (30, None, False),        # HUD
+    (32, None, False),        # testi che salgono (+200, penalità), messaggi
+    (48, None, False),
+    (64, None, False),
+    (80, TITLE_FACE, True),   # titolo del menu
+    (40, TITLE_FACE, False),  # sottotitolo del menu
+)
+
+
+class FontRegistry:
+    def __init__(self):
+        self._fonts = {}  # (dimensione, faccia, grassetto) -> pygame.font.Font
+
+    def __len__(self):
+        return len(self._fonts)
+
+    def get(self, size, face=None, bold=False):
+        key = (size, face, bold)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = self._load(size, face, bold)
+        return font
+
+    def preload(self, specs=PRELOAD):
+        """Carica in anticipo i font elencati in specs (tuple come quelle di PRELOAD)."""
+        for size, face, bold in specs:
+            self.get(size, face, bold)
+
+    @staticmethod
+    def _load(size, face, bold):
+        if face is None:
+            font = pygame.font.Font(None, size)
+        elif face.lower().endswith(('.ttf', '.otf')):
+            font = pygame.font.Font(resource_path(face), size)
+        else:
+            try:
+                return pygame.font.SysFont(face, size, bold=bold)
+            except Exception:
+                # Font di sistema non disponibile: ripiega sul font di pygame
+                font = pygame.font.Font(None, size)
+        if bold:
+            font.set_bold(True)
+        return font
+
+
+FONTS = FontRegistry()
+
+
+def get_font(size, face=None, bold=False):
+    """Font condiviso dal registro di modulo (vedi FontRegistry)."""
+    return FONTS.get(size, face, bold)
+
+
+class TextCache:
+    """Testi già renderizzati, per (font, testo, colore, antialias), con scarto LRU.
+
+    Le superfici sono condivise: chi le riceve le blitta e basta (niente set_alpha o disegni sopra).
+    """
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self._texts = OrderedDict()  # chiave -> Surface, dalla meno alla più usata di recente
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._texts)
+
+    def render(self, font, text, color, antialias=True):
+        """Come font.render(text, antialias, color), ma renderizza ogni testo una volta sola."""
+        key = (font, text, tuple(color), antialias)
+        texts = self._texts
+        surface = texts.get(key)
+        if surface is not None:
+            self.hits += 1
+            texts.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = texts[key] = font.render(text, antialias, color)
+        if len(texts) > self.max_size:
+            texts.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        self._texts.clear()
+
+    def stats(self):
+        """Contatori della cache: testi riusati, renderizzati, scartati e percentuale di riuso."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._texts),
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+TEXTS = TextCache()
+
+
+def render_text(font, text, color, antialias=True):
+    """Testo renderizzato dalla cache di modulo (vedi TextCache.render)."""
+    return TEXTS.render(font, text, color, antialias)
+
+
+class GlyphAtlas:
+    """Cifre (e pochi separatori) di un font e colore pre-renderizzate in un'unica superficie.
+
+    Per i numeri che cambiano spesso (punteggio, timer): invece di un font.render per ogni nuovo
+    valore, draw() compone il testo blittando i glifi dall'atlante, uno accanto all'altro con
+    l'avanzamento del font. I caratteri che non sono nell'atlante passano dalla cache dei testi.
+    """
+    CHARS = "0123456789:-+ "
+
+    def __init__(self, font, color, antialias=True, chars=CHARS):
+        self.font = font
+        self.color = color
+        self.antialias = antialias
+        glyphs = [font.render(ch, antialias, color) for ch in chars]
+        self.height = max(g.get_height() for g in glyphs)
+        self.atlas = pygame.Surface((sum(g.get_width() for g in glyphs), self.height), pygame.SRCALPHA)
+        # Fondo trasparente del colore del testo: i bordi sfumati dei glifi non si scuriscono
+        self.atlas.fill((*color[:3], 0))
+        self._areas = {}     # carattere -> Rect del glifo nell'atlante
+        self._advance = {}   # carattere -> avanzamento orizzontale del font
+        x = 0
+        for ch, glyph, metrics in zip(chars, glyphs, font.metrics(chars)):
+            self.atlas.blit(glyph, (x, 0))
+            self._areas[ch] = pygame.Rect(x, 0, glyph.get_width(), glyph.get_height())
+            self._advance[ch] = metrics[4]
+            x += glyph.get_width()
+
+    def size(self, text):
+        """(larghezza, altezza) del testo composto da draw()."""
+        advance = self._advance
+        width = 0
+        for ch in text:
+            width += advance[ch] if ch in advance else self.font.size(ch)[0]
+        return width, self.height
+
+    def draw(self, surface, text, pos):
+        """Disegna text con l'angolo in alto a sinistra in pos. Restituisce il Rect occupato."""
+        areas, advance, atlas = self._areas, self._advance, self.atlas
+        x, y = pos
+        for ch in text:
+            area = areas.get(ch)
+            if area is not None:
+                surface.blit(atlas, (x, y), area)
+                x += advance[ch]
+            else:
+                glyph = render_text(self.font, ch, self.color, self.antialias)
+                surface.blit(glyph, (x, y))
+                x += glyph.get_width()
+        return pygame.Rect(pos[0], y, x - pos[0], self.height)
+
+
+_ATLASES = {}
+
+
+def glyph_atlas(font, color, antialias=True):
+    """Atlante delle cifre condiviso per (font, colore, antialias), creato al primo uso."""
+    key = (font, tuple(color), antialias)
+    atlas = _ATLASES.get(key)
+    if atlas is None:
+        atlas = _ATLASES[key] = GlyphAtlas(font, color, antialias)
+    return atlas
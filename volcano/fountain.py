@@ -1,86 +1,71 @@
-﻿# --- Gestione stato vittoria e fontana ---
-import time
-
-victory_fountain_active = False
-fountain_start_time = 0
-victory_timer = 0
-fountain = None
-
-def reset_victory_state():
-    global victory_fountain_active, fountain_start_time, victory_timer, fountain
-    victory_fountain_active = False
-    fountain_start_time = 0
-    victory_timer = 0
-    fountain = None
-
-def start_victory_fountain(screen_width, screen_height):
-    global victory_fountain_active, fountain_start_time, fountain
-    victory_fountain_active = True
-    fountain_start_time = time.time()
-    from fountain import Fountain
-    fountain = Fountain(screen_width // 2, screen_height // 2)
-    return fountain
-
-def update_victory_fountain():
-    global victory_timer, fountain_start_time, fountain
-    victory_timer = time.time() - fountain_start_time
-    if fountain is not None:
-        fountain.emit()
-        fountain.update()
-    return victory_timer
-
-def is_victory_active():
-    global victory_fountain_active
-    return victory_fountain_active
-
-def get_victory_timer():
-    global victory_timer
-    return victory_timer
-
-def get_fountain():
-    global fountain
-    return fountain
-
-def set_victory_active(val):
-    global victory_fountain_active
-    victory_fountain_active = val
-import pygame
-import random
-import math
+# --- Gestione stato vittoria e fontana ---
+class VictoryState:
+    """Stato della vittoria (fontana al cratere) di una partita.
+
+    Il timer avanza col tempo di simulazione, non con l'orologio reale, e la fontana si muove
+    con tick_scale(dt) come il resto della simulazione.
+    """
+    def __init__(self, rng=None):
+        # Generatore casuale della fontana (default: modulo random globale)
+        self.rng = rng
+        self.reset()
+
+    def reset(self):
+        self.active = False
+        self.timer = 0
+        self.fountain = None
+
+    def start(self, screen_width, screen_height):
+        self.active = True
+        self.timer = 0
+        self.fountain = Fountain(screen_width // 2, screen_height // 2, self.rng)
+        return self.fountain
+
+    def update(self, dt):
+        self.timer += dt
+        if self.fountain is not None:
+            k = tick_scale(dt)
+            self.fountain.emit(k)
+            self.fountain.update(k)
+        return self.timer
 
-# --- Costanti ---
-SCREEN_WIDTH = 800
-
-import pygame
 import random
 import math
 
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from timer_system import tick_scale
+from sprite_cache import circle_sprite
+from particles import HAVE_NUMPY, LavaParticles, SmokeParticles, LAVA_FADE, LAVA_MAX_RADIUS, SMOKE_MAX_RADIUS
+
 def lerp_color(c1, c2, t):
     return tuple(int(a + (b - a) * t) for a, b in zip(c1, c2))
 
 class LavaParticle:
-    def __init__(self, x, y):
+    def __init__(self, x, y, rng=random):
         # Dispersione orizzontale e velocità aumentate per getti più parabolici
-        self.x = x + random.uniform(-40, 40)
+        self.x = x + rng.uniform(-40, 40)
         self.y = y
-        self.vx = random.uniform(-6.0, 6.0)
-        self.vy = random.uniform(-16, -9)
-        self.radius = random.uniform(6,10)
+        self.vx = rng.uniform(-6.0, 6.0)
+        self.vy = rng.uniform(-16, -9)
+        self.radius = rng.uniform(6,10)
         self.trail = []
         self.max_trail = 30
 
-    def update(self):
+    def update(self, k=1.0):
+        # k: tick_scale(dt), frame a 60 Hz trascorsi
         gravity = 0.35
-        self.vy += gravity
-        self.x += self.vx
-        self.y += self.vy
+        self.vy += gravity * k
+        self.x += self.vx * k
+        self.y += self.vy * k
         self.trail.insert(0, (self.x,self.y))
         if len(self.trail) > self.max_trail:
             self.trail.pop()
 
-    def draw(self, surf, crater_y=None):
+    def draw(self, surf, crater_y=None, step=1):
+        # step > 1: disegna un punto della scia ogni step (vedi Fountain.trail_step)
         L = len(self.trail)
-        for i,(tx,ty) in enumerate(self.trail):
+        for i in range(0, L, step):
+            tx, ty = self.trail[i]
             t = i/max(1,L-1)
             if t < 0.5:
                 col = lerp_color((255,165,0),(255,0,0), t*2)
@@ -94,68 +79,138 @@ class LavaParticle:
             if alpha <= 0:
                 continue
             size = int(self.radius*(0.5 + 0.5*(1-t)))
-            s = pygame.Surface((size*2,size*2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*col, alpha), (size,size), size)
-            surf.blit(s, (tx-size, ty-size))
+            surf.blit(circle_sprite(size, col, alpha), (tx-size, ty-size))
+
+    def alive(self, crater_y):
+        """False quando la scia è tutta dissolta sotto il cratere o fuori dallo schermo."""
+        bottom = min(crater_y + LAVA_FADE, SCREEN_HEIGHT + LAVA_MAX_RADIUS)
+        old_x, old_y = self.trail[-1]
+        if self.y >= bottom and old_y >= bottom:
+            return False
+        if self.x < -LAVA_MAX_RADIUS and old_x < -LAVA_MAX_RADIUS:
+            return False
+        return not (self.x > SCREEN_WIDTH + LAVA_MAX_RADIUS and old_x > SCREEN_WIDTH + LAVA_MAX_RADIUS)
 
 class SmokeParticle:
-    def __init__(self, x, y):
+    def __init__(self, x, y, rng=random):
         # Dispersione orizzontale come versione originale (più stretta)
-        self.x = x + random.uniform(-50, 50)
+        self.x = x + rng.uniform(-50, 50)
         self.y = y - 40
-        self.vx = random.uniform(-0.6, 0.6)
-        self.vy = random.uniform(-3.5, -1.8)
-        self.radius = random.uniform(12, 20)
+        self.vx = rng.uniform(-0.6, 0.6)
+        self.vy = rng.uniform(-3.5, -1.8)
+        self.radius = rng.uniform(12, 20)
         self.age = 0
-        self.max_age = random.randint(140, 180)
+        self.max_age = rng.randint(140, 180)
 
-    def update(self):
-        self.x += self.vx + math.sin(self.age*0.05)*0.2
-        self.y += self.vy
-        self.age += 1
-        self.radius *= 1.002
+    def update(self, k=1.0):
+        self.x += (self.vx + math.sin(self.age*0.05)*0.2) * k
+        self.y += self.vy * k
+        self.age += k
+        self.radius *= 1.002 ** k
 
     def draw(self, surf):
         alpha = max(0, int(200 * (1 - self.age/self.max_age)))
         if alpha <= 0:
             return
         size = int(self.radius)
-        s = pygame.Surface((size*2,size*2), pygame.SRCALPHA)
-        pygame.draw.circle(s, (40,40,40,alpha), (size,size), size)
-        surf.blit(s, (self.x-size, self.y-size))
+        surf.blit(circle_sprite(size, (40,40,40), alpha), (self.x-size, self.y-size))
+
+    def alive(self):
+        """False a fine vita o fuori dallo schermo (il fumo sale soltanto)."""
+        return (self.age < self.max_age and self.y > -SMOKE_MAX_RADIUS and
+                -SMOKE_MAX_RADIUS < self.x < SCREEN_WIDTH + SMOKE_MAX_RADIUS)
 
 class Fountain:
-    def __init__(self, x, y):
+    """Fontana di lava e fumo al cratere.
+
+    Con NumPy le particelle stanno in colonne (particles.py), altrimenti sono oggetti
+    LavaParticle/SmokeParticle in liste; in entrambi i casi il totale non supera max_particles,
+    diviso tra lava e fumo in proporzione alle particelle emesse per tick.
+
+    Ogni particella di lava disegna fino a TRAIL_LENGTH punti di scia: quando in tutto sarebbero
+    più di max_trail_points, draw() ne disegna uno ogni trail_step(), così il costo del disegno
+    resta limitato anche con la fontana al massimo.
+    """
+    LAVA_PER_TICK = 6    # particelle emesse per frame a 60 Hz (vedi emit)
+    SMOKE_PER_TICK = 8
+    MAX_PARTICLES = 512
+    MAX_TRAIL_POINTS = 2048
+
+    def __init__(self, x, y, rng=None, max_particles=MAX_PARTICLES, max_trail_points=MAX_TRAIL_POINTS):
         self.x = x
         self.y = y
-        self.lava_particles = []
-        self.smoke_particles = []
-
-    def emit(self):
-        # Numero particelle come versione originale
-        for _ in range(6):
-            self.lava_particles.append(LavaParticle(self.x, self.y))
-        for _ in range(8):
-            self.smoke_particles.append(SmokeParticle(self.x, self.y))
-
-
-    def update(self):
+        self.rng = rng if rng is not None else random
+        self.max_trail_points = max_trail_points
+        # Frazioni di particella non ancora emesse (tick più corti di un frame a 60 Hz)
+        self._lava_due = 0.0
+        self._smoke_due = 0.0
+        per_tick = self.LAVA_PER_TICK + self.SMOKE_PER_TICK
+        self.max_lava = max_particles * self.LAVA_PER_TICK // per_tick
+        self.max_smoke = max_particles - self.max_lava
+        self.vectorized = HAVE_NUMPY
+        if self.vectorized:
+            self.lava_particles = LavaParticles(self.max_lava)
+            self.smoke_particles = SmokeParticles(self.max_smoke)
+        else:
+            self.lava_particles = []
+            self.smoke_particles = []
+
+    def __len__(self):
+        return len(self.lava_particles) + len(self.smoke_particles)
+
+    def emit(self, k=1.0):
+        """Emette le particelle di k frame a 60 Hz (tick_scale(dt)), entro il tetto di particelle."""
+        self._lava_due += self.LAVA_PER_TICK * k
+        self._smoke_due += self.SMOKE_PER_TICK * k
+        lava, smoke = int(self._lava_due), int(self._smoke_due)
+        self._lava_due -= lava
+        self._smoke_due -= smoke
+        lava = min(lava, self.max_lava - len(self.lava_particles))
+        smoke = min(smoke, self.max_smoke - len(self.smoke_particles))
+        if self.vectorized:
+            for _ in range(lava):
+                self.lava_particles.emit(self.x, self.y, self.rng)
+            for _ in range(smoke):
+                self.smoke_particles.emit(self.x, self.y, self.rng)
+            return
+        for _ in range(lava):
+            self.lava_particles.append(LavaParticle(self.x, self.y, self.rng))
+        for _ in range(smoke):
+            self.smoke_particles.append(SmokeParticle(self.x, self.y, self.rng))
+
+    def update(self, k=1.0):
+        if self.vectorized:
+            self.lava_particles.step(k)
+            self.smoke_particles.step(k)
+            self.lava_particles.cull(self.y)
+            self.smoke_particles.cull()
+            return
         for p in self.lava_particles:
-            p.update()
+            p.update(k)
         for p in self.smoke_particles:
-            p.update()
-        # Elimina le particelle di lava che sono praticamente "dissolte" sotto il cratere
-        self.lava_particles = [p for p in self.lava_particles if p.y < 2000 and (p.y < p.y + 120 or p.trail[0][1] < p.y + 120)]
-        self.smoke_particles = [p for p in self.smoke_particles if p.age < p.max_age]
+            p.update(k)
+        # Elimina le particelle di lava ormai dissolte sotto il cratere e quelle uscite dallo schermo
+        self.lava_particles = [p for p in self.lava_particles if p.alive(self.y)]
+        self.smoke_particles = [p for p in self.smoke_particles if p.alive()]
+
+    def trail_points(self):
+        """Punti di scia di tutte le particelle di lava."""
+        if self.vectorized:
+            return self.lava_particles.trail_points()
+        return sum(len(p.trail) for p in self.lava_particles)
+
+    def trail_step(self):
+        """Passo tra i punti di scia disegnati, per restare entro max_trail_points."""
+        return max(1, -(-self.trail_points() // self.max_trail_points))
 
     def draw(self, surf):
+        step = self.trail_step()
+        if self.vectorized:
+            self.smoke_particles.draw(surf)
+            self.lava_particles.draw(surf, crater_y=self.y, step=step)
+            return
         for p in self.smoke_particles:
             p.draw(surf)
         # Passa la y del cratere a ogni particella di lava
         for p in self.lava_particles:
-            p.draw(surf, crater_y=self.y)
-
-        # Disegna
-
-
-    pygame.quit()
+            p.draw(surf, crater_y=self.y, step=step)
@@ -0,0 +1,481 @@
+"""
+Sessione di gioco: possiede tutto lo stato di una partita e la fa avanzare tick per tick.
+
+Più sessioni possono convivere nello stesso processo e possono essere guidate
+da codice (bot, replay, benchmark) invece che dalla tastiera reale.
+"""
+import os
+import pygame
+from constants import (SCREEN_WIDTH, SCREEN_HEIGHT, GAME_TIME, BASE_TICK_RATE,
+                       MENU, PLAYING, GAME_OVER, ENTER_NAME, PLATFORM_WIDTH, PLATFORM_HEIGHT)
+from player import WobblyBall
+from platforms import PlatformManager
+from collectibles import CollectibleManager, BUBBLE_VALUE, POPUP_COLOR as BUBBLE_POPUP_COLOR
+from camera import Camera
+from spatial import SpatialGrid, neighborhood
+from background_manager import BackgroundManager
+from levels import LevelManager, LEVEL_DEFS
+from enemies import EnemyManager, penalties
+from ui_system import UISystem
+from fonts import get_font, render_text, glyph_atlas
+from popups import PopupManager
+from fountain import VictoryState
+from rng import RngStreams
+from profiler import NULL_PROFILER
+
+AUDIO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'audio')
+VICTORY_DURATION = 10  # secondi di fontana prima dell'inserimento nome
+PENALTY_TEXT = "CRISTALLIZZAZIONE FRAZIONATA, RAFFREDDAMENTO!"  # testo all'urto con un nemico
+PENALTY_POPUP_COLOR = (255, 0, 0)
+
+
+# Bit dei comandi nella maschera di input (usata dai replay)
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_SPACE = 4
+INPUT_ESCAPE = 8
+
+
+class InputState:
+    """Comandi di un singolo tick, indipendenti dalla tastiera reale."""
+    __slots__ = ("left", "right", "space", "escape")
+
+    def __init__(self, left=False, right=False, space=False, escape=False):
+        self.left = bool(left)
+        self.right = bool(right)
+        self.space = bool(space)
+        self.escape = bool(escape)
+
+    @classmethod
+    def from_keys(cls, keys):
+        """Costruisce l'input da pygame.key.get_pressed()."""
+        return cls(left=keys[pygame.K_LEFT] or keys[pygame.K_a],
+                   right=keys[pygame.K_RIGHT] or keys[pygame.K_d],
+                   space=keys[pygame.K_SPACE],
+                   escape=keys[pygame.K_ESCAPE])
+
+    @classmethod
+    def from_mask(cls, mask):
+        """Costruisce l'input da una maschera di bit INPUT_*."""
+        return cls(left=mask & INPUT_LEFT, right=mask & INPUT_RIGHT,
+                   space=mask & INPUT_SPACE, escape=mask & INPUT_ESCAPE)
+
+    @property
+    def mask(self):
+        """I comandi come maschera di bit INPUT_* (4 bit)."""
+        return ((INPUT_LEFT if self.left else 0) | (INPUT_RIGHT if self.right else 0) |
+                (INPUT_SPACE if self.space else 0) | (INPUT_ESCAPE if self.escape else 0))
+
+    def __repr__(self):
+        return (f"InputState(left={self.left}, right={self.right}, "
+                f"space={self.space}, escape={self.escape})")
+
+
+NO_INPUT = InputState()
+
+
+class GameSession:
+    """Stato completo di una partita: player, piattaforme, nemici, collectibles, vittoria, punteggio."""
+
+    def __init__(self, audio_manager=None, difficulty=None):
+        # audio_manager è opzionale: le sessioni headless non riproducono suoni
+        self.audio_manager = audio_manager
+        # Valori di difficoltà da sovrascrivere a ogni reset (vedi apply_difficulty)
+        self.difficulty = dict(difficulty or {})
+        self.state = MENU
+        self.player = None
+        self.platform_manager = None
+        self.level_manager = None
+        self.background_manager = None
+        self.enemy_manager = None
+        self.collectible_manager = CollectibleManager()
+        self.popups = PopupManager()  # testi che salgono e si dissolvono (bolle raccolte, penalità)
+        self.victory = VictoryState()
+        # Un flusso casuale per sottosistema, tutti derivati dal seed della partita
+        self.rng = RngStreams()
+        # Profiler dei frame (vedi profiler.py): di default non misura nulla
+        self.profiler = NULL_PROFILER
+        self.seed = None
+        self.tick = 0
+        self.total_scroll_distance = 0
+        self.cooling_time = 0
+        self.score = 0
+        self.final_score = 0
+        self.camera = Camera()  # telecamera verticale: camera.y == total_scroll_distance
+        self.grid = SpatialGrid()  # griglia spaziale delle collisioni col player (vedi spatial.py)
+        self.last_score_scroll = 0
+        self.last_bg_level = None
+        # Statistiche della partita (per il simulatore batch)
+        self.enemy_hits = {}
+        self.crater_tick = None
+
+    # --- Ciclo di vita ---
+
+    def reset(self, seed=None):
+        """Inizializza una nuova partita e restituisce la prima osservazione.
+
+        Con seed=None ne viene estratto uno a caso; self.seed contiene sempre quello usato.
+        """
+        rng = self.rng
+        rng.reseed(seed)
+        self.seed = rng.seed
+
+        # Player, piattaforme, nemici e bolle restano in coordinate del mondo: lo scroll muove solo la telecamera
+        self.camera = Camera()
+        # Una griglia spaziale per tutto ciò che il player può toccare: una sola query per tick
+        self.grid = SpatialGrid()
+        self.player = WobblyBall(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 150, rng=rng.player)
+        self.platform_manager = PlatformManager(num_platforms=10, rng=rng.platforms, camera=self.camera)
+        self.level_manager = LevelManager(LEVEL_DEFS)
+        self.background_manager = BackgroundManager()
+        self.enemy_manager = EnemyManager(rng=rng.enemies, camera=self.camera, grid=self.grid)
+        self.popups = PopupManager()
+        self.popups.preload(f"+{BUBBLE_VALUE}", BUBBLE_POPUP_COLOR, count=4)
+        self.popups.preload(PENALTY_TEXT, PENALTY_POPUP_COLOR, count=2)
+        self.collectible_manager = CollectibleManager(rng=rng.collectibles, grid=self.grid, popups=self.popups)
+        self.victory = VictoryState(rng=rng.fountain)
+
+        # Collega il background manager al platform manager per i limiti del vulcano
+        self.platform_manager.set_background_manager(self.background_manager)
+        # Una bolla di magma su ogni piattaforma, creata e tolta insieme alla piattaforma
+        self.collectible_manager.follow_platforms(self.platform_manager)
+        self.apply_difficulty(self.difficulty)
+
+        # Prima generazione piattaforme con livello (più profonda, stile Doodle Jump)
+        self.platform_manager.generate_initial_platforms(self.player, self.level_manager, depth_multiplier=8)
+        if self.platform_manager.start_platform is not None:
+            first_platform = self.platform_manager.start_platform
+            self.player.y = first_platform.rect.top - self.player.radius - 5
+
+        self.tick = 0
+        self.total_scroll_distance = 0
+        self.last_score_scroll = 0
+        self.cooling_time = GAME_TIME
+        self.score = 0
+        self.final_score = 0
+        self.enemy_hits = {}
+        self.crater_tick = None
+        self.state = PLAYING
+        return self.observe()
+
+    def apply_difficulty(self, overrides):
+        """Sovrascrive i parametri di difficoltà dei manager.
+
+        Chiavi nella forma "platform.min_gap", "platform.crumble_chance",
+        "enemy.base_spawn_interval" o "enemy.spawn_weights.quarzo".
+        """
+        targets = {'platform': self.platform_manager, 'enemy': self.enemy_manager}
+        for key, value in overrides.items():
+            owner, _, attr = key.partition('.')
+            attr, _, item = attr.partition('.')
+            target = targets.get(owner)
+            if target is None or not hasattr(target, attr):
+                raise ValueError(f"Parametro di difficoltà sconosciuto: {key}")
+            if item:
+                getattr(target, attr)[item] = value
+            else:
+                setattr(target, attr, value)
+
+    def pool_stats(self):
+        """Contatori dei pool di riuso (vedi pool.py) di piattaforme, nemici, bolle e testi."""
+        if self.player is None:
+            return {}
+        return {
+            'piattaforme': self.platform_manager.pool.stats(),
+            'nemici': self.enemy_manager.pool.stats(),
+            'bolle': self.collectible_manager.pool.stats(),
+            'testi': self.popups.pool.stats(),
+        }
+
+    def calculate_score(self):
+        """Restituisce il punteggio reale basato solo sui collectibles raccolti."""
+        return self.score
+
+    def play_sound(self, name):
+        if self.audio_manager is not None:
+            self.audio_manager.play(name)
+
+    # --- Simulazione ---
+
+    def step(self, input_state=NO_INPUT, dt=1.0 / BASE_TICK_RATE):
+        """Avanza la partita di un tick di simulazione e restituisce l'osservazione."""
+        if self.state == PLAYING and self.player is not None:
+            if input_state.escape:
+                self.state = MENU
+            else:
+                self._update(input_state, dt)
+                self.tick += 1
+                self.profiler.lap('update.other')
+        return self.observe()
+
+    def _update_background_music(self):
+        """Musica di background: Mantello, vento nel vulcano o fontana."""
+        if self.audio_manager is None:
+            return
+        current_level_name = self.level_manager.get_current_level()['name']
+        if self.victory.active:
+            if self.last_bg_level != "ERUPTION":
+                self.audio_manager.play_background_eruption(AUDIO_DIR)
+                self.last_bg_level = "ERUPTION"
+        elif current_level_name == "Mantello" and self.last_bg_level != "Mantello":
+            self.audio_manager.play_background_lava(AUDIO_DIR)
+            self.last_bg_level = "Mantello"
+        elif current_level_name == "Vulcano" and self.last_bg_level != "WIND":
+            self.audio_manager.play_background_wind(AUDIO_DIR)
+            self.last_bg_level = "WIND"
+        elif current_level_name != "Vulcano" and self.last_bg_level == "WIND":
+            self.audio_manager.stop_background()
+            self.last_bg_level = current_level_name
+        elif current_level_name != "Mantello" and self.last_bg_level == "Mantello":
+            self.audio_manager.stop_background()
+            self.last_bg_level = current_level_name
+
+    def _update(self, input_state, dt):
+        """Aggiorna la logica di gioco di un tick (dt fisso, in secondi)."""
+        player = self.player
+        platform_manager = self.platform_manager
+        level_manager = self.level_manager
+        background_manager = self.background_manager
+        enemy_manager = self.enemy_manager
+        collectible_manager = self.collectible_manager
+        victory = self.victory
+        camera = self.camera
+        prof = self.profiler
+
+        player.save_previous_state()
+        camera.save_previous_state()
+
+        # Aggiorna SEMPRE il movimento delle piattaforme mobili (anche senza scroll)
+        platform_manager.update(level_manager, dt)
+        prof.lap('update.platforms')
+        background_manager.tick(dt)
+        prof.lap('update.background')
+
+        self._update_background_music()
+        prof.lap('update.audio')
+
+        # Controlla se ha raggiunto il cratere
+        if background_manager.check_crater_reached(self.total_scroll_distance):
+            if not victory.active:
+                victory.start(SCREEN_WIDTH, SCREEN_HEIGHT)
+                self.crater_tick = self.tick
+                print("🎉 VITTORIA! Cratere raggiunto!")
+
+        # Se la fontana è attiva, aggiorna il timer della vittoria e la fontana
+        if victory.active:
+            if victory.update(dt) >= VICTORY_DURATION:
+                self.final_score = self.calculate_score()
+                self.state = ENTER_NAME
+            prof.lap('update.fountain')
+            return
+
+        # Decrementa il timer di raffreddamento nel tempo (dt è in secondi)
+        self.cooling_time -= dt
+
+        # Suono salto
+        if input_state.space and player.on_ground:
+            self.play_sound('jump')
+        player.apply_input(input_state, dt)
+        player.update(dt)
+        prof.lap('update.player')
+
+        # Collisioni piattaforme (continue: seguono tutto lo spostamento del tick)
+        jump_automatico = platform_manager.check_collision(player)
+        if jump_automatico:
+            self.play_sound('jump')
+        prof.lap('update.platforms')
+
+        current_level_name = level_manager.get_current_level()['name']
+        # Collisioni con pareti del vulcano (solo nel livello vulcano)
+        if current_level_name == "Vulcano":
+            background_manager.check_volcano_collision(player, camera.y)
+        else:
+            # Limiti orizzontali (solo se non siamo nel vulcano, che ha le sue pareti)
+            if player.x - player.radius < 50:
+                player.x = 50 + player.radius
+                player.vx = 0
+            elif player.x + player.radius > SCREEN_WIDTH - 50:
+                player.x = SCREEN_WIDTH - 50 - player.radius
+                player.vx = 0
+        prof.lap('update.background')
+
+        # Unica query del player sulla griglia: nemici e bolle nei dintorni (il Neighborhood
+        # resta aggiornato con gli oggetti aggiunti o spostati durante il tick)
+        nearby = self.grid.query(neighborhood(player))
+
+        # Scroll verticale: si sposta solo la telecamera, le entità restano dove sono nel mondo
+        player_screen_y = camera.to_screen(player.y)
+        if player_screen_y < SCREEN_HEIGHT * 0.4:
+            dy = int(SCREEN_HEIGHT * 0.4 - player_screen_y)
+            camera.scroll(dy)
+            # Solo ricambio delle piattaforme: il loro movimento è già avanzato in questo tick
+            platform_manager.update(level_manager, dt=0)
+            prof.lap('update.platforms')
+            background_manager.update(dy, self.total_scroll_distance)
+            self.total_scroll_distance += dy
+            prof.lap('update.background')
+
+            # Incrementa il punteggio ogni 100 pixel di salita (basato su total_scroll_distance)
+            while self.total_scroll_distance - self.last_score_scroll >= 100:
+                self.score += 100
+                self.last_score_scroll += 100
+
+        # Aggiorna livello in base alla posizione
+        old_level = current_level_name
+        level_manager.update(self.total_scroll_distance)
+        new_level = level_manager.get_current_level()['name']
+        if new_level != old_level:
+            self._on_level_changed()
+        if platform_manager.generating:
+            # Generazione del nuovo livello distribuita sui tick successivi al cambio
+            platform_manager.advance_generation()
+        prof.lap('update.level')
+
+        # Aggiorna nemici e testi animati
+        enemy_manager.update(dt, self.total_scroll_distance, new_level)
+        self.popups.update(dt)
+
+        # Collisione nemici
+        for enemy in enemy_manager.check_collision(player, nearby):
+            penalty_seconds = penalties.get(enemy.kind, 10)
+            self.enemy_hits[enemy.kind] = self.enemy_hits.get(enemy.kind, 0) + 1
+            self.cooling_time -= penalty_seconds  # penalità in secondi
+            self.cooling_time = max(0, self.cooling_time)  # non scendere sotto zero
+            print(f"DEBUG: collisione con nemico/minerale {enemy.kind}, penalty {penalty_seconds} sec, timer abbassato a {self.cooling_time}")
+            # Il testo resta nel mondo dove è avvenuto l'urto; un nuovo urto con lo stesso nemico lo riavvia
+            x, y = enemy.rect.center
+            self.popups.show(PENALTY_TEXT, x - 18, y, PENALTY_POPUP_COLOR, group='nemici', owner=enemy)
+        prof.lap('update.enemies')
+
+        # Controllo cratere raggiunto (solo nel livello vulcano)
+        if new_level == "Vulcano" and not victory.active:
+            if background_manager.check_crater_reached(camera.to_screen(player.y)):
+                victory.start(SCREEN_WIDTH, SCREEN_HEIGHT)
+                self.crater_tick = self.tick
+
+        # Aggiorna collezionabili
+        # Solo le bolle visibili (con un margine): le altre non hanno niente da animare
+        collectible_manager.update(dt, camera.to_world(-50), camera.to_world(SCREEN_HEIGHT + 50))
+
+        # Gestione raccolta bolle di magma: 100 punti per ogni bolla raccolta (valore 200)
+        collected_score = collectible_manager.check_collision(player, nearby)
+        prof.lap('update.collectibles')
+        if collected_score > 0:
+            self.score += (collected_score // 200) * 100
+            self.play_sound('collect')
+            self.score += (collected_score // 200) * 100
+            self.play_sound('bubble')
+            self.play_sound('enemy_hit')
+            return
+
+        # Controllo game over (solo se non in modalità vittoria)
+        nemici_animati = self.popups.active('nemici')
+        if not victory.active and (camera.to_screen(player.y) - player.radius > SCREEN_HEIGHT or (self.cooling_time <= 0 and not nemici_animati)):
+            self.final_score = self.calculate_score()
+            self.state = GAME_OVER
+
+    def _on_level_changed(self):
+        """Cambio livello: rigenera subito le piattaforme vicine (con le loro bolle); le altre
+        piattaforme del livello arrivano nei tick successivi (vedi PlatformManager.start_generation)."""
+        player = self.player
+        platform_manager = self.platform_manager
+        platform_manager.start_generation(player, self.level_manager, depth_multiplier=8)
+        # --- PATCH: garantisci piattaforma sotto il player ---
+        piattaforme_sotto = [p for p in platform_manager.platforms if p.rect.top > player.y and p.rect.top - player.y < 150]
+        if len(piattaforme_sotto) < 1:
+            px = int(player.x - PLATFORM_WIDTH // 2)
+            py = int(player.y + player.radius + 40)
+            if self.camera.to_screen(py) < SCREEN_HEIGHT - 30:  # Assicura che sia visibile
+                platform_manager.add_platform(platform_manager.new_platform(px, py, PLATFORM_WIDTH, PLATFORM_HEIGHT))
+
+    def observe(self):
+        """Istantanea compatta dello stato, pensata per bot, replay e benchmark."""
+        player = self.player
+        if player is None:
+            return {'tick': self.tick, 'state': self.state}
+        return {
+            'tick': self.tick,
+            'state': self.state,
+            'x': player.x,
+            'y': self.camera.to_screen(player.y),  # y sullo schermo
+            'vx': player.vx,
+            'vy': player.vy,
+            'on_ground': player.on_ground,
+            'level': self.level_manager.get_current_level()['name'],
+            'altitude': self.total_scroll_distance,
+            'score': self.score,
+            'cooling_time': self.cooling_time,
+            'victory': self.victory.active,
+            'victory_timer': self.victory.timer,
+        }
+
+    # --- Rendering ---
+
+    def render(self, surface, alpha=1.0):
+        """Disegna la partita su surface.
+
+        alpha: frazione del tick successivo già trascorsa, usata per interpolare
+        tra gli ultimi due stati della simulazione.
+        """
+        player = self.player
+        if player is None:
+            return
+        victory = self.victory
+        prof = self.profiler
+
+        # Offset della telecamera interpolato tra gli ultimi due tick, uguale per tutte le entità
+        camera = self.camera
+        view = camera.offset(alpha)
+
+        surface.fill((0, 0, 0))
+        # Lo sfondo tiene il proprio scroll: gli serve solo la parte dello scroll non ancora "trascorsa"
+        self.background_manager.draw(surface, view - camera.y)
+        prof.lap('draw.background')
+        self.platform_manager.draw(surface, view)
+        prof.lap('draw.platforms')
+        # Disegna le bolle di magma
+        self.collectible_manager.draw(surface, view, self.platform_manager)
+        prof.lap('draw.collectibles')
+
+        # Se la fontana è attiva, non disegnare il player
+        if not victory.active:
+            player.draw_trail(surface, view)
+            player.draw_particles(surface, view)
+            player.draw_wobbly(surface, pygame.time.get_ticks() / 1000.0, alpha, view)
+            prof.lap('draw.player')
+            self.enemy_manager.draw(surface, alpha, view)
+            prof.lap('draw.enemies')
+            self.popups.draw(surface, view)
+            prof.lap('draw.popups')
+
+        # Disegna la fontana di vittoria se attiva
+        if victory.active and victory.fountain is not None:
+            victory.fountain.draw(surface)
+            prof.lap('draw.fountain')
+
+        # HUD
+        font = get_font(30)
+        if not victory.active:
+            # Livello e punteggio a sinistra
+            text_level = render_text(font, f"Livello: {self.level_manager.get_current_level()['name']}", (255, 255, 255))
+            surface.blit(text_level, (10, 10))
+
+            # Il numero cambia spesso: cifre composte dall'atlante invece di un render a ogni valore
+            score_label = render_text(font, "Punteggio: ", (255, 255, 255))
+            surface.blit(score_label, (10, 40))
+            glyph_atlas(font, (255, 255, 255)).draw(surface, str(self.calculate_score()),
+                                                    (10 + score_label.get_width(), 40))
+
+            # Barra di raffreddamento in alto a destra
+            UISystem.draw_cooling_bar(surface, self.cooling_time, GAME_TIME)
+        else:
+            # Messaggio vittoria con timer
+            victory_text = render_text(font, "🎉 CRATERE RAGGIUNTO! 🎉", (255, 215, 0))
+            victory_rect = victory_text.get_rect(center=(SCREEN_WIDTH // 2, 50))
+            surface.blit(victory_text, victory_rect)
+
+            time_left = max(0, VICTORY_DURATION - int(victory.timer))
+            timer_text = render_text(font, f"Inserimento nome tra: {time_left}s", (255, 255, 255))
+            timer_rect = timer_text.get_rect(center=(SCREEN_WIDTH // 2, 80))
+            surface.blit(timer_text, timer_rect)
+        prof.lap('draw.hud')
@@ -0,0 +1,33 @@
+"""
+Modalità headless: esecuzione senza finestra né audio reali (driver SDL "dummy")
+"""
+import os
+import pygame
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+# Variabili d'ambiente che attivano la modalità headless (utili su macchine di build/benchmark)
+HEADLESS_ENV_VAR = "VOLCANO_HEADLESS"
+NO_DRAW_ENV_VAR = "VOLCANO_NO_DRAW"
+
+
+def env_flag(name):
+    """True se la variabile d'ambiente è impostata a un valore "vero" (1, true, yes, on)."""
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def use_dummy_drivers():
+    """Imposta i driver SDL dummy. Va chiamata prima di pygame.init()."""
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    # SDL trasforma SIGINT/SIGTERM in eventi QUIT: senza finestra nessuno li leggerebbe
+    os.environ["SDL_NO_SIGNAL_HANDLERS"] = "1"
+
+
+def init_headless_display(size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+    """Inizializza pygame con i driver dummy e restituisce la superficie di gioco.
+
+    Serve comunque un display mode: le immagini vengono caricate con convert_alpha().
+    """
+    use_dummy_drivers()
+    pygame.init()
+    return pygame.display.set_mode(size)
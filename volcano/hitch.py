@@ -0,0 +1,146 @@
+"""
+Rilevatore di hitch: segnala i frame che superano il budget e ne registra la causa.
+
+Per ogni frame lento salva nel log (una riga JSON per hitch):
+- le sezioni del FrameProfiler, con quelle molto sopra la loro media marcate come "lente";
+- gli stack del thread principale campionati da un thread watchdog mentre il frame era in corso;
+- opzionalmente le funzioni più costose secondo cProfile (attivo su ogni frame: rallenta il gioco).
+
+Il log è un ring buffer: il file tiene al massimo circa 2 * max_entries righe e viene
+riscritto con le ultime max_entries quando cresce oltre.
+
+Nota: il watchdog ha bisogno del GIL per campionare; se il thread principale resta a lungo
+dentro codice C che non lo rilascia, lo stack viene preso appena il GIL torna libero.
+"""
+import cProfile
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+STACK_LIMIT = 25          # frame di stack salvati per campione
+MAX_SAMPLES = 5           # campioni di stack per hitch
+EMA_WEIGHT = 0.05         # peso di un frame normale nella media mobile per sezione
+SLOW_FACTOR = 2.0         # una sezione è "lenta" se supera di questo fattore la sua media...
+SLOW_MIN_MS = 2.0         # ...e di almeno questi millisecondi
+
+
+class HitchDetector:
+    def __init__(self, profiler, budget_ms=33.0, log_path="hitches.jsonl", max_entries=200, use_cprofile=False):
+        self.profiler = profiler
+        self.budget = budget_ms / 1000.0
+        self.log_path = log_path
+        self.max_entries = max_entries
+        self.use_cprofile = use_cprofile
+        self.entries = deque(maxlen=max_entries)
+        self.hitch_count = 0
+        self.frame_count = 0
+        self.section_means = {}   # sezione -> media mobile (secondi) sui frame normali
+        self._lines_in_file = 0
+        self._cprofile = None
+
+        # Stato condiviso col watchdog
+        self._frame_start = None
+        self._frame_id = 0
+        self._samples = []
+        self._lock = threading.Lock()
+        self._main_thread_id = threading.main_thread().ident
+        self._stop = threading.Event()
+        open(self.log_path, "w").close()
+        self._watchdog = threading.Thread(target=self._watch, name="hitch-watchdog", daemon=True)
+        self._watchdog.start()
+
+    # --- Thread watchdog ---
+
+    def _watch(self):
+        interval = self.budget / 2
+        while not self._stop.wait(interval):
+            start = self._frame_start
+            if start is None or time.perf_counter() - start < self.budget:
+                continue
+            frame = sys._current_frames().get(self._main_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.format_stack(frame, limit=STACK_LIMIT)
+            with self._lock:
+                if self._frame_start is start and len(self._samples) < MAX_SAMPLES:
+                    elapsed_ms = (time.perf_counter() - start) * 1000.0
+                    self._samples.append({'at_ms': round(elapsed_ms, 1), 'stack': [line.rstrip() for line in stack]})
+
+    # --- Chiamate dal loop principale ---
+
+    def begin_frame(self):
+        with self._lock:
+            self._samples = []
+            self._frame_id += 1
+            self._frame_start = time.perf_counter()
+        if self.use_cprofile:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def end_frame(self):
+        """Da chiamare dopo profiler.end_frame(). Restituisce il record dell'hitch o None."""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        with self._lock:
+            self._frame_start = None
+            samples = self._samples
+        self.frame_count += 1
+        frame_time = self.profiler.frame_time
+        sections = self.profiler.sections
+        if frame_time <= self.budget:
+            means = self.section_means
+            for section, seconds in sections.items():
+                mean = means.get(section)
+                means[section] = seconds if mean is None else mean + (seconds - mean) * EMA_WEIGHT
+            return None
+        return self._record(frame_time, sections, samples)
+
+    def _record(self, frame_time, sections, samples):
+        self.hitch_count += 1
+        stages = []
+        for section, seconds in sorted(sections.items(), key=lambda kv: -kv[1]):
+            mean = self.section_means.get(section, 0.0)
+            ms, mean_ms = seconds * 1000.0, mean * 1000.0
+            stages.append({
+                'section': section,
+                'ms': round(ms, 3),
+                'mean_ms': round(mean_ms, 3),
+                'slow': ms > mean_ms * SLOW_FACTOR and ms - mean_ms > SLOW_MIN_MS,
+            })
+        entry = {
+            'time': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'frame': self.frame_count,
+            'frame_ms': round(frame_time * 1000.0, 3),
+            'budget_ms': round(self.budget * 1000.0, 3),
+            'slow_stages': [s['section'] for s in stages if s['slow']],
+            'stages': stages,
+            'stack_samples': samples,
+        }
+        if self._cprofile is not None:
+            out = io.StringIO()
+            pstats.Stats(self._cprofile, stream=out).sort_stats('cumulative').print_stats(20)
+            entry['cprofile'] = out.getvalue()
+        self.entries.append(entry)
+        self._write(entry)
+        return entry
+
+    def _write(self, entry):
+        if self._lines_in_file >= 2 * self.max_entries:
+            # Ring buffer: riscrive solo le ultime max_entries voci
+            with open(self.log_path, "w") as f:
+                for e in self.entries:
+                    f.write(json.dumps(e) + "\n")
+            self._lines_in_file = len(self.entries)
+        else:
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+            self._lines_in_file += 1
+
+    def stop(self):
+        self._stop.set()
+        self._watchdog.join(timeout=1.0)
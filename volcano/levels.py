@@ -7,6 +7,7 @@ def resource_path(relative_path):
         return os.path.join(sys._MEIPASS, relative_path)
     return os.path.join(os.path.abspath("."), relative_path)
 from constants import SCREEN_WIDTH, SCREEN_HEIGHT, LEVEL_HEIGHT
+from assets import load_scaled_image
 
 # --- Definizione dei livelli ---
 # Ogni livello ha un nome e l'immagine di sfondo associata
@@ -24,9 +25,7 @@ class LevelManager:
         # Carica tutte le immagini dei livelli
         self.backgrounds = []
         for level in self.level_defs:
-            img = pygame.image.load(resource_path(level["bg"])).convert_alpha()
-            img = pygame.transform.scale(img, (SCREEN_WIDTH, SCREEN_HEIGHT))
-            self.backgrounds.append(img)
+            self.backgrounds.append(load_scaled_image(level["bg"], (SCREEN_WIDTH, SCREEN_HEIGHT)))
 
     def update(self, player_y):
         """Aggiorna il livello in base all'altezza del player."""
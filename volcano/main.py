@@ -3,6 +3,7 @@ import os
 import sys
 import random
 import time
+import argparse
 
 # Funzione per path portatile (PyInstaller)
 def resource_path(relative_path):
@@ -10,19 +11,63 @@ def resource_path(relative_path):
         return os.path.join(sys._MEIPASS, relative_path)
     return os.path.join(os.path.abspath("."), relative_path)
 # Esempio: pygame.image.load(resource_path("assets/immagine.png"))
-from constants import (SCREEN_WIDTH, SCREEN_HEIGHT, FPS, GAME_TIME, 
-                      MENU, PLAYING, GAME_OVER, SCORE_LIST, ENTER_NAME, PLATFORM_WIDTH, PLATFORM_HEIGHT)
-from player import WobblyBall
-from platforms import PlatformManager
-from collectibles import Collectible, spawn_magma_bubbles_on_platforms, add_magma_bubble_for_platform, update_collectibles, draw_collectibles, check_collectibles_collision, get_world_offset, collectibles, block_on_demand_collectibles
-from background_manager import BackgroundManager
-from levels import LevelManager, LEVEL_DEFS
-from enemies import EnemyManager, penalties
+from constants import (SCREEN_WIDTH, SCREEN_HEIGHT, FPS, GAME_TIME, SIM_TICK_RATE,
+                      MENU, PLAYING, GAME_OVER, SCORE_LIST, ENTER_NAME)
 from ui_system import UISystem
 from save_system import add_score
-from fountain import Fountain, reset_victory_state, start_victory_fountain, update_victory_fountain, is_victory_active, get_victory_timer, get_fountain, set_victory_active
+from game_session import GameSession, InputState
 import game_states
 from audio_manager import AudioManager
+from timer_system import FixedTimestep
+from headless import HEADLESS_ENV_VAR, NO_DRAW_ENV_VAR, env_flag, use_dummy_drivers
+from replay import ReplayWriter, load_replay
+from profiler import FrameProfiler
+from profiler_overlay import ProfilerOverlay
+from hitch import HitchDetector
+from fonts import FONTS
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Volcano Wobbly Jump")
+    parser.add_argument("--headless", action="store_true", default=env_flag(HEADLESS_ENV_VAR),
+                        help=f"nessuna finestra né audio (driver SDL dummy), simulazione alla massima velocità (anche {HEADLESS_ENV_VAR}=1)")
+    parser.add_argument("--no-draw", action="store_true", default=env_flag(NO_DRAW_ENV_VAR),
+                        help=f"in headless salta anche tutte le chiamate draw_* (anche {NO_DRAW_ENV_VAR}=1)")
+    parser.add_argument("--max-ticks", type=int, default=None,
+                        help="termina dopo questo numero di tick di simulazione")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed della partita: stesso seed e stessi input, stessa partita (default: casuale)")
+    parser.add_argument("--hitch-budget", type=float, default=None, metavar="MS",
+                        help="registra i frame più lunghi di MS millisecondi (sezioni lente e stack) nel log degli hitch")
+    parser.add_argument("--hitch-log", default="hitches.jsonl", metavar="FILE",
+                        help="file JSON lines degli hitch (default: hitches.jsonl)")
+    parser.add_argument("--hitch-cprofile", action="store_true",
+                        help="aggiunge al log degli hitch il profilo cProfile del frame (rallenta il gioco)")
+    replay_group = parser.add_mutually_exclusive_group()
+    replay_group.add_argument("--record", metavar="FILE", default=None,
+                              help="registra seed e input di ogni partita (le partite successive in FILE-2, FILE-3...)")
+    replay_group.add_argument("--replay", metavar="FILE", default=None,
+                              help="riproduce una partita registrata con --record")
+    return parser.parse_args(argv)
+
+
+def numbered_path(path, number):
+    """Percorso della registrazione numero `number` (la prima usa il percorso così com'è)."""
+    if number <= 1:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}-{number}{ext}"
+
+args = parse_args()
+replay = None
+if args.replay:
+    try:
+        replay = load_replay(args.replay)
+    except (OSError, ValueError) as e:
+        sys.exit(f"Replay non valido: {e}")
+    if replay.tick_rate != SIM_TICK_RATE:
+        sys.exit(f"Replay registrato a {replay.tick_rate} tick/s, la simulazione ne usa {SIM_TICK_RATE}")
+if args.headless:
+    use_dummy_drivers()
 
 pygame.init()
 try:
@@ -38,9 +83,13 @@ audio_manager = AudioManager(os.path.join(os.path.dirname(__file__), 'audio'))
 print(f"DEBUG: audio_manager.sounds = {audio_manager.sounds}")
 pygame.display.set_caption("Volcano Wobbly Jump")
 clock = pygame.time.Clock()
+# Simulazione a passo fisso, separata dal rendering (che resta limitato a FPS)
+timestep = FixedTimestep()
 
 # --- Sistemi di gioco ---
 
+# Tutti i font del gioco, caricati una volta sola (nessuna ricerca di font durante i frame)
+FONTS.preload()
 ui_system = UISystem()
 HOW_TO_PLAY = 10  # nuovo stato menu
 
@@ -48,291 +97,101 @@ HOW_TO_PLAY = 10  # nuovo stato menu
 
 
 # --- Variabili globali ---
-total_scroll_distance = 0
 game_state = MENU
 final_score = 0
-score = 0  # Punteggio reale, parte da 0
 
-
-
-# --- Istanze oggetti di gioco (create quando si inizia a giocare) ---
-player = None
-platform_manager = None
-level_manager = None
-background_manager = None
-enemy_manager = None
-cooling_time = 0
+# --- Partita corrente: tutto lo stato di gioco vive nella sessione ---
+session = GameSession(audio_manager)
+# Tempi di frame per sezione: la raccolta è sempre attiva, l'overlay si mostra con F3
+profiler = FrameProfiler()
+session.profiler = profiler
+profiler_overlay = ProfilerOverlay(profiler)
+hitch_detector = None
+if args.hitch_budget is not None:
+    hitch_detector = HitchDetector(profiler, args.hitch_budget, args.hitch_log, use_cprofile=args.hitch_cprofile)
+# Input del replay in riproduzione e registrazione in corso (vedi --replay / --record)
+replay_inputs = None
+recorder = None
+recorded_games = 0
 
 def calculate_score():
     """Restituisce il punteggio reale basato solo sui collectibles raccolti."""
-    return score
+    return session.calculate_score()
 
 def init_game():
-    # Reset tracking per punteggio salita
-    update_game.last_score_scroll = 0
     """Inizializza una nuova partita."""
-    global player, platform_manager, level_manager, background_manager, enemy_manager
-    global total_scroll_distance, cooling_time, victory_fountain_active, fountain_start_time
-    global victory_timer, score
-    
-    player = WobblyBall(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 150)
-    platform_manager = PlatformManager(num_platforms=10)
-    level_manager = LevelManager(LEVEL_DEFS)
-    background_manager = BackgroundManager()
-    enemy_manager = EnemyManager()
-    
-    # Collega il background manager al platform manager per i limiti del vulcano
-    platform_manager.set_background_manager(background_manager)
-    
-
-    # Prima generazione piattaforme con livello (più profonda, stile Doodle Jump)
-    platform_manager.generate_initial_platforms(player, level_manager, depth_multiplier=8)
-    if platform_manager.platforms:
-        first_platform = platform_manager.platforms[0]
-        player.y = first_platform.rect.top - player.radius - 5
-
-    # Genera bolle di magma sulle piattaforme
-        spawn_magma_bubbles_on_platforms(platform_manager, density=1.0 if level_manager.get_current_level()['name'] == 'Mantello' else 0.8)
-    
-    total_scroll_distance = 0
-    cooling_time = GAME_TIME  # 2 minuti
-    score = 0
-    # Reset vittoria
-    reset_victory_state()
-
-
+    global replay_inputs, recorder, recorded_games
+    session.reset(replay.seed if replay else args.seed)
+    timestep.reset()
+    if replay:
+        replay_inputs = replay.inputs()
+        print(f"REPLAY: {args.replay}, seed {replay.seed}, {replay.ticks} tick")
+    if args.record:
+        stop_recording()
+        recorded_games += 1
+        recorder = ReplayWriter(numbered_path(args.record, recorded_games), session.seed)
+
+def stop_recording():
+    """Chiude la registrazione in corso, se presente."""
+    global recorder
+    if recorder is not None:
+        recorder.close()
+        print(f"REC: {recorder.path}, seed {recorder.seed}, {recorder.ticks} tick")
+        recorder = None
 
 def update_game(dt):
-    global score
-    """Aggiorna la logica di gioco."""
-    global total_scroll_distance, game_state, final_score, cooling_time
-
-    if player is None:
-        return
-
-    # Aggiorna SEMPRE il movimento delle piattaforme mobili (anche senza scroll)
-    platform_manager.update(0, level_manager)
-
-    # Musica di background: Mantello o fontana
-    current_level_name = level_manager.get_current_level()['name']
-    if not hasattr(update_game, "last_bg_level"):
-        update_game.last_bg_level = None
-    if is_victory_active() and game_state != MENU:
-        if update_game.last_bg_level != "ERUPTION":
-            audio_manager.play_background_eruption(os.path.join(os.path.dirname(__file__), 'audio'))
-            update_game.last_bg_level = "ERUPTION"
-    elif update_game.last_bg_level == "ERUPTION" and game_state == MENU:
-        audio_manager.stop_background()
-        update_game.last_bg_level = None
-    elif current_level_name == "Mantello" and update_game.last_bg_level != "Mantello":
-        audio_manager.play_background_lava(os.path.join(os.path.dirname(__file__), 'audio'))
-        update_game.last_bg_level = "Mantello"
-    elif current_level_name == "Vulcano" and not is_victory_active() and update_game.last_bg_level != "WIND":
-        audio_manager.play_background_wind(os.path.join(os.path.dirname(__file__), 'audio'))
-        update_game.last_bg_level = "WIND"
-    elif current_level_name != "Vulcano" and update_game.last_bg_level == "WIND":
-        audio_manager.stop_background()
-        update_game.last_bg_level = current_level_name
-    elif current_level_name != "Mantello" and update_game.last_bg_level == "Mantello":
-        audio_manager.stop_background()
-        update_game.last_bg_level = current_level_name
-    
-    # Controlla se ha raggiunto il cratere
-    if background_manager and background_manager.check_crater_reached(total_scroll_distance):
-        if not is_victory_active():
-            start_victory_fountain(SCREEN_WIDTH, SCREEN_HEIGHT)
-            print("🎉 VITTORIA! Cratere raggiunto!")
-
-    # Se la fontana è attiva, aggiorna il timer della vittoria e la fontana
-    if is_victory_active():
-        victory_timer = update_victory_fountain()
-        if victory_timer >= 10:  # Cambiato da 60 a 10 secondi
-            final_score = calculate_score()
-            ui_system.reset_input()
-            game_state = ENTER_NAME
+    """Aggiorna la logica di gioco di un tick di simulazione, leggendo la tastiera reale o il replay."""
+    global game_state, final_score
+    if replay_inputs is not None:
+        input_state = next(replay_inputs, None)
+        if input_state is None:
+            obs = session.observe()
+            print(f"REPLAY: terminato al tick {obs['tick']}, punteggio {obs['score']}, salita {obs['altitude']}px")
+            game_state = MENU
             return
-    
-    # Decrementa il timer di raffreddamento nel tempo (solo se non in modalità vittoria)
-    if not is_victory_active():
-        cooling_time -= dt  # Sottrai il tempo trascorso (dt è in secondi)
-    
-    # Aggiorna player solo se non in modalità fontana
-    if not is_victory_active():
-        keys = pygame.key.get_pressed()
-        # Suono salto
-        if keys[pygame.K_SPACE] and hasattr(player, 'on_ground') and player.on_ground:
-            audio_manager.play('jump')
-        player.apply_input(keys)
-        player.update(dt)
-
-        # Collisioni piattaforme
-        jump_automatico = platform_manager.check_collision(player)
-        if jump_automatico:
-            audio_manager.play('jump')
-
-        # Collisioni con pareti del vulcano (solo nel livello vulcano)
-        if level_manager.get_current_level()['name'] == "Vulcano":
-            background_manager.check_volcano_collision(player)
-
-        # Limiti orizzontali (solo se non siamo nel vulcano, che ha le sue pareti)
-        if level_manager.get_current_level()['name'] != "Vulcano":
-            if player.x - player.radius < 50:
-                player.x = 50 + player.radius
-                player.vx = 0
-            elif player.x + player.radius > SCREEN_WIDTH - 50:
-                player.x = SCREEN_WIDTH - 50 - player.radius
-                player.vx = 0
-
-
-        # Scroll verticale
-        dy = 0
-        if player.y < SCREEN_HEIGHT * 0.4:
-            dy = int(SCREEN_HEIGHT * 0.4 - player.y)
-            player.y += dy
-            platform_manager.update(dy, level_manager)
-            background_manager.update(dy, total_scroll_distance)
-            total_scroll_distance += dy
-
-            # Incrementa il punteggio ogni 100 pixel di salita (basato su total_scroll_distance)
-            if not hasattr(update_game, "last_score_scroll"):
-                update_game.last_score_scroll = 0
-            while total_scroll_distance - update_game.last_score_scroll >= 100:
-                score += 100
-                update_game.last_score_scroll += 100
-
-            # Quando vengono aggiunte nuove piattaforme, aggiungi SEMPRE bolle di magma su tutte le piattaforme
-            global block_on_demand_collectibles
-            if not block_on_demand_collectibles:
-                for plat in platform_manager.platforms:
-                    add_magma_bubble_for_platform(plat)
-
-        # Aggiorna livello in base alla posizione
-        old_level = level_manager.get_current_level()['name']
-        level_manager.update(total_scroll_distance)
-        new_level = level_manager.get_current_level()['name']
-        if new_level != old_level:
-            # Cambio livello immediato
-            platform_manager.generate_initial_platforms(player, level_manager, depth_multiplier=8)
-            # --- PATCH: garantisci piattaforma sotto il player ---
-            piattaforme_sotto = [p for p in platform_manager.platforms if p.rect.top > player.y and p.rect.top - player.y < 150]
-            if len(piattaforme_sotto) < 1:
-                from platforms import Platform
-                px = int(player.x - PLATFORM_WIDTH // 2)
-                py = int(player.y + player.radius + 40)
-                if py < SCREEN_HEIGHT - 30:  # Assicura che sia visibile
-                    platform_manager.platforms.append(Platform(px, py, PLATFORM_WIDTH, PLATFORM_HEIGHT))
-            spawn_magma_bubbles_on_platforms(platform_manager)
-            block_on_demand_collectibles = True
-        else:
-            block_on_demand_collectibles = False
-
-        # Aggiorna nemici (con offset per effetto salita)
-        enemy_manager.update(dt, dy, total_scroll_distance, level_manager.get_current_level()['name'])
-
-        # Collisione nemici
-        hits = enemy_manager.check_collision(player)
-        for enemy in hits:
-            penalty_seconds = penalties.get(enemy.kind, 10)
-            cooling_time -= penalty_seconds  # penalità in secondi
-            cooling_time = max(0, cooling_time)  # non scendere sotto zero
-            print(f"DEBUG: collisione con nemico/minerale {enemy.kind}, penalty {penalty_seconds} sec, timer abbassato a {cooling_time}")
-            enemy.trigger_float_text("CRISTALLIZZAZIONE FRAZIONATA, RAFFREDDAMENTO!")
-            print(f"DEBUG: testo PENALITÀ! attivato su nemico/minerale")
-            # Il nemico viene rimosso solo dopo che il testo è scomparso (gestione da EnemyManager se serve)
-
-        # Controllo cratere raggiunto (solo nel livello vulcano)
-        if level_manager.get_current_level()['name'] == "Vulcano" and not is_victory_active():
-            if background_manager.check_crater_reached(player.y):
-                set_victory_active(True)
-                reset_victory_state()
-                start_victory_fountain(SCREEN_WIDTH, SCREEN_HEIGHT)
-
-        # Aggiorna collezionabili
-        update_collectibles(dt)
-
-        # Gestione raccolta bolle di magma
-        collected_score = check_collectibles_collision(player)
-        if collected_score > 0:
-            score += (collected_score // 200) * 100  # 100 punti per ogni bolla raccolta (valore 200)
-            audio_manager.play('collect')
-
-        # Se la fontana è attiva, aggiorna timer (fontana gestita automaticamente nel background_manager)
-        if is_victory_active():
-            victory_timer = update_victory_fountain()
-            if victory_timer >= 10:
-                final_score = calculate_score()
-        if collected_score > 0:
-            score += (collected_score // 200) * 100  # 100 punti per ogni bolla raccolta (valore 200)
-            audio_manager.play('bubble')
-            audio_manager.play('enemy_hit')  # TEST: riproduci enemy_hit anche qui
-            print("DEBUG: TEST enemy_hit riprodotto su raccolta bolla")
-            return
-
-        # Controllo game over (solo se non in modalità vittoria)
-        nemici_animati = any(getattr(e, 'float_text', None) for e in enemy_manager.enemies)
-        if not is_victory_active() and (player.y - player.radius > SCREEN_HEIGHT or (cooling_time <= 0 and not nemici_animati)):
-            final_score = calculate_score()
-            game_state = GAME_OVER
-
-def draw_game(screen):
-    """Disegna tutti gli elementi di gioco."""
-    if player is None:
-        return
-        
-    screen.fill((0, 0, 0))
-    background_manager.draw(screen)
-    platform_manager.draw(screen)
-    # Disegna le bolle di magma
-    draw_collectibles(screen, get_world_offset(), platform_manager)
-    
-    # Se la fontana è attiva, non disegnare il player
-    if not is_victory_active():
-        player.draw_trail(screen)
-        player.draw_particles(screen)
-        player.draw_wobbly(screen, pygame.time.get_ticks() / 1000.0)
-        enemy_manager.draw(screen)
-    
-    # Disegna la fontana di vittoria se attiva
-    fountain = get_fountain()
-    if is_victory_active() and fountain is not None:
-        fountain.draw(screen)
-
-    # HUD
-    font = pygame.font.SysFont(None, 30)
-    small_font = pygame.font.SysFont(None, 24)
-    if not is_victory_active():
-        # Livello e punteggio a sinistra
-        text_level = font.render(f"Livello: {level_manager.get_current_level()['name']}", True, (255, 255, 255))
-        screen.blit(text_level, (10, 10))
-
-        current_score = calculate_score()
-        score_text = font.render(f"Punteggio: {current_score}", True, (255, 255, 255))
-        screen.blit(score_text, (10, 40))
-
-        # Barra di raffreddamento in alto a destra
-        ui_system.draw_cooling_bar(screen, cooling_time, GAME_TIME)
     else:
-        # Messaggio vittoria con timer
-        victory_timer = get_victory_timer()
-        victory_text = font.render("🎉 CRATERE RAGGIUNTO! 🎉", True, (255, 215, 0))
-        victory_rect = victory_text.get_rect(center=(SCREEN_WIDTH // 2, 50))
-        screen.blit(victory_text, victory_rect)
+        input_state = InputState.from_keys(pygame.key.get_pressed())
+    if recorder is not None:
+        recorder.record(input_state)
+    session.step(input_state, dt)
+    if session.state != PLAYING:
+        final_score = session.final_score
+        if session.state == ENTER_NAME:
+            ui_system.reset_input()
+        game_state = session.state
 
-        time_left = max(0, 10 - int(victory_timer))  # Cambiato da 60 a 10
-        timer_text = font.render(f"Inserimento nome tra: {time_left}s", True, (255, 255, 255))
-        timer_rect = timer_text.get_rect(center=(SCREEN_WIDTH // 2, 80))
-        screen.blit(timer_text, timer_rect)
+def draw_game(screen, alpha=1.0):
+    """Disegna tutti gli elementi di gioco (alpha: interpolazione tra gli ultimi due tick)."""
+    session.render(screen, alpha)
 
 # --- Loop principale ---
 running = True
+draw_enabled = not (args.headless and args.no_draw)
+
+if args.headless or replay:
+    # Nessun menu senza tastiera (o col replay): si parte direttamente a giocare
+    init_game()
+    game_state = PLAYING
+if args.headless:
+    headless_start = time.perf_counter()
 
 while running:
-    dt = clock.tick(FPS) / 1000.0
+    if args.headless:
+        # Niente limite di FPS: esattamente un tick di simulazione per iterazione
+        dt = timestep.dt
+    else:
+        dt = clock.tick(FPS) / 1000.0
+    # L'attesa di clock.tick non fa parte del frame misurato
+    profiler.begin_frame()
+    if hitch_detector is not None:
+        hitch_detector.begin_frame()
     
     # Aggiorna UI
     ui_system.update(dt)
     
     for event in pygame.event.get():
+        if profiler_overlay.handle_event(event):
+            continue
         if event.type == pygame.QUIT:
             running = False
         
@@ -373,25 +232,12 @@ while running:
                 name = ui_system.input_text.strip()
                 result, scores = add_score(name, final_score)
                 if result == 'duplicate':
-                    font = pygame.font.SysFont(None, 32)
-                    msg = f"Il nome '{name}' esiste già. Sovrascrivere? (S/N)"
-                    text_surf = font.render(msg, True, (255,255,0))
-                    screen.blit(text_surf, (50, 200))
-                    pygame.display.flip()
-                    waiting = True
-                    while waiting:
-                        for event in pygame.event.get():
-                            if event.type == pygame.KEYDOWN:
-                                if event.key == pygame.K_s:
-                                    force_add_score(name, final_score)
-                                    ui_system.reset_input()
-                                    game_state = SCORE_LIST
-                                    waiting = False
-                                elif event.key == pygame.K_n:
-                                    add_score_with_number(name, final_score)
-                                    ui_system.reset_input()
-                                    game_state = SCORE_LIST
-                                    waiting = False
+                    if ui_system.confirm_overwrite(screen, name):
+                        force_add_score(name, final_score)
+                    else:
+                        add_score_with_number(name, final_score)
+                    ui_system.reset_input()
+                    game_state = SCORE_LIST
                 else:
                     # Nome non duplicato, salva normalmente
                     ui_system.reset_input()
@@ -400,31 +246,66 @@ while running:
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 game_state = MENU
     
-    # --- Aggiornamenti ---
+    profiler.lap('events')
+
+    # --- Aggiornamenti (passo fisso) ---
     if game_state == PLAYING:
-        update_game(dt)
+        for _ in range(timestep.advance(dt)):
+            update_game(timestep.dt)
+            if game_state != PLAYING:
+                break
+    else:
+        timestep.reset()
+
+    if args.headless and (game_state != PLAYING or (args.max_ticks is not None and timestep.ticks >= args.max_ticks)):
+        running = False
     
     # --- Rendering ---
-    if game_state == MENU:
+    if not draw_enabled:
+        pass
+    elif game_state == MENU:
         ui_system.draw_menu(screen)
     elif game_state == HOW_TO_PLAY:
         ui_system.draw_how_to_play(screen)
     elif game_state == PLAYING:
-        draw_game(screen)
+        draw_game(screen, timestep.alpha)
     elif game_state == GAME_OVER:
-        if player is not None:
+        if session.player is not None:
             draw_game(screen)  # Mostra il gioco in background
         ui_system.draw_game_over(screen)
     elif game_state == SCORE_LIST:
         ui_system.draw_scores(screen)
     elif game_state == ENTER_NAME:
-        if player is not None:
+        if session.player is not None:
             draw_game(screen)  # Mostra il gioco in background
         ui_system.draw_name_input(screen, final_score)
+    profiler.lap('draw.ui')
 
     # (RIMOSSO: la verifica duplicati ora avviene solo dopo INVIO)
-    
-    pygame.display.flip()
 
+    if draw_enabled:
+        profiler_overlay.draw(screen, session, clock.get_fps())
+        profiler.lap('draw.overlay')
+    
+    if not args.headless:
+        pygame.display.flip()
+        profiler.lap('flip')
+    profiler.end_frame()
+    if hitch_detector is not None:
+        hitch = hitch_detector.end_frame()
+        if hitch is not None:
+            print(f"HITCH: frame {hitch['frame']} {hitch['frame_ms']:.1f} ms, sezioni lente: {', '.join(hitch['slow_stages']) or '-'}")
+
+if args.headless:
+    elapsed = time.perf_counter() - headless_start
+    print(f"HEADLESS: {session.tick} tick in {elapsed:.2f}s -> {session.tick / max(elapsed, 1e-9):.0f} tick/s "
+          f"(rendering {'attivo' if draw_enabled else 'disattivato'}), punteggio {calculate_score()}, "
+          f"salita {session.total_scroll_distance}px")
+
+stop_recording()
+if hitch_detector is not None:
+    hitch_detector.stop()
+    print(f"HITCH: {hitch_detector.hitch_count} frame su {hitch_detector.frame_count} oltre "
+          f"{args.hitch_budget:g} ms -> {args.hitch_log}")
 pygame.quit()
 sys.exit()
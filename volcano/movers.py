@@ -0,0 +1,278 @@
+"""
+Aggiornamento vettoriale (struct of arrays) degli oggetti in movimento: nemici e piattaforme mobili.
+
+Posizioni, velocità, fasi di oscillazione e limiti stanno in array NumPy, una colonna per
+attributo e una riga per oggetto: ogni tick tutti gli oggetti avanzano con poche operazioni
+sugli array invece di una chiamata di metodo per oggetto. Le formule sono le stesse di
+Enemy.update e Platform.update, nello stesso ordine.
+
+NumPy è facoltativo: se manca, HAVE_NUMPY è False e i manager usano l'update per oggetto.
+"""
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAVE_NUMPY = np is not None
+
+ENEMY_MARGIN = 50        # distanza minima dei nemici dai bordi dello schermo (come Enemy.update)
+PLATFORM_MARGIN = 20     # distanza delle piattaforme mobili dalle pareti del vulcano
+
+
+class EnemyMovers:
+    """Stato cinematico dei nemici, una riga per nemico nello stesso ordine di `enemies`.
+
+    Mentre i nemici sono nelle colonne, i loro attributi fx, fy, ... non vengono aggiornati
+    (flush li riallinea) e i Rect solo per quelli disegnati: collisioni e rimozione fuori
+    schermo lavorano direttamente sulle colonne.
+    """
+    COLUMNS = ('fx', 'fy', 'prev_x', 'prev_y', 'speedx', 'speedy', 'oscillation', 'oscillation_speed',
+               'rotation', 'rotation_speed', 'width', 'height', 'size')
+
+    def __init__(self, capacity=16):
+        self.enemies = []
+        self.count = 0
+        self._capacity = 0
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        for name in self.COLUMNS:
+            column = np.zeros(capacity)
+            if self._capacity:
+                column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+        self._capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def add(self, enemy):
+        if self.count == self._capacity:
+            self._grow(self._capacity * 2)
+        row = self.count
+        for name in self.COLUMNS[:-3]:
+            getattr(self, name)[row] = getattr(enemy, name)
+        self.width[row] = enemy.rect.width
+        self.height[row] = enemy.rect.height
+        self.size[row] = enemy.properties["size"]
+        self.enemies.append(enemy)
+        self.count += 1
+
+    def load(self, enemies):
+        """Riempie le colonne con lo stato attuale dei nemici."""
+        self.clear()
+        for enemy in enemies:
+            self.add(enemy)
+
+    def flush(self):
+        """Riporta lo stato delle colonne sugli oggetti Enemy (posizione, velocità, fasi e Rect)."""
+        n = self.count
+        columns = [getattr(self, name)[:n].tolist() for name in self.COLUMNS[:-3]]
+        for enemy, values in zip(self.enemies, zip(*columns)):
+            (enemy.fx, enemy.fy, enemy.prev_x, enemy.prev_y, enemy.speedx, enemy.speedy,
+             enemy.oscillation, enemy.oscillation_speed, enemy.rotation, enemy.rotation_speed) = values
+            enemy.rect.topleft = (round(enemy.fx), round(enemy.fy))
+
+    def clear(self):
+        self.enemies = []
+        self.count = 0
+
+    def step(self, k):
+        """Un tick di Enemy.update per tutti i nemici."""
+        n = self.count
+        if not n:
+            return
+        fx, fy = self.fx[:n], self.fy[:n]
+        speedx = self.speedx[:n]
+        self.prev_x[:n] = fx
+        self.prev_y[:n] = fy
+        oscillation = self.oscillation[:n]
+        oscillation += self.oscillation_speed[:n] * k
+        fy += self.speedy[:n] * k
+        fx += (speedx + np.sin(oscillation) * 0.5) * k
+        self.rotation[:n] += self.rotation_speed[:n] * k
+
+        # Rimbalzo sui bordi con perdita di energia (sulla x arrotondata, come il Rect)
+        x = np.round(fx)
+        left = x < ENEMY_MARGIN
+        if left.any():
+            fx[left] = ENEMY_MARGIN
+            speedx[left] = np.abs(speedx[left]) * 0.8
+        right = x + self.width[:n] > SCREEN_WIDTH - ENEMY_MARGIN
+        if right.any():
+            right &= ~left
+            fx[right] = SCREEN_WIDTH - ENEMY_MARGIN - self.width[:n][right]
+            speedx[right] = -np.abs(speedx[right]) * 0.8
+
+    def remove_below(self, limit):
+        """Toglie i nemici con il bordo superiore oltre `limit`. Restituisce quelli rimossi."""
+        n = self.count
+        if not n or self.fy[:n].max() < limit:
+            return []
+        keep = np.round(self.fy[:n]) <= limit
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[:int(keep.sum())] = column[:n][keep]
+        removed = [enemy for enemy, kept in zip(self.enemies, keep) if not kept]
+        self.enemies = [enemy for enemy, kept in zip(self.enemies, keep) if kept]
+        self.count = len(self.enemies)
+        return removed
+
+    def colliding(self, player_rect, player_radius):
+        """Nemici che toccano il player: stessi controlli di EnemyManager.check_collision."""
+        n = self.count
+        if not n:
+            return []
+        x, y = np.round(self.fx[:n]), np.round(self.fy[:n])
+        w, h = self.width[:n], self.height[:n]
+        overlap = ((x < player_rect.right) & (player_rect.x < x + w) &
+                   (y < player_rect.bottom) & (player_rect.y < y + h))
+        if not overlap.any():
+            return []
+        dx = x + w // 2 - player_rect.centerx
+        dy = y + h // 2 - player_rect.centery
+        hit = overlap & (np.sqrt(dx * dx + dy * dy) < (self.size[:n] + player_radius) // 2)
+        return [self.enemies[i] for i in np.flatnonzero(hit)]
+
+    def draw(self, screen, alpha=1.0, y_offset=0):
+        """Disegna i nemici visibili in posizione interpolata, aggiornandone il Rect."""
+        n = self.count
+        if not n:
+            return
+        fx, fy = self.fx[:n], self.fy[:n]
+        draw_x = np.round(self.prev_x[:n] + (fx - self.prev_x[:n]) * alpha).astype(int)
+        draw_y = np.round(self.prev_y[:n] + (fy - self.prev_y[:n]) * alpha).astype(int) + y_offset
+        visible = (draw_y + self.height[:n] > 0) & (draw_y < SCREEN_HEIGHT)
+        rect_x, rect_y = np.round(fx).astype(int), np.round(fy).astype(int)
+        rotation = self.rotation
+        for i in np.flatnonzero(visible).tolist():
+            enemy = self.enemies[i]
+            enemy.rect.topleft = (rect_x[i], rect_y[i])
+            enemy.rotation = rotation[i]
+            enemy.draw_at(screen, draw_x[i], draw_y[i])
+
+
+class PlatformMovers:
+    """Piattaforme mobili di un PlatformStore in colonne NumPy.
+
+    L'elenco delle mobili viene ricostruito solo quando cambia lo store o vi entra una nuova
+    piattaforma mobile (added); quelle che escono (removed) perdono la loro riga sul posto, senza
+    ricaricare le altre. A ogni tick si aggiornano solo i Rect.x, gli unici letti da collisioni e
+    disegno. Con poche piattaforme mobili conviene l'update per oggetto: active() lo dice al
+    manager, che in quel caso chiama release() e usa Platform.update.
+    """
+    MIN_PLATFORMS = 12  # piattaforme mobili sotto cui le operazioni NumPy costano più del ciclo
+    COLUMNS = ('fx', 'speed', 'width', 'y')
+
+    def __init__(self):
+        self.platforms = []
+        self._store = None
+        self._stale = True
+        self._columns = False  # True se fx/speed/width/y sono allineate e più recenti degli oggetti
+        self._cone = None
+
+    def _sync(self, store):
+        if store is self._store and not self._stale:
+            return
+        self.release()
+        self.platforms = [p for p in store if p.moving]
+        self._store, self._stale = store, False
+
+    def added(self, platform):
+        """Callback dello store: una nuova piattaforma mobile va inserita al prossimo active()."""
+        if platform.moving:
+            self._stale = True
+
+    def removed(self, platform):
+        """Callback dello store: toglie la riga della piattaforma, se è tra le mobili."""
+        if not platform.moving:
+            return
+        platforms = self.platforms
+        # Di solito esce la più in basso, cioè l'ultima riga
+        for i in range(len(platforms) - 1, -1, -1):
+            if platforms[i] is platform:
+                break
+        else:
+            return
+        del platforms[i]
+        if self._columns:
+            n = len(platforms)
+            for name in self.COLUMNS:
+                column = getattr(self, name)
+                column[i:n] = column[i + 1:n + 1]
+                setattr(self, name, column[:n])
+
+    def active(self, store):
+        """True se le piattaforme mobili di `store` sono abbastanza da aggiornarle in blocco."""
+        self._sync(store)
+        return len(self.platforms) >= self.MIN_PLATFORMS
+
+    def _load(self):
+        platforms = self.platforms
+        self.fx = np.array([p.fx for p in platforms], dtype=float)
+        self.speed = np.array([p.speed for p in platforms], dtype=float)
+        self.width = np.array([p.rect.width for p in platforms], dtype=np.int64)
+        self.y = np.array([p.rect.y for p in platforms], dtype=np.int64)  # y del mondo: non cambia
+        self._columns = True
+
+    def release(self):
+        """Riporta fx e velocità dalle colonne agli oggetti Platform e abbandona le colonne."""
+        if not self._columns:
+            return
+        for platform, fx, speed in zip(self.platforms, self.fx.tolist(), self.speed.tolist()):
+            platform.fx = fx
+            platform.speed = speed
+        self._columns = False
+
+    def step(self, k, cone=None, volcano_scroll=0, camera_y=0, default_bounds=None):
+        """Un tick di Platform.update per le piattaforme mobili (dopo active()).
+
+        cone: ConeProfile del vulcano (limiti delle pareti per altezza), oppure None;
+        volcano_scroll e camera_y servono a convertire le y del mondo in altezze del cono.
+        default_bounds: limiti fissi (left, right) quando si è nel vulcano senza cono.
+        """
+        if not self._columns:
+            self._load()
+        fx, speed, width = self.fx, self.speed, self.width
+        fx += speed * k
+        x = fx.astype(np.int64)  # int() tronca verso zero come il Rect
+
+        if cone is not None:
+            left_table, right_table = self._cone_tables(cone)
+            h = (volcano_scroll + (SCREEN_HEIGHT - camera_y - self.y)).astype(np.int64)
+            h = np.minimum(np.maximum(h, 0), cone.total_height)
+            walled = h < cone.crater_index
+            left = (left_table[h] + PLATFORM_MARGIN).astype(np.int64)
+            right = (right_table[h] - PLATFORM_MARGIN).astype(np.int64)
+        elif default_bounds is not None:
+            walled = True
+            left, right = default_bounds
+        else:
+            walled = False
+
+        if walled is False:
+            # Senza pareti: rimbalzo sui bordi dello schermo, senza riposizionamento
+            bounced = (x < 0) | (x + width > SCREEN_WIDTH)
+        else:
+            # Con le pareti: rimbalzo con riposizionamento sul bordo
+            hit_left = walled & (x < left)
+            hit_right = walled & ~hit_left & (x + width > right)
+            x = np.where(hit_left, left, np.where(hit_right, right - width, x))
+            bounced = hit_left | hit_right
+            fx[bounced] = x[bounced]
+            if walled is not True:
+                bounced |= ~walled & ((x < 0) | (x + width > SCREEN_WIDTH))
+        speed[bounced] *= -1
+
+        for platform, new_x in zip(self.platforms, x.tolist()):
+            platform.rect.x = new_x
+
+    def _cone_tables(self, cone):
+        if self._cone is not cone:
+            # Viste senza copia sugli array('d') del cono
+            self._cone = cone
+            self._cone_left = np.frombuffer(cone.left, dtype=float)
+            self._cone_right = np.frombuffer(cone.right, dtype=float)
+        return self._cone_left, self._cone_right
@@ -0,0 +1,216 @@
+"""
+Particelle della fontana di lava in colonne NumPy (struct of arrays), come movers.py per nemici
+e piattaforme.
+
+Posizione, velocità, raggio ed età stanno in array di capacità fissa, una riga per particella:
+ogni tick tutte le particelle avanzano con poche operazioni sugli array. La scia della lava è un
+buffer circolare (capacità x TRAIL_LENGTH) con un'unica testa condivisa, quindi aggiungere un
+punto costa una scrittura di colonna invece di un insert(0, ...) per particella. Le formule e
+l'ordine di disegno sono gli stessi di LavaParticle e SmokeParticle (fountain.py).
+
+La capacità è anche il tetto di particelle: quando le colonne sono piene, le nuove emissioni
+vengono saltate. NumPy è facoltativo: se manca, HAVE_NUMPY è False e la fontana usa le particelle
+per oggetto.
+"""
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from sprite_cache import CIRCLE_SPRITES, COLOR_LEVELS, ALPHA_LEVELS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAVE_NUMPY = np is not None
+
+if HAVE_NUMPY:
+    # Quantizzazione della cache degli sprite (sprite_cache.py) applicata in blocco
+    _COLOR_LEVELS = np.array(COLOR_LEVELS)
+    _ALPHA_LEVELS = np.array(ALPHA_LEVELS)
+
+TRAIL_LENGTH = 30      # punti della scia di una particella di lava (come LavaParticle.max_trail)
+LAVA_GRAVITY = 0.35
+LAVA_FADE = 120        # pixel sotto il cratere in cui la scia della lava si dissolve
+LAVA_MAX_RADIUS = 10   # margine per i controlli sui bordi dello schermo
+SMOKE_MAX_RADIUS = 40  # il raggio del fumo cresce dello 0,2% a tick: 20 px diventano ~29 in 180 tick
+
+# Colori della scia: arancio -> rosso nella prima metà, rosso -> grigio nella seconda
+_ORANGE, _RED, _GREY = (255, 165, 0), (255, 0, 0), (80, 80, 80)
+
+
+class _Columns:
+    """Colonne di capacità fissa con le righe occupate compattate in testa (0..count-1)."""
+    COLUMNS = ()
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.count = 0
+        for name in self.COLUMNS:
+            setattr(self, name, np.zeros(capacity))
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def free(self):
+        return self.capacity - self.count
+
+    def _append(self, *values):
+        row = self.count
+        for name, value in zip(self.COLUMNS, values):
+            getattr(self, name)[row] = value
+        self.count += 1
+        return row
+
+    def _compact(self, keep, extra=()):
+        """Tiene solo le righe con keep True, nello stesso ordine. extra: altri array per riga."""
+        n = self.count
+        kept = int(keep.sum())
+        if kept == n:
+            return
+        for column in [getattr(self, name) for name in self.COLUMNS] + list(extra):
+            column[:kept] = column[:n][keep]
+        self.count = kept
+
+
+class LavaParticles(_Columns):
+    """Particelle di lava con la scia in un buffer circolare."""
+    COLUMNS = ('x', 'y', 'vx', 'vy', 'radius', 'trail_len')
+
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.trail_x = np.zeros((capacity, TRAIL_LENGTH))
+        self.trail_y = np.zeros((capacity, TRAIL_LENGTH))
+        self.head = 0  # colonna del punto più recente della scia
+
+    def emit(self, x, y, rng):
+        """Una particella come LavaParticle(x, y, rng): stessi numeri casuali, nello stesso ordine."""
+        x = x + rng.uniform(-40, 40)
+        vx = rng.uniform(-6.0, 6.0)
+        vy = rng.uniform(-16, -9)
+        radius = rng.uniform(6, 10)
+        self._append(x, y, vx, vy, radius, 0)
+
+    def step(self, k=1.0):
+        """Un tick di LavaParticle.update per tutte le particelle (k: tick_scale(dt))."""
+        n = self.count
+        if not n:
+            return
+        vy = self.vy[:n]
+        vy += LAVA_GRAVITY * k
+        x, y = self.x[:n], self.y[:n]
+        x += self.vx[:n] * k
+        y += vy * k
+        self.head = head = (self.head + 1) % TRAIL_LENGTH
+        self.trail_x[:n, head] = x
+        self.trail_y[:n, head] = y
+        trail_len = self.trail_len[:n]
+        np.minimum(trail_len + 1, TRAIL_LENGTH, out=trail_len)
+
+    def cull(self, crater_y):
+        """Toglie le particelle ormai invisibili: scia tutta dissolta sotto il cratere o fuori schermo.
+
+        La traiettoria è una parabola che parte dal cratere, quindi basta guardare il punto più
+        recente e il più vecchio della scia.
+        """
+        n = self.count
+        if not n:
+            return
+        oldest = (self.head - (self.trail_len[:n].astype(np.int64) - 1)) % TRAIL_LENGTH
+        rows = np.arange(n)
+        old_x, old_y = self.trail_x[rows, oldest], self.trail_y[rows, oldest]
+        x, y = self.x[:n], self.y[:n]
+        bottom = min(crater_y + LAVA_FADE, SCREEN_HEIGHT + LAVA_MAX_RADIUS)
+        left, right = -LAVA_MAX_RADIUS, SCREEN_WIDTH + LAVA_MAX_RADIUS
+        keep = (((y < bottom) | (old_y < bottom)) &
+                ~((x < left) & (old_x < left)) & ~((x > right) & (old_x > right)))
+        self._compact(keep, (self.trail_x, self.trail_y))
+
+    def trail_points(self):
+        """Punti di scia di tutte le particelle."""
+        return int(self.trail_len[:self.count].sum())
+
+    def draw(self, surf, crater_y, step=1):
+        """Come LavaParticle.draw per ogni particella: scia dal punto più recente al più vecchio.
+
+        step > 1 disegna solo un punto della scia ogni step (colore, alpha e raggio non cambiano).
+        """
+        n = self.count
+        if not n:
+            return
+        i = np.arange(0, TRAIL_LENGTH, step)
+        order = (self.head - i) % TRAIL_LENGTH
+        tx, ty = self.trail_x[:n][:, order], self.trail_y[:n][:, order]
+        length = self.trail_len[:n, None]
+        t = i / np.maximum(1, length - 1)
+        first = t < 0.5
+        t2 = np.where(first, t * 2, (t - 0.5) * 2)
+        red = np.where(first, _ORANGE[0] + (_RED[0] - _ORANGE[0]) * t2,
+                       _RED[0] + (_GREY[0] - _RED[0]) * t2).astype(int)
+        green = np.where(first, _ORANGE[1] + (_RED[1] - _ORANGE[1]) * t2,
+                         _RED[1] + (_GREY[1] - _RED[1]) * t2).astype(int)
+        blue = np.where(first, _ORANGE[2] + (_RED[2] - _ORANGE[2]) * t2,
+                        _RED[2] + (_GREY[2] - _RED[2]) * t2).astype(int)
+        # Dissolvenza sotto il cratere
+        fade = np.where(ty > crater_y, np.maximum(0, 1 - (ty - crater_y) / LAVA_FADE), 1)
+        alpha = (255 * (1 - t) * fade).astype(int)
+        size = (self.radius[:n, None] * (0.5 + 0.5 * (1 - t))).astype(int)
+        rows, cols = np.nonzero((i < length) & (alpha > 0))
+        size = size[rows, cols]
+        keys = zip(size.tolist(), _COLOR_LEVELS[red[rows, cols]].tolist(),
+                   _COLOR_LEVELS[green[rows, cols]].tolist(), _COLOR_LEVELS[blue[rows, cols]].tolist(),
+                   _ALPHA_LEVELS[alpha[rows, cols]].tolist(), [0] * len(size))
+        lookup = CIRCLE_SPRITES.lookup
+        surf.blits([(lookup(key), (x, y)) for key, x, y in
+                    zip(keys, (tx[rows, cols] - size).tolist(), (ty[rows, cols] - size).tolist())],
+                   doreturn=False)
+
+
+class SmokeParticles(_Columns):
+    """Particelle di fumo: salgono oscillando e si allargano fino a max_age."""
+    COLUMNS = ('x', 'y', 'vx', 'vy', 'radius', 'age', 'max_age')
+
+    def emit(self, x, y, rng):
+        """Una particella come SmokeParticle(x, y, rng): stessi numeri casuali, nello stesso ordine."""
+        x = x + rng.uniform(-50, 50)
+        vx = rng.uniform(-0.6, 0.6)
+        vy = rng.uniform(-3.5, -1.8)
+        radius = rng.uniform(12, 20)
+        max_age = rng.randint(140, 180)
+        self._append(x, y - 40, vx, vy, radius, 0, max_age)
+
+    def step(self, k=1.0):
+        """Un tick di SmokeParticle.update per tutte le particelle (k: tick_scale(dt))."""
+        n = self.count
+        if not n:
+            return
+        age = self.age[:n]
+        self.x[:n] += (self.vx[:n] + np.sin(age * 0.05) * 0.2) * k
+        self.y[:n] += self.vy[:n] * k
+        age += k
+        self.radius[:n] *= 1.002 ** k
+
+    def cull(self):
+        """Toglie le particelle esaurite o uscite dallo schermo (il fumo sale soltanto)."""
+        n = self.count
+        if not n:
+            return
+        x = self.x[:n]
+        keep = ((self.age[:n] < self.max_age[:n]) & (self.y[:n] > -SMOKE_MAX_RADIUS) &
+                (x > -SMOKE_MAX_RADIUS) & (x < SCREEN_WIDTH + SMOKE_MAX_RADIUS))
+        self._compact(keep)
+
+    def draw(self, surf):
+        n = self.count
+        if not n:
+            return
+        alpha = np.maximum(0, (200 * (1 - self.age[:n] / self.max_age[:n])).astype(int))
+        size = self.radius[:n].astype(int)
+        visible = alpha > 0
+        grey = _COLOR_LEVELS[40]
+        keys = [(s, grey, grey, grey, a, 0) for s, a in
+                zip(size[visible].tolist(), _ALPHA_LEVELS[alpha[visible]].tolist())]
+        lookup = CIRCLE_SPRITES.lookup
+        surf.blits([(lookup(key), (x, y)) for key, x, y in
+                    zip(keys, (self.x[:n][visible] - size[visible]).tolist(),
+                        (self.y[:n][visible] - size[visible]).tolist())],
+                   doreturn=False)
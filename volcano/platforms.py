@@ -1,69 +1,259 @@
 import pygame, random, math
-from constants import SCREEN_WIDTH, PLATFORM_WIDTH, PLATFORM_HEIGHT, SCREEN_HEIGHT
+from collections import deque
+from constants import SCREEN_WIDTH, PLATFORM_WIDTH, PLATFORM_HEIGHT, SCREEN_HEIGHT, BASE_TICK_RATE
+from timer_system import tick_scale
+from movers import HAVE_NUMPY, PlatformMovers
+from camera import Camera
+from pool import ObjectPool
+
+class PlatformRenderer:
+    """Disegna le piattaforme con sprite condivisi: una superficie per (larghezza, altezza, stato)
+    invece di una per piattaforma, e tutte le piattaforme visibili in un'unica chiamata blits."""
+    COLORS = {
+        'normal': (100, 200, 100),
+        'crumbling': (200, 100, 100),   # crollante, non ancora calpestata
+        'breaking': (255, 50, 50),      # timer di crollo avviato
+    }
+
+    def __init__(self):
+        self._sprites = {}
+
+    def sprite(self, width, height, state):
+        key = (width, height, state)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((width, height))
+            sprite.fill(self.COLORS[state])
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert()
+            self._sprites[key] = sprite
+        return sprite
+
+    def draw(self, screen, platforms, y_offset=0):
+        sprite = self.sprite
+        screen.blits([(sprite(p.rect.width, p.rect.height, p.state), (p.rect.x, p.rect.y + y_offset))
+                      for p in platforms], doreturn=False)
+
+
+PLATFORM_RENDERER = PlatformRenderer()
+
+LANDING_TOLERANCE = 15  # pixel sotto il bordo superiore entro cui il player atterra ancora
+
 
 class Platform(pygame.sprite.Sprite):
-    def __init__(self, x, y, w=PLATFORM_WIDTH, h=PLATFORM_HEIGHT, moving=False):
+    def __init__(self, x, y, w=PLATFORM_WIDTH, h=PLATFORM_HEIGHT, moving=False, rng=random):
         super().__init__()
-        self.image = pygame.Surface((w,h))
-        self.image.fill((100,200,100))
-        self.rect = self.image.get_rect(topleft=(x,y))
+        self.rect = pygame.Rect(x, y, w, h)
+        self.reset(x, y, w, h, moving, rng)
+
+    def reset(self, x, y, w=PLATFORM_WIDTH, h=PLATFORM_HEIGHT, moving=False, rng=random):
+        """Riporta la piattaforma allo stato iniziale (riuso dal pool, vedi pool.py)."""
+        self.rect.update(x, y, w, h)
+        self.fx = float(self.rect.x)  # x in virgola mobile (il Rect tronca gli spostamenti frazionari)
         self.moving = moving
-        self.speed = random.choice([-2,2]) if moving else 0
+        self.speed = rng.choice([-2,2]) if moving else 0
         self.crumbling = False
         self.crumble_timer = None  # None finché non inizia a crollare
+        self.level = None  # livello che l'ha generata, se chi la crea lo indica
 
-    def update(self, volcano_bounds=None):
+    def update(self, volcano_bounds=None, dt=1.0 / BASE_TICK_RATE):
+        k = tick_scale(dt)
         if self.moving:
-            self.rect.x += self.speed
+            self.fx += self.speed * k
+            self.rect.x = int(self.fx)
             # Se sono forniti i limiti del vulcano, usali per il rimbalzo
             if volcano_bounds is not None:
                 left, right = volcano_bounds
                 if self.rect.left < left:
                     self.rect.left = left
+                    self.fx = float(self.rect.x)
                     self.speed *= -1
                 elif self.rect.right > right:
                     self.rect.right = right
+                    self.fx = float(self.rect.x)
                     self.speed *= -1
             else:
                 if self.rect.left < 0 or self.rect.right > SCREEN_WIDTH:
                     self.speed *= -1
-        # Gestione timer crollo
+        # Gestione timer crollo (in frame a 60 Hz)
         if self.crumbling and self.crumble_timer is not None:
-            self.crumble_timer -= 1
+            self.crumble_timer -= k
 
-    def draw(self, screen):
-        # Se crollante, cambia colore
+    @property
+    def state(self):
+        """Stato visivo: normal, crumbling o breaking (timer di crollo avviato)."""
         if self.crumbling:
-            color = (200, 100, 100) if self.crumble_timer is None else (255, 50, 50)
-            self.image.fill(color)
-        else:
-            self.image.fill((100,200,100))
-        screen.blit(self.image, self.rect.topleft)
+            return 'crumbling' if self.crumble_timer is None else 'breaking'
+        return 'normal'
+
+    @property
+    def image(self):
+        # Sprite condiviso con tutte le piattaforme della stessa misura e stato
+        return PLATFORM_RENDERER.sprite(self.rect.width, self.rect.height, self.state)
+
+    def draw(self, screen, y_offset=0):
+        screen.blit(self.image, (self.rect.x, self.rect.y + y_offset))
+
+class PlatformStore:
+    """Piattaforme ordinate per y crescente: indice 0 = la più in alto, -1 = la più in basso.
+
+    Le y sono coordinate del mondo e le piattaforme mobili si muovono solo in orizzontale,
+    quindi l'ordine resta valido: le nuove piattaforme in cima entrano con push_top e quelle
+    uscite dal fondo escono con pop_below, entrambe O(1).
+
+    Ogni aggiunta e rimozione passa da _added/_removed, che chiamano le callback
+    on_added/on_removed (liste condivise con PlatformManager).
+    """
+    def __init__(self, platforms=(), on_added=(), on_removed=()):
+        self._items = deque(sorted(platforms, key=lambda p: p.rect.y))
+        self.version = 0  # incrementato a ogni aggiunta o rimozione
+        self.on_added = on_added
+        self.on_removed = on_removed
+        for p in self._items:
+            self._added(p)
+        # Altezza massima di una piattaforma: serve per le ricerche per fascia di y
+        self.max_height = max((p.rect.height for p in self._items), default=PLATFORM_HEIGHT)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def top(self):
+        """Piattaforma più in alto (y minima) o None."""
+        return self._items[0] if self._items else None
+
+    def bottom(self):
+        """Piattaforma più in basso (y massima) o None."""
+        return self._items[-1] if self._items else None
+
+    def _index_at(self, y):
+        """Primo indice con rect.y >= y (ricerca binaria)."""
+        items = self._items
+        lo, hi = 0, len(items)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if items[mid].rect.y < y:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _added(self, platform):
+        for callback in self.on_added:
+            callback(platform)
+
+    def _removed(self, platform):
+        for callback in self.on_removed:
+            callback(platform)
+
+    def _track_height(self, platform):
+        if platform.rect.height > self.max_height:
+            self.max_height = platform.rect.height
+
+    def push_top(self, platform):
+        """Aggiunge una piattaforma sopra tutte le altre (O(1))."""
+        if self._items and platform.rect.y > self._items[0].rect.y:
+            self.add(platform)
+            return
+        self._track_height(platform)
+        self._items.appendleft(platform)
+        self.version += 1
+        self._added(platform)
+
+    def add(self, platform):
+        """Inserisce una piattaforma a qualsiasi altezza mantenendo l'ordine."""
+        self._track_height(platform)
+        self._items.insert(self._index_at(platform.rect.y), platform)
+        self.version += 1
+        self._added(platform)
+
+    def remove(self, platform):
+        self._items.remove(platform)
+        self.version += 1
+        self._removed(platform)
+
+    def clear(self):
+        """Toglie tutte le piattaforme."""
+        items = list(self._items)
+        self._items.clear()
+        self.version += 1
+        for p in items:
+            self._removed(p)
+
+    def pop_below(self, y):
+        """Rimuove dal fondo le piattaforme con il bordo superiore oltre y. Restituisce quante."""
+        items = self._items
+        removed = 0
+        while items and items[-1].rect.top > y:
+            self._removed(items.pop())
+            removed += 1
+        if removed:
+            self.version += 1
+        return removed
+
+    def in_band(self, top, bottom):
+        """Piattaforme il cui rettangolo interseca la fascia verticale [top, bottom)."""
+        items = self._items
+        i = self._index_at(top - self.max_height + 1)
+        n = len(items)
+        while i < n:
+            p = items[i]
+            if p.rect.top >= bottom:
+                break
+            if p.rect.bottom > top:
+                yield p
+            i += 1
+
 
 class PlatformManager:
-    def __init__(self,num_platforms=10):
-        self.platforms = []
+    """Piattaforme in coordinate del mondo: lo scroll sposta solo la telecamera (camera.py)."""
+    def __init__(self,num_platforms=10, rng=None, camera=None):
+        self.camera = camera if camera is not None else Camera()
+        # Callback(platform) chiamate quando una piattaforma entra o esce (generata, uscita
+        # dal fondo, crollata): per esempio le bolle di magma di CollectibleManager
+        self.on_platform_added = [self._platform_added]
+        self.on_platform_removed = [self._platform_removed]
+        # Piattaforme uscite dal gioco, riusate da new_platform
+        self.pool = ObjectPool(Platform)
+        self.platforms = self._new_store()
+        self.start_platform = None  # piattaforma di partenza dell'ultima generazione
+        self._crumbling = []  # piattaforme con il timer di crollo avviato
+        # Generazione incrementale (vedi start_generation)
+        self.generation_rate = 12  # piattaforme generate per tick
+        self._pending = None
+        # Generatore casuale delle piattaforme (default: modulo random globale)
+        self.rng = rng if rng is not None else random
         # Riduci il numero massimo di piattaforme per aumentare la difficoltà
         self.num_platforms = 10
         # Gap ridotti per aumentare la difficoltà
         self.min_gap = 25  # Distanza minima più bassa (più difficile)
         self.max_gap = 55  # Distanza massima più bassa (più difficile)
+        self.crumble_chance = 0.18  # Probabilità piattaforma crollante nel vulcano
         # Riferimento al background manager per ottenere i limiti del vulcano
         self.background_manager = None
+        # Piattaforme mobili aggiornate in blocco con NumPy (None: update per piattaforma)
+        self.movers = PlatformMovers() if HAVE_NUMPY else None
         
     def set_background_manager(self, background_manager):
         """Imposta il riferimento al background manager per ottenere i limiti del vulcano."""
         self.background_manager = background_manager
     
     def get_volcano_platform_bounds(self, y_position):
-        """Ottiene i limiti per le piattaforme nel vulcano in base alla posizione Y, usando le pareti del background."""
+        """Ottiene i limiti per le piattaforme nel vulcano alla Y (del mondo), usando le pareti del background."""
         if self.background_manager:
-            wall_data = self.background_manager.get_volcano_walls_at_y(y_position)
-            if wall_data:
+            # Stessa tabella delle pareti usata da disegno e collisioni (vedi cone.py)
+            h = self.background_manager.volcano_wall_index(self.camera.to_screen(y_position))
+            if h >= 0:
                 margin = 20
-                return wall_data['left_wall_end'] + margin, wall_data['right_wall_start'] - margin
+                cone = self.background_manager.cone
+                return cone.left[h] + margin, cone.right[h] - margin
             else:
-                # Se wall_data è None, siamo oltre il cratere: blocca la generazione
+                # Nessuna parete: siamo oltre il cratere, blocca la generazione
                 return None, None
         # Fallback ai limiti standard se non c'è il background manager
         return 50, SCREEN_WIDTH - 50
@@ -72,7 +262,7 @@ class PlatformManager:
         """Genera una piattaforma specifica per il vulcano (più stretta) o normale per altri livelli. transition_mix: 0=vecchio livello, 1=nuovo livello"""
         # Se siamo nella fascia di transizione, genera piattaforme miste
         if 0 < transition_mix < 1:
-            if random.random() < transition_mix:
+            if self.rng.random() < transition_mix:
                 # Nuovo livello (stile vulcano)
                 left_bound, right_bound = self.get_volcano_platform_bounds(y)
                 if left_bound is None or right_bound is None:
@@ -83,13 +273,13 @@ class PlatformManager:
                 min_x = left_bound
                 if max_x > min_x:
                     x = max(min_x, min(x, max_x))
-                    return Platform(x, y, w=volcano_width, moving=random.random()<0.1)
+                    return self.new_platform(x, y, w=volcano_width, moving=self.rng.random()<0.1, rng=self.rng)
                 else:
                     center_x = (left_bound + right_bound) // 2 - volcano_width // 2
-                    return Platform(center_x, y, w=volcano_width, moving=False)
+                    return self.new_platform(center_x, y, w=volcano_width, moving=False)
             else:
                 # Vecchio livello (stile crosta)
-                return Platform(x, y, w=PLATFORM_WIDTH, moving=random.random()<0.2)
+                return self.new_platform(x, y, w=PLATFORM_WIDTH, moving=self.rng.random()<0.2, rng=self.rng)
         elif level_name == "Vulcano":
             left_bound, right_bound = self.get_volcano_platform_bounds(y)
             if left_bound is None or right_bound is None:
@@ -100,22 +290,91 @@ class PlatformManager:
             min_x = left_bound
             if max_x > min_x:
                 x = max(min_x, min(x, max_x))
-                return Platform(x, y, w=volcano_width, moving=random.random()<0.1)
+                return self.new_platform(x, y, w=volcano_width, moving=self.rng.random()<0.1, rng=self.rng)
             else:
                 center_x = (left_bound + right_bound) // 2 - volcano_width // 2
-                return Platform(center_x, y, w=volcano_width, moving=False)
+                return self.new_platform(center_x, y, w=volcano_width, moving=False)
         else:
-            return Platform(x, y, w=PLATFORM_WIDTH, moving=random.random()<0.2)
+            return self.new_platform(x, y, w=PLATFORM_WIDTH, moving=self.rng.random()<0.2, rng=self.rng)
 
     def generate_initial_platforms(self, player, level_manager=None, depth_multiplier=6):
-        # Mantieni le piattaforme della Crosta per una fascia di transizione
-        prev_platforms = [p for p in self.platforms if hasattr(p, 'level') and p.level == 'Crosta'] if hasattr(self, 'platforms') else []
-        self.platforms = []
+        """Genera subito tutte le piattaforme del livello (fino a depth_multiplier schermi sopra)."""
+        self.start_generation(player, level_manager, depth_multiplier, lookahead=None)
+
+    def new_platform(self, x, y, w=PLATFORM_WIDTH, h=PLATFORM_HEIGHT, moving=False, rng=random):
+        """Come Platform(...), ma ricicla una piattaforma uscita dal gioco se ce n'è una nel pool."""
+        return self.pool.acquire(x, y, w, h, moving, rng)
+
+    def _platform_added(self, platform):
+        """Callback dello store: una piattaforma mobile nuova entra nelle colonne di movers."""
+        if self.movers is not None:
+            self.movers.added(platform)
+
+    def _platform_removed(self, platform):
+        """Callback dello store: la piattaforma è uscita dal gioco e torna nel pool."""
+        if self.movers is not None:
+            # Via la sua riga: le colonne non scrivono su una piattaforma già riciclata
+            self.movers.removed(platform)
+        if platform.crumble_timer is not None and platform in self._crumbling:
+            self._crumbling.remove(platform)
+        self.pool.release(platform)
+
+    def _new_store(self, platforms=()):
+        return PlatformStore(platforms, on_added=self.on_platform_added,
+                             on_removed=self.on_platform_removed)
+
+    @property
+    def generating(self):
+        """True se una generazione incrementale ha ancora piattaforme da produrre."""
+        return self._pending is not None
+
+    def start_generation(self, player, level_manager=None, depth_multiplier=6, lookahead=SCREEN_HEIGHT):
+        """Avvia la generazione delle piattaforme di un livello.
+
+        Le piattaforme fino a `lookahead` pixel sopra lo schermo vengono create subito; le altre
+        arrivano con advance_generation, qualche piattaforma per tick. lookahead=None: tutte subito.
+        """
+        self._pending = None
+        generator = self._generate_platforms(player, level_manager, depth_multiplier)
+        platforms = [next(generator)]
+        self.start_platform = platforms[0]
+        limit = None if lookahead is None else self.camera.to_world(-lookahead)
+        for platform in generator:
+            platforms.append(platform)
+            if limit is not None and platform.rect.y < limit:
+                self._pending = generator
+                break
+        self.platforms.clear()
+        self.platforms = self._new_store(platforms)
+        self._crumbling = []
+
+    def advance_generation(self, max_platforms=None):
+        """Prosegue la generazione incrementale. Restituisce le piattaforme aggiunte.
+
+        Il budget è un numero di piattaforme per tick e non un tempo: così la stessa partita
+        (seed + input) genera sempre le stesse piattaforme negli stessi tick, anche nei replay.
+        """
+        if self._pending is None:
+            return []
+        added = []
+        for _ in range(max_platforms or self.generation_rate):
+            platform = next(self._pending, None)
+            if platform is None:
+                self._pending = None
+                break
+            self.platforms.push_top(platform)
+            added.append(platform)
+        return added
+
+    def _generate_platforms(self, player, level_manager, depth_multiplier):
+        """Generatore delle piattaforme di un livello, dal basso verso l'alto (prima la piattaforma di partenza).
+
+        Le y sono coordinate del mondo: restano valide anche se la telecamera scrolla mentre
+        la generazione prosegue (vedi advance_generation).
+        """
+        # Altezza massima dei livelli, misurata dalla cima dello schermo all'inizio della generazione
+        screen_top = self.camera.to_world(0)
         current_level = level_manager.get_current_level()["name"] if level_manager else "Mantello"
-        crater_height = None
-        if self.background_manager and hasattr(self.background_manager, 'tiles_per_level'):
-            total_height = self.background_manager.tiles_per_level * SCREEN_HEIGHT
-            crater_height = total_height * 0.9
         start_platform_y = player.y + player.radius + 20
         if current_level == "Vulcano":
             volcano_min_gap = 30
@@ -132,18 +391,14 @@ class PlatformManager:
                     platform_width = 40
                 else:
                     start_platform_x = max(left_bound, min(player.x - platform_width // 2, right_bound - platform_width))
-            start_platform = Platform(start_platform_x, start_platform_y, w=platform_width, moving=random.random()<0.1)
-            start_platform.crumbling = random.random() < 0.18
+            start_platform = self.new_platform(start_platform_x, start_platform_y, w=platform_width, moving=self.rng.random()<0.1, rng=self.rng)
+            start_platform.crumbling = self.rng.random() < self.crumble_chance
             start_platform.level = "Vulcano"
-            self.platforms.append(start_platform)
+            yield start_platform
             current_y = start_platform_y
-            max_depth = -SCREEN_HEIGHT * 8
-            # Mantieni le piattaforme della Crosta per una fascia di 200px sopra il confine
-            for p in prev_platforms:
-                if p.rect.y > current_y - 200:
-                    self.platforms.append(p)
+            max_depth = screen_top - SCREEN_HEIGHT * 8
             while current_y > max_depth:
-                gap = random.randint(volcano_min_gap, volcano_max_gap)
+                gap = self.rng.randint(volcano_min_gap, volcano_max_gap)
                 y = current_y - gap
                 left_bound, right_bound = self.get_volcano_platform_bounds(y)
                 if left_bound is None or right_bound is None:
@@ -151,76 +406,93 @@ class PlatformManager:
                 passage_width = right_bound - left_bound
                 platform_width = min(40, passage_width - 10)
                 # Sfasamento orizzontale casuale
-                offset = random.randint(-30, 30)
+                offset = self.rng.randint(-30, 30)
                 if passage_width < 40 or platform_width < 25:
                     x = int((left_bound + right_bound) // 2 - 20 + offset)
                     platform_width = 40
                 elif passage_width > platform_width + 20:
-                    x = random.randint(int(left_bound + 10), int(right_bound - platform_width - 10)) + offset
+                    x = self.rng.randint(int(left_bound + 10), int(right_bound - platform_width - 10)) + offset
                 else:
                     x = int((left_bound + right_bound) // 2 - platform_width // 2 + offset)
-                platform = Platform(x, y, w=platform_width, moving=random.random()<0.1)
-                platform.crumbling = random.random() < 0.18
+                platform = self.new_platform(x, y, w=platform_width, moving=self.rng.random()<0.1, rng=self.rng)
+                platform.crumbling = self.rng.random() < self.crumble_chance
                 platform.level = "Vulcano"
-                self.platforms.append(platform)
+                yield platform
                 current_y = y
         else:
             start_platform_x = max(50, min(player.x - PLATFORM_WIDTH // 2, SCREEN_WIDTH - PLATFORM_WIDTH - 50))
-            current_level_for_platform = current_level
-            start_platform = self.generate_volcano_platform(start_platform_x, start_platform_y, current_level_for_platform)
-            self.platforms.append(start_platform)
+            yield self.generate_volcano_platform(start_platform_x, start_platform_y, current_level)
             current_y = start_platform_y
-            max_depth = -SCREEN_HEIGHT * depth_multiplier
+            max_depth = screen_top - SCREEN_HEIGHT * depth_multiplier
             while current_y > max_depth:
-                gap = random.randint(self.min_gap, self.max_gap)
+                gap = self.rng.randint(self.min_gap, self.max_gap)
                 y = current_y - gap
-                platform = self.generate_volcano_platform(random.randint(50, SCREEN_WIDTH - PLATFORM_WIDTH - 50), y, current_level)
-                self.platforms.append(platform)
+                yield self.generate_volcano_platform(self.rng.randint(50, SCREEN_WIDTH - PLATFORM_WIDTH - 50),
+                                                     y, current_level)
                 current_y = y
 
-    def update(self, dy, level_manager=None):
+    def _step_movers(self, in_volcano, k):
+        """Equivalente di Platform.update per tutte le piattaforme, con le mobili in blocco."""
+        bm = self.background_manager
+        if not in_volcano:
+            self.movers.step(k)
+        elif bm is None:
+            self.movers.step(k, default_bounds=(50, SCREEN_WIDTH - 50))
+        elif bm.current_index == bm.volcano_level_index:
+            self.movers.step(k, cone=bm.cone, volcano_scroll=bm.volcano_total_scroll, camera_y=self.camera.y)
+        else:
+            self.movers.step(k)  # pareti non ancora attive (dissolvenza in corso)
+        # Timer di crollo: solo le piattaforme con il timer avviato
+        for plat in self._crumbling:
+            plat.crumble_timer -= k
+
+    def update(self, level_manager=None, dt=1.0 / BASE_TICK_RATE):
+        """Fa avanzare le piattaforme di dt, toglie quelle uscite sotto lo schermo e ne genera di nuove.
+
+        Con dt=0 solo rimozione e rigenerazione (dopo uno scroll della telecamera).
+        """
         current_level = level_manager.get_current_level()["name"] if level_manager else "Mantello"
         
-        # Rimuovi piattaforme che sono uscite dallo schermo
-        initial_count = len(self.platforms)
-        removed_platforms = 0
-        for plat in list(self.platforms):
-            plat.rect.y += dy
-            # Se siamo nel vulcano e la piattaforma è mobile, passa i limiti delle pareti
-            if level_manager and level_manager.get_current_level()["name"] == "Vulcano" and plat.moving:
-                left_bound, right_bound = self.get_volcano_platform_bounds(plat.rect.y)
-                if left_bound is not None and right_bound is not None:
-                    plat.update(volcano_bounds=(int(left_bound), int(right_bound)))
-                else:
-                    plat.update()
+        in_volcano = level_manager is not None and current_level == "Vulcano"
+        if dt > 0:
+            if self.movers is not None and self.movers.active(self.platforms):
+                # Le piattaforme mobili avanzano in blocco
+                self._step_movers(in_volcano, tick_scale(dt))
             else:
-                plat.update()
-            if plat.rect.top > SCREEN_HEIGHT:
-                self.platforms.remove(plat)
-                removed_platforms += 1
+                if self.movers is not None:
+                    self.movers.release()
+                for plat in self.platforms:
+                    # Se siamo nel vulcano e la piattaforma è mobile, passa i limiti delle pareti
+                    if in_volcano and plat.moving:
+                        left_bound, right_bound = self.get_volcano_platform_bounds(plat.rect.y)
+                        if left_bound is not None and right_bound is not None:
+                            plat.update(volcano_bounds=(int(left_bound), int(right_bound)), dt=dt)
+                        else:
+                            plat.update(dt=dt)
+                    else:
+                        plat.update(dt=dt)
+        # Rimuovi piattaforme che sono uscite dallo schermo (sono tutte in fondo all'ordine)
+        removed_platforms = self.platforms.pop_below(self.camera.to_world(SCREEN_HEIGHT))
         
-        # Genera nuove piattaforme se necessario (on demand, tutti i livelli)
+        # Genera nuove piattaforme se necessario (on demand, tutti i livelli),
+        # ma non durante una generazione incrementale, che fornisce già quelle in cima
         added_platforms = 0
-        while len(self.platforms) < self.num_platforms:
+        while self._pending is None and len(self.platforms) < self.num_platforms:
             if not self.platforms:
                 # Se non ci sono piattaforme, crea una piattaforma centrale
                 x = SCREEN_WIDTH // 2 - PLATFORM_WIDTH // 2
-                y = -SCREEN_HEIGHT
+                y = self.camera.to_world(-SCREEN_HEIGHT)
             else:
-                highest_y = min(p.rect.y for p in self.platforms)
-                gap = random.randint(self.min_gap, self.max_gap)
-                # Controllo sicurezza: se non ci sono piattaforme raggiungibili nelle ultime 3,
+                highest_y = self.platforms.top().rect.y
+                gap = self.rng.randint(self.min_gap, self.max_gap)
+                # Controllo sicurezza: se nessuna piattaforma sta più di due gap sotto la più alta,
                 # genera una piattaforma raggiungibile
-                recent_platforms = [p for p in self.platforms if p.rect.y > highest_y + self.max_gap * 2]
-                needs_reachable_platform = len(recent_platforms) < 1
+                needs_reachable_platform = self.platforms.bottom().rect.y <= highest_y + self.max_gap * 2
                 y = highest_y - gap
                 # Blocca la generazione oltre il cratere anche in update
-                crater_height = None
-                if self.background_manager and hasattr(self.background_manager, 'tiles_per_level'):
-                    total_height = self.background_manager.tiles_per_level * SCREEN_HEIGHT
-                    crater_height = total_height * 0.9
+                crater_height = self.background_manager.cone.crater_height if self.background_manager else None
                 if current_level == "Vulcano" and crater_height is not None:
-                    absolute_height = self.background_manager.volcano_total_scroll + (SCREEN_HEIGHT - y)
+                    absolute_height = self.background_manager.volcano_total_scroll + (SCREEN_HEIGHT - self.camera.to_screen(y))
                     # Genera piattaforme fino al cratere, ignorando i limiti delle pareti
                     if absolute_height >= crater_height:
                         break
@@ -230,12 +502,12 @@ class PlatformManager:
                     if left_bound is None or right_bound is None or right_bound - left_bound < 40:
                         x = SCREEN_WIDTH // 2 - PLATFORM_WIDTH // 2
                     else:
-                        x = random.randint(int(left_bound + 5), int(right_bound - PLATFORM_WIDTH - 5))
+                        x = self.rng.randint(int(left_bound + 5), int(right_bound - PLATFORM_WIDTH - 5))
                     # Probabilità piattaforma crollante
-                    is_crumbling = random.random() < 0.18  # 18% di probabilità
+                    is_crumbling = self.rng.random() < self.crumble_chance
                     platform = self.generate_volcano_platform(x, y, current_level)
                     platform.crumbling = is_crumbling
-                    self.platforms.append(platform)
+                    self.platforms.push_top(platform)
                     added_platforms += 1
                     continue
                 else:
@@ -244,52 +516,66 @@ class PlatformManager:
                         max_reach = 200
                         x_start = max(50, center_x - max_reach)
                         x_end = min(SCREEN_WIDTH - PLATFORM_WIDTH - 50, center_x + max_reach)
-                        x = random.randint(int(x_start), int(x_end))
+                        x = self.rng.randint(int(x_start), int(x_end))
                     else:
-                        x = random.randint(50, SCREEN_WIDTH - PLATFORM_WIDTH - 50)
+                        x = self.rng.randint(50, SCREEN_WIDTH - PLATFORM_WIDTH - 50)
             new_platform = self.generate_volcano_platform(x, y, current_level)
-            self.platforms.append(new_platform)
+            self.platforms.push_top(new_platform)
             added_platforms += 1
         # Debug: stampa informazioni solo se ci sono stati cambiamenti significativi
         if removed_platforms > 2 or added_platforms > 2:
-            highest_y = min(p.rect.y for p in self.platforms) if self.platforms else "N/A"
+            highest_y = self.platforms.top().rect.y if self.platforms else "N/A"
             print(f"Platforms: removed={removed_platforms}, added={added_platforms}, total={len(self.platforms)}, highest_y={highest_y}")
 
+    def add_platform(self, platform):
+        """Aggiunge una piattaforma a qualsiasi altezza."""
+        self.platforms.add(platform)
+
     def check_collision(self, player):
-        from audio_manager import AudioManager
-        import os
+        """Atterraggio del player sulle piattaforme (collisione continua).
+
+        Invece di confrontare solo la posizione di fine tick, segue il bordo inferiore del player
+        lungo tutto lo spostamento del tick (da prev_y a y): atterra sulla prima piattaforma il cui
+        bordo superiore (più LANDING_TOLERANCE) viene attraversato, controllando la sovrapposizione
+        orizzontale nel punto dell'attraversamento. Così nessuna caduta veloce o tick lungo fa
+        passare il player attraverso una piattaforma. I candidati vengono dallo store ordinato per y.
+        """
         player.on_ground = False  # Reset dello stato a terra
-        for p in self.platforms:
-            if player.get_rect().colliderect(p.rect):
-                # Calcola la sovrapposizione
-                player_bottom = player.y + player.radius
-                player_top = player.y - player.radius
-                player_left = player.x - player.radius
-                player_right = player.x + player.radius
+        if player.vy >= 0:  # Solo il player che cade o è fermo può atterrare
+            radius = player.radius
+            start_bottom = player.prev_y + radius
+            end_bottom = player.y + radius
+            fall = end_bottom - start_bottom
+            start_x, dx = player.prev_x, player.x - player.prev_x
+            # Dall'alto in basso: la prima piattaforma valida è la prima attraversata
+            for p in self.platforms.in_band(start_bottom - LANDING_TOLERANCE, end_bottom + 1):
                 platform_top = p.rect.top
-                platform_bottom = p.rect.bottom
-                platform_left = p.rect.left
-                platform_right = p.rect.right
-                # Controlla se il player sta atterrando sulla piattaforma dall'alto
-                if (player.vy >= 0 and  # Player che cade o fermo
-                    player_bottom >= platform_top and  # Player sopra la piattaforma
-                    player_bottom <= platform_top + 15 and  # Margine di tolleranza
-                    player_right > platform_left + 5 and  # Sovrapposizione orizzontale
-                    player_left < platform_right - 5):
+                if not (platform_top <= end_bottom and start_bottom <= platform_top + LANDING_TOLERANCE):
+                    continue
+                # Frazione del tick in cui il bordo inferiore raggiunge la piattaforma
+                t = (platform_top - start_bottom) / fall if platform_top > start_bottom else 0.0
+                x = start_x + dx * t
+                # Sovrapposizione orizzontale (margine di 5 pixel) nel punto di contatto
+                if x + radius > p.rect.left + 5 and x - radius < p.rect.right - 5:
                     # Posiziona il player esattamente sulla piattaforma e fallo saltare
-                    player.y = platform_top - player.radius
+                    player.y = platform_top - radius
                     player.vy = -player.jump_strength
                     player.on_ground = True
                     # Suono salto automatico
                     if hasattr(player, 'play_jump_sound'):
                         player.play_jump_sound()
                     # Se la piattaforma è crollante, avvia timer crollo
-                    if hasattr(p, 'crumbling') and p.crumbling and p.crumble_timer is None:
+                    if p.crumbling and p.crumble_timer is None:
                         p.crumble_timer = 30  # frame di attesa prima del crollo (~0.5s a 60fps)
+                        self._crumbling.append(p)
                     break  # Esci dal loop una volta trovata una collisione
-        # Rimuovi piattaforme crollate
-        self.platforms = [plat for plat in self.platforms if not (hasattr(plat, 'crumbling') and plat.crumbling and plat.crumble_timer is not None and plat.crumble_timer <= 0)]
+        # Rimuovi piattaforme crollate (solo quelle con il timer avviato); quelle uscite
+        # dal fondo prima di crollare sono già state tolte da _crumbling (_platform_removed)
+        if self._crumbling:
+            for plat in [p for p in self._crumbling if p.crumble_timer <= 0]:
+                self.platforms.remove(plat)
 
-    def draw(self,screen):
-        for p in self.platforms:
-            p.draw(screen)
+    def draw(self, screen, y_offset=0):
+        """y_offset: offset della telecamera (camera.offset), da sommare alle y del mondo."""
+        # Solo le piattaforme nella fascia visibile dello schermo, in un unico blits
+        PLATFORM_RENDERER.draw(screen, self.platforms.in_band(-y_offset, SCREEN_HEIGHT - y_offset), y_offset)
@@ -1,5 +1,7 @@
 import pygame, math, random
-from constants import SCREEN_WIDTH, PLAYER_RADIUS
+from constants import SCREEN_WIDTH, PLAYER_RADIUS, BASE_TICK_RATE
+from timer_system import tick_scale, lerp
+from sprite_cache import circle_sprite
 
 def lerp_color(c1, c2, t):
     return tuple(int(a + (b - a) * t) for a, b in zip(c1, c2))
@@ -13,9 +15,14 @@ class WobblyBall:
                 __main__.audio_manager.play('jump')
         except Exception as e:
             print(f"DEBUG: errore suono salto automatico: {e}")
-    def __init__(self, x, y, radius=PLAYER_RADIUS, color=(255,165,0)):
+    def __init__(self, x, y, radius=PLAYER_RADIUS, color=(255,165,0), rng=None):
+        # Generatore casuale delle particelle (default: modulo random globale)
+        self.rng = rng if rng is not None else random
         self.x = float(x)
         self.y = float(y)
+        # Posizione al tick precedente (per il rendering interpolato)
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.vx = 0.0
         self.vy = 0.0
         self.radius = radius
@@ -39,19 +46,30 @@ class WobblyBall:
     def get_rect(self):
         return pygame.Rect(self.x - self.radius, self.y - self.radius, self.radius*2, self.radius*2)
 
-    def apply_input(self, keys):
+    def save_previous_state(self):
+        """Memorizza la posizione all'inizio del tick."""
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    def render_position(self, alpha=1.0):
+        """Posizione interpolata tra gli ultimi due tick di simulazione."""
+        return lerp(self.prev_x, self.x, alpha), lerp(self.prev_y, self.y, alpha)
+
+    def apply_input(self, input_state, dt=1.0 / BASE_TICK_RATE):
+        """Applica i comandi del tick (un InputState, vedi game_session.py)."""
+        k = tick_scale(dt)
         accel = 1.8  # Ancora più reattivo
         max_speed = 12  # Più veloce a destra/sinistra
         friction = 0.85
         if 'thermal_boost' in self.active_powerups:
             accel *= 1.5
             max_speed *= 1.3
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            self.vx = max(-max_speed, self.vx - accel)
-        elif keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            self.vx = min(max_speed, self.vx + accel)
+        if input_state.left:
+            self.vx = max(-max_speed, self.vx - accel * k)
+        elif input_state.right:
+            self.vx = min(max_speed, self.vx + accel * k)
         else:
-            self.vx *= friction
+            self.vx *= friction ** k
 
     def jump(self):
         base_jump = -self.jump_strength
@@ -60,13 +78,15 @@ class WobblyBall:
         self.vy = base_jump
 
     def update_physics(self, dt, gravity=0.8):
+        # Le costanti sono "per frame a 60 Hz": scala in base al dt del tick
+        k = tick_scale(dt)
         max_fall_speed = 15
         if 'volcanic_time' in self.active_powerups:
             gravity *= 0.5
             max_fall_speed *= 0.7
-        self.vy = min(self.vy + gravity, max_fall_speed)
-        self.x += self.vx
-        self.y += self.vy
+        self.vy = min(self.vy + gravity * k, max_fall_speed)
+        self.x += self.vx * k
+        self.y += self.vy * k
 
         # Bordo orizzontale
         bounce_factor = 0.7
@@ -86,15 +106,15 @@ class WobblyBall:
         if abs(self.vx) > 0.5 or abs(self.vy) > 0.5:
             for _ in range(1):
                 self.particles.append([
-                    self.x + random.uniform(-4,4),
-                    self.y + random.uniform(-4,4),
-                    random.uniform(1.8,3.6),
-                    random.randint(18,34)
+                    self.x + self.rng.uniform(-4,4),
+                    self.y + self.rng.uniform(-4,4),
+                    self.rng.uniform(1.8,3.6),
+                    self.rng.randint(18,34)
                 ])
         for p in self.particles:
-            p[1] += 1.5
-            p[2] *= 0.96
-            p[3] -= 1
+            p[1] += 1.5 * k
+            p[2] *= 0.96 ** k
+            p[3] -= k
         self.particles = [p for p in self.particles if p[3] > 0 and p[2] > 0.5]
 
     def update_powerups(self, dt):
@@ -112,7 +132,7 @@ class WobblyBall:
         if self.invulnerable_time > 0:
             self.invulnerable_time -= dt
 
-    def draw_trail(self, surf):
+    def draw_trail(self, surf, y_offset=0):
         if not self.trail:
             return
         L = len(self.trail)
@@ -124,20 +144,17 @@ class WobblyBall:
                 col = lerp_color((255,0,0),(10,10,20),(t-0.5)*2)
             alpha = int(255 * (1 - t))
             size = int(self.radius * (0.5 + 0.5 * (1 - t)))
-            s = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*col, alpha), (size, size), size)
-            surf.blit(s, (tx - size, ty - size))
+            surf.blit(circle_sprite(size, col, alpha), (tx - size, ty - size + y_offset))
 
-    def draw_particles(self, surf):
+    def draw_particles(self, surf, y_offset=0):
         for p in self.particles:
             alpha = max(0,int(255*(p[3]/34)))
             r = max(1,int(p[2]))
-            s = pygame.Surface((r*2,r*2),pygame.SRCALPHA)
-            pygame.draw.circle(s,(255,180,60,alpha),(r,r),r)
-            surf.blit(s,(p[0]-r,p[1]-r))
+            surf.blit(circle_sprite(r,(255,180,60),alpha),(p[0]-r,p[1]-r+y_offset))
 
-    def draw_wobbly(self,surf,t):
-        cx,cy = int(self.x),int(self.y)
+    def draw_wobbly(self,surf,t,alpha=1.0,y_offset=0):
+        rx,ry = self.render_position(alpha)
+        cx,cy = int(rx),int(ry+y_offset)
         points=[]
         segments=32
         speed_factor=math.hypot(self.vx,self.vy)
@@ -0,0 +1,51 @@
+"""
+Pool di oggetti riciclabili per le entità che nascono e muoiono di continuo (piattaforme,
+nemici, bolle di magma).
+
+Un oggetto uscito dal gioco torna nel pool con release(); acquire() lo riporta allo stato
+iniziale con obj.reset(*args), che ha la stessa firma del costruttore e consuma il generatore
+casuale nello stesso ordine, invece di crearne uno nuovo. Così il numero di allocazioni (e le
+pause del garbage collector) restano piatti anche in partite lunghe.
+
+I liberi sono divisi per chiave: per esempio i nemici per minerale, così un nemico riciclato
+tiene l'immagine già disegnata.
+"""
+
+
+class ObjectPool:
+    def __init__(self, factory, max_free=64):
+        self.factory = factory    # factory(*args): nuovo oggetto quando il pool è vuoto
+        self.max_free = max_free  # liberi tenuti per chiave; gli altri vanno al garbage collector
+        self._free = {}           # chiave -> lista di oggetti liberi
+        self.hits = 0             # acquire serviti con un oggetto riciclato
+        self.misses = 0           # acquire che hanno dovuto crearne uno nuovo
+
+    def acquire(self, *args, key=None):
+        free = self._free.get(key)
+        if free:
+            self.hits += 1
+            obj = free.pop()
+            obj.reset(*args)
+            return obj
+        self.misses += 1
+        return self.factory(*args)
+
+    def release(self, obj, key=None):
+        """Rimette obj tra i liberi: chi lo rilascia non deve più usarlo."""
+        free = self._free.setdefault(key, [])
+        if len(free) < self.max_free:
+            free.append(obj)
+
+    @property
+    def free_count(self):
+        return sum(len(free) for free in self._free.values())
+
+    def stats(self):
+        """Contatori del pool: riciclati, creati, liberi e percentuale di riuso."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'free': self.free_count,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
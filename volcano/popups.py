@@ -0,0 +1,109 @@
+"""
+Testi che salgono e si dissolvono (+200 delle bolle, penalità dei nemici), gestiti in un unico posto.
+
+Ogni messaggio viene renderizzato una sola volta; i popup stanno in un pool di slot (pool.py)
+diviso per messaggio, così uno slot riusato ha già la sua superficie e la dissolvenza è solo un
+set_alpha su quella. I popup hanno una posizione propria nel mondo: l'entità che li ha generati
+può sparire (bolla raccolta, nemico uscito dallo schermo) senza interrompere il testo. Il disegno
+è un unico blits per tutti i popup attivi.
+"""
+from fonts import get_font, render_text
+from pool import ObjectPool
+
+POPUP_DURATION = 1.0   # secondi prima che il testo scompaia
+POPUP_RISE_SPEED = 30  # pixel al secondo verso l'alto
+POPUP_FONT_SIZE = 32
+
+
+class Popup:
+    """Uno slot: superficie del messaggio (propria, per il set_alpha) e stato dell'animazione."""
+    def __init__(self, x, y, group=None, owner=None):
+        self.key = None      # messaggio (testo, colore) dello slot
+        self.surface = None  # assegnata da PopupManager quando lo slot riceve il messaggio
+        self.reset(x, y, group, owner)
+
+    def reset(self, x, y, group=None, owner=None):
+        """Riavvia l'animazione in (x, y) del mondo; messaggio e superficie restano quelli dello slot."""
+        self.x = x
+        self.y = y
+        self.group = group  # per chiedere se ci sono popup attivi di un certo tipo (active)
+        self.owner = owner  # chi l'ha generato: un nuovo show con lo stesso owner lo riavvia
+        self.timer = 0.0
+        self.rise = 0.0
+
+    @property
+    def alpha(self):
+        return max(0, 255 - int(self.timer * 255))
+
+
+class PopupManager:
+    def __init__(self, capacity=32):
+        self.capacity = capacity  # popup attivi al massimo: oltre, si riusa il più vecchio
+        self.popups = []          # attivi, dal più vecchio al più recente
+        # Slot liberi per messaggio (text, colore): uno slot riusato non va ridisegnato
+        self.pool = ObjectPool(Popup, max_free=8)
+
+    def __len__(self):
+        return len(self.popups)
+
+    @staticmethod
+    def _message(text, color):
+        # Copia del testo renderizzato: ogni slot applica il proprio alpha
+        return render_text(get_font(POPUP_FONT_SIZE), text, color).copy()
+
+    def preload(self, text, color, count=1):
+        """Prepara `count` slot liberi per un messaggio, prima che serva durante il gioco."""
+        key = (text, tuple(color))
+        for _ in range(count):
+            popup = Popup(0, 0)
+            popup.key, popup.surface = key, self._message(text, color)
+            self.pool.release(popup, key=key)
+
+    def show(self, text, x, y, color, group=None, owner=None):
+        """Mostra text con l'angolo in alto a sinistra in (x, y) del mondo.
+
+        Con owner, un popup ancora attivo dello stesso owner viene riavviato invece di duplicarlo.
+        """
+        key = (text, tuple(color))
+        if owner is not None:
+            for popup in self.popups:
+                if popup.owner is owner and popup.key == key:
+                    popup.reset(x, y, group, owner)
+                    return popup
+        if len(self.popups) >= self.capacity:
+            self._release(self.popups[0])
+        popup = self.pool.acquire(x, y, group, owner, key=key)
+        if popup.surface is None:
+            popup.key, popup.surface = key, self._message(text, color)
+        self.popups.append(popup)
+        return popup
+
+    def _release(self, popup):
+        self.popups.remove(popup)
+        popup.owner = None
+        self.pool.release(popup, key=popup.key)
+
+    def update(self, dt):
+        """Fa salire i popup e restituisce al pool quelli finiti."""
+        for popup in self.popups:
+            popup.timer += dt
+            popup.rise -= POPUP_RISE_SPEED * dt
+        for popup in [p for p in self.popups if p.timer > POPUP_DURATION]:
+            self._release(popup)
+
+    def active(self, group):
+        """True se c'è almeno un popup attivo del gruppo."""
+        return any(popup.group == group for popup in self.popups)
+
+    def clear(self):
+        for popup in list(self.popups):
+            self._release(popup)
+
+    def draw(self, surface, y_offset=0):
+        """Disegna tutti i popup in un'unica chiamata (y_offset: offset della telecamera)."""
+        if not self.popups:
+            return
+        for popup in self.popups:
+            popup.surface.set_alpha(popup.alpha)
+        surface.blits([(popup.surface, (popup.x, popup.y + popup.rise + y_offset))
+                       for popup in self.popups], doreturn=False)
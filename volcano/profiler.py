@@ -0,0 +1,82 @@
+"""
+Misura leggera del tempo di ogni frame, suddiviso per sezioni.
+
+Il profiler funziona come un cronometro a giri: lap("update.platforms") attribuisce a
+quella sezione il tempo trascorso dal lap precedente. Il prefisso prima del punto è la
+fase del frame (events, update, draw, flip), il resto è il sottosistema.
+Ogni lap costa una chiamata a perf_counter e un'addizione in un dict.
+
+Il codice di gioco chiama sempre i lap: quando la misura non serve si usa NULL_PROFILER,
+i cui metodi non fanno nulla.
+"""
+from collections import deque
+from time import perf_counter
+
+
+def phase_of(section):
+    """Fase di una sezione ("update.platforms" -> "update")."""
+    return section.split('.', 1)[0]
+
+
+class FrameProfiler:
+    """Tempi per sezione del frame corrente e storico degli ultimi frame."""
+    enabled = True
+
+    def __init__(self, history=600):
+        self.sections = {}               # sezione -> secondi nel frame corrente
+        self.frame_time = 0.0            # durata dell'ultimo frame chiuso
+        self.history = deque(maxlen=history)  # (durata, sezioni) dei frame chiusi; history=None: illimitato
+        self._frame_start = self._last = perf_counter()
+
+    def begin_frame(self):
+        self.sections = {}
+        self._frame_start = self._last = perf_counter()
+
+    def lap(self, section):
+        now = perf_counter()
+        sections = self.sections
+        sections[section] = sections.get(section, 0.0) + (now - self._last)
+        self._last = now
+
+    def skip(self):
+        """Esclude dal frame il tempo trascorso dall'ultimo lap (es. lavoro del benchmark stesso)."""
+        now = perf_counter()
+        self._frame_start += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        """Chiude il frame e restituisce (durata, sezioni)."""
+        self.frame_time = perf_counter() - self._frame_start
+        record = (self.frame_time, self.sections)
+        self.history.append(record)
+        return record
+
+    def phases(self, sections=None):
+        """Somma le sezioni per fase."""
+        totals = {}
+        for section, seconds in (self.sections if sections is None else sections).items():
+            phase = phase_of(section)
+            totals[phase] = totals.get(phase, 0.0) + seconds
+        return totals
+
+
+class NullProfiler:
+    """Profiler disattivato: stessi metodi di FrameProfiler, nessuna misura."""
+    enabled = False
+    sections = {}
+    frame_time = 0.0
+
+    def begin_frame(self):
+        pass
+
+    def lap(self, section):
+        pass
+
+    def skip(self):
+        pass
+
+    def end_frame(self):
+        return 0.0, self.sections
+
+
+NULL_PROFILER = NullProfiler()
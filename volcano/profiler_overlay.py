@@ -0,0 +1,139 @@
+"""
+Overlay dei tempi di frame (F3): medie mobili per sezione, sparkline del tempo di frame
+e numero di entità attive. Legge i dati raccolti da FrameProfiler (vedi profiler.py).
+
+Il testo viene ridisegnato solo REFRESH_INTERVAL volte al secondo; a ogni frame si
+blitta il pannello già pronto e si traccia la sparkline.
+"""
+import time
+import pygame
+from constants import FPS, SHOW_PROFILER_OVERLAY
+from profiler import phase_of
+from sprite_cache import CIRCLE_SPRITES
+from fonts import get_font, TEXTS
+
+PANEL_BG = (0, 0, 0, 170)
+TEXT_COLOR = (230, 230, 230)
+PHASE_COLOR = (255, 200, 80)
+SPARK_COLOR = (80, 220, 120)
+BUDGET_COLOR = (220, 60, 60)
+
+
+class ProfilerOverlay:
+    HOTKEY = pygame.K_F3
+    WINDOW = 120              # frame usati per medie e sparkline
+    REFRESH_INTERVAL = 0.25   # secondi tra due aggiornamenti del testo
+    SPARK_HEIGHT = 60
+    SPARK_MAX_MS = 2 * 1000.0 / FPS  # fondo scala della sparkline (due frame di budget)
+
+    def __init__(self, profiler, position=(10, 70)):
+        self.profiler = profiler
+        self.position = position
+        self.visible = SHOW_PROFILER_OVERLAY
+        self.font = None
+        self.panel = None
+        self._next_refresh = 0.0
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._next_refresh = 0.0
+
+    def handle_event(self, event):
+        """Gestisce il tasto dell'overlay. Restituisce True se l'evento è stato consumato."""
+        if event.type == pygame.KEYDOWN and event.key == self.HOTKEY:
+            self.toggle()
+            return True
+        return False
+
+    @staticmethod
+    def entity_counts(session):
+        """Entità attive nella partita (piattaforme, nemici, bolle, particelle)."""
+        if session is None or session.player is None:
+            return {}
+        fountain = session.victory.fountain
+        return {
+            'piattaforme': len(session.platform_manager.platforms),
+            'nemici': len(session.enemy_manager.enemies),
+            'bolle': len(session.collectible_manager),
+            'testi': len(session.popups),
+            'particelle fontana': len(fountain) if fountain is not None else 0,
+            'particelle goccia': len(session.player.particles),
+        }
+
+    def _averages(self):
+        """Tempo medio (ms) di frame e di ogni sezione sugli ultimi WINDOW frame."""
+        history = self.profiler.history
+        frames = list(history)[-self.WINDOW:]
+        if not frames:
+            return 0.0, {}
+        totals = {}
+        frame_total = 0.0
+        for frame_time, sections in frames:
+            frame_total += frame_time
+            for section, seconds in sections.items():
+                totals[section] = totals.get(section, 0.0) + seconds
+        n = len(frames)
+        return frame_total * 1000.0 / n, {section: seconds * 1000.0 / n for section, seconds in totals.items()}
+
+    def _refresh(self, session, fps):
+        if self.font is None:
+            self.font = get_font(20)
+        frame_ms, sections = self._averages()
+        phases = {}
+        for section, ms in sections.items():
+            phases.setdefault(phase_of(section), []).append((ms, section))
+
+        lines = [(f"frame {frame_ms:.2f} ms" + (f"  ({fps:.0f} fps)" if fps else ""), PHASE_COLOR)]
+        for phase, items in sorted(phases.items(), key=lambda kv: -sum(ms for ms, _ in kv[1])):
+            lines.append((f"{phase} {sum(ms for ms, _ in items):.2f} ms", PHASE_COLOR))
+            if len(items) > 1 or items[0][1] != phase:
+                for ms, section in sorted(items, reverse=True):
+                    lines.append((f"   {section.split('.', 1)[-1]} {ms:.2f}", TEXT_COLOR))
+        for name, count in self.entity_counts(session).items():
+            lines.append((f"{name}: {count}", TEXT_COLOR))
+        if session is not None:
+            for name, stats in session.pool_stats().items():
+                lines.append((f"pool {name}: {stats['hits']} riusi, {stats['misses']} nuovi, {stats['free']} liberi",
+                              TEXT_COLOR))
+        sprites = CIRCLE_SPRITES.stats()
+        lines.append((f"sprite cerchi: {sprites['hit_rate']:.0%} riusi, {sprites['size']} in cache, "
+                      f"{sprites['evictions']} scartati", TEXT_COLOR))
+        texts = TEXTS.stats()
+        lines.append((f"testi: {texts['hit_rate']:.0%} riusi, {texts['size']} in cache, "
+                      f"{texts['evictions']} scartati", TEXT_COLOR))
+
+        rendered = [self.font.render(text, True, color) for text, color in lines]
+        line_height = self.font.get_linesize()
+        width = max(self.WINDOW * 2, max(s.get_width() for s in rendered)) + 12
+        height = len(rendered) * line_height + self.SPARK_HEIGHT + 18
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill(PANEL_BG)
+        for i, surf in enumerate(rendered):
+            panel.blit(surf, (6, 6 + i * line_height))
+        self.panel = panel
+        self._spark_top = 6 + len(rendered) * line_height + 6
+
+    def _draw_sparkline(self, screen):
+        x0 = self.position[0] + 6
+        bottom = self.position[1] + self._spark_top + self.SPARK_HEIGHT
+        scale = self.SPARK_HEIGHT / self.SPARK_MAX_MS
+        budget_y = bottom - int((1000.0 / FPS) * scale)
+        pygame.draw.line(screen, BUDGET_COLOR, (x0, budget_y), (x0 + self.WINDOW * 2, budget_y))
+        history = self.profiler.history
+        start = max(0, len(history) - self.WINDOW)
+        points = []
+        for i in range(start, len(history)):
+            ms = min(history[i][0] * 1000.0, self.SPARK_MAX_MS)
+            points.append((x0 + (i - start) * 2, bottom - int(ms * scale)))
+        if len(points) > 1:
+            pygame.draw.lines(screen, SPARK_COLOR, False, points)
+
+    def draw(self, screen, session=None, fps=None):
+        if not self.visible:
+            return
+        now = time.perf_counter()
+        if self.panel is None or now >= self._next_refresh:
+            self._refresh(session, fps)
+            self._next_refresh = now + self.REFRESH_INTERVAL
+        screen.blit(self.panel, self.position)
+        self._draw_sparkline(screen)
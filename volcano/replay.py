@@ -0,0 +1,134 @@
+"""
+Registrazione e riproduzione compatta degli input di una partita.
+
+Una partita è determinata dal seed e dalla sequenza di input per tick (vedi rng.py),
+quindi basta salvare questi due elementi per riprodurla esattamente.
+
+Formato del file (little endian):
+    intestazione: b"VRPL", versione (u8), tick al secondo (u16), seed (i64)
+    corpo:        sequenza di "run" = lunghezza (varint LEB128) + maschera di input (u8)
+
+Ogni run copre i tick consecutivi con la stessa maschera: tenere premuto un tasto per
+un secondo costa 2 byte. I run vengono scritti appena si chiudono, quindi la registrazione
+non tiene nulla in memoria e un file interrotto resta leggibile fino all'ultimo run completo.
+"""
+import struct
+from constants import SIM_TICK_RATE
+from game_session import InputState
+
+MAGIC = b"VRPL"
+VERSION = 1
+HEADER = struct.Struct("<4sBHq")
+REPLAY_EXTENSION = ".vrp"
+
+
+def encode_varint(value):
+    """Intero non negativo in varint LEB128 (7 bit per byte)."""
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def decode_varint(data, pos):
+    """Legge un varint da data[pos:]. Restituisce (valore, nuova posizione) o None se troncato."""
+    value = 0
+    shift = 0
+    while pos < len(data):
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+    return None
+
+
+class ReplayWriter:
+    """Registra gli input di una partita tick per tick."""
+
+    def __init__(self, path, seed, tick_rate=SIM_TICK_RATE):
+        self.path = path
+        self.seed = seed
+        self.ticks = 0
+        self._mask = None
+        self._run = 0
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, tick_rate, seed))
+
+    def record(self, input_state):
+        """Aggiunge l'input di un tick: costa un confronto finché i tasti non cambiano."""
+        mask = input_state.mask
+        self.ticks += 1
+        if mask == self._mask:
+            self._run += 1
+            return
+        self._write_run()
+        self._mask = mask
+        self._run = 1
+
+    def _write_run(self):
+        if self._run:
+            self._file.write(encode_varint(self._run) + bytes((self._mask,)))
+
+    def close(self):
+        if self._file is None:
+            return
+        self._write_run()
+        self._run = 0
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Replay:
+    """Replay caricato da file: seed, tick al secondo e run (lunghezza, maschera)."""
+
+    def __init__(self, seed, tick_rate, runs):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.runs = runs
+
+    @property
+    def ticks(self):
+        return sum(count for count, _ in self.runs)
+
+    def inputs(self):
+        """Generatore degli InputState tick per tick (un oggetto condiviso per maschera)."""
+        states = {}
+        for count, mask in self.runs:
+            state = states.get(mask)
+            if state is None:
+                state = states[mask] = InputState.from_mask(mask)
+            for _ in range(count):
+                yield state
+
+
+def load_replay(path):
+    """Carica un file di replay. Solleva ValueError se il file non è un replay valido."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path}: file di replay troppo corto")
+    magic, version, tick_rate, seed = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: non è un file di replay")
+    if version != VERSION:
+        raise ValueError(f"{path}: versione di replay non supportata ({version})")
+    runs = []
+    pos = HEADER.size
+    while pos < len(data):
+        decoded = decode_varint(data, pos)
+        if decoded is None or decoded[1] >= len(data):
+            break  # ultimo run troncato (registrazione interrotta)
+        count, pos = decoded
+        runs.append((count, data[pos]))
+        pos += 1
+    return Replay(seed, tick_rate, runs)
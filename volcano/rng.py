@@ -0,0 +1,25 @@
+"""
+Flussi casuali indipendenti per sottosistema, derivati da un unico seed della sessione.
+
+Ogni sottosistema estrae numeri solo dal proprio flusso: se uno di essi cambia il numero
+di estrazioni (es. più particelle), gli altri producono comunque la stessa sequenza.
+"""
+import random
+
+SUBSYSTEMS = ('platforms', 'enemies', 'collectibles', 'fountain', 'player')
+
+
+class RngStreams:
+    """Un random.Random per sottosistema, accessibile come attributo (rng.platforms, rng.enemies, ...)."""
+
+    def __init__(self, seed=None):
+        self.reseed(seed)
+
+    def reseed(self, seed=None):
+        """Rigenera tutti i flussi. Con seed=None il seed principale viene estratto a caso."""
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+        self.seed = seed
+        for name in SUBSYSTEMS:
+            # Seed stringa: Random lo converte con sha512, stabile tra processi e versioni di Python
+            setattr(self, name, random.Random(f"volcano:{seed}:{name}"))
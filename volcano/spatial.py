@@ -0,0 +1,131 @@
+"""
+Griglia spaziale uniforme (spatial hash) per le collisioni del player con nemici e collectibles.
+Le piattaforme non ci sono: l'atterraggio è una collisione continua lungo tutto lo spostamento
+del tick, con i candidati presi dallo store ordinato per y (PlatformManager.check_collision).
+
+Ogni oggetto è registrato, nel livello (layer) del suo manager, nelle celle CELL_SIZE x CELL_SIZE
+toccate dal suo rettangolo, in coordinate del mondo: con la telecamera (camera.py) lo scroll non
+sposta niente, quindi vanno aggiornati solo gli oggetti che si muovono davvero. Le bolle delle
+piattaforme mobili vanno solo in orizzontale dentro l'area di gioco: si registrano una volta su
+tutta la riga (insert_row) e non vanno più toccate.
+
+Il player fa una sola query per tick sul proprio intorno; ogni manager legge dal risultato
+solo il proprio layer, invece di scorrere tutti i suoi oggetti.
+"""
+from constants import SCREEN_WIDTH
+
+CELL_SIZE = 128        # lato di una cella: circa 12 colonne e 6 righe per schermo
+NEIGHBOR_MARGIN = 48   # margine della query del player: copre gli spostamenti tra la query e i controlli
+
+
+def neighborhood(player, margin=NEIGHBOR_MARGIN):
+    """Rettangolo del player allargato di `margin` pixel per lato."""
+    return player.get_rect().inflate(2 * margin, 2 * margin)
+
+
+class Neighborhood:
+    """Risultato di una query: le celle toccate da un rettangolo.
+
+    Ogni lettura usa il contenuto attuale delle celle, quindi vede anche gli oggetti aggiunti,
+    spostati o tolti dopo la query (per esempio le bolle delle piattaforme generate più avanti
+    nello stesso tick).
+    """
+    __slots__ = ('_cells', '_span')
+
+    def __init__(self, cells, span):
+        self._cells = cells
+        self._span = span
+
+    def layer(self, layer):
+        """Oggetti del layer nelle celle della query, senza doppioni."""
+        cells = self._cells
+        cx0, cy0, cx1, cy1 = self._span
+        if cx0 == cx1 and cy0 == cy1:
+            return list(cells.get((layer, cx0, cy0), ()))
+        found = {}
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = cells.get((layer, cx, cy))
+                if bucket:
+                    found.update(dict.fromkeys(bucket))
+        return list(found)
+
+
+class SpatialGrid:
+    """Celle -> oggetti registrati. Le query restituiscono candidati: il test preciso resta ai manager."""
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells = {}   # (layer, cx, cy) -> lista di oggetti
+        self._spans = {}   # oggetto -> (layer, cx0, cy0, cx1, cy1), le celle che occupa
+
+    def __len__(self):
+        return len(self._spans)
+
+    def __contains__(self, obj):
+        return obj in self._spans
+
+    def _link(self, obj, layer, span):
+        cells = self._cells
+        cx0, cy0, cx1, cy1 = span
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = cells.get((layer, cx, cy))
+                if bucket is None:
+                    cells[(layer, cx, cy)] = [obj]
+                else:
+                    bucket.append(obj)
+        self._spans[obj] = (layer, cx0, cy0, cx1, cy1)
+
+    def _unlink(self, obj, entry):
+        cells = self._cells
+        layer, cx0, cy0, cx1, cy1 = entry
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                key = (layer, cx, cy)
+                bucket = cells[key]
+                bucket.remove(obj)
+                if not bucket:
+                    del cells[key]
+
+    def insert(self, obj, rect, layer):
+        """Registra obj nel layer con il rettangolo rect (se c'era già, lo sposta)."""
+        size = self.cell_size
+        self.remove(obj)
+        self._link(obj, layer, (rect.left // size, rect.top // size,
+                                (rect.right - 1) // size, (rect.bottom - 1) // size))
+
+    def insert_row(self, obj, rect, layer):
+        """Registra obj su tutta la larghezza dell'area di gioco, alle y di rect.
+
+        Per gli oggetti che si muovono solo in orizzontale: non serve mai spostarli.
+        """
+        size = self.cell_size
+        self.remove(obj)
+        self._link(obj, layer, (-1, rect.top // size, SCREEN_WIDTH // size + 1, (rect.bottom - 1) // size))
+
+    def move(self, obj, rect):
+        """Aggiorna la posizione di un oggetto registrato: nessun lavoro se resta nelle stesse celle."""
+        size = self.cell_size
+        entry = self._spans[obj]
+        cx0, cy0 = rect.left // size, rect.top // size
+        cx1, cy1 = (rect.right - 1) // size, (rect.bottom - 1) // size
+        if entry[1] != cx0 or entry[2] != cy0 or entry[3] != cx1 or entry[4] != cy1:
+            self._unlink(obj, entry)
+            self._link(obj, entry[0], (cx0, cy0, cx1, cy1))
+
+    def remove(self, obj):
+        """Toglie obj dalla griglia (nessun errore se non c'era)."""
+        entry = self._spans.pop(obj, None)
+        if entry is not None:
+            self._unlink(obj, entry)
+
+    def clear(self):
+        self._cells.clear()
+        self._spans.clear()
+
+    def query(self, rect):
+        """Celle toccate da rect, come Neighborhood: ogni manager ne legge il proprio layer."""
+        size = self.cell_size
+        return Neighborhood(self._cells, (rect.left // size, rect.top // size,
+                                          (rect.right - 1) // size, (rect.bottom - 1) // size))
@@ -0,0 +1,90 @@
+"""
+Cache condivisa degli sprite di cerchi semitrasparenti (scie, particelle, bagliori).
+
+Invece di creare a ogni disegno una Surface SRCALPHA, tracciarci un cerchio e blittarla,
+i chiamanti chiedono a circle_sprite() lo sprite già pronto per (raggio, colore, alpha).
+Colore e alpha vengono quantizzati a passi di COLOR_STEP e ALPHA_STEP: differenze così piccole
+non si vedono e le chiavi diverse restano poche. Gli sprite meno usati di recente escono quando
+la cache supera max_size (LRU).
+
+Gli sprite sono condivisi: chi li riceve li blitta e basta, senza disegnarci sopra.
+"""
+from collections import OrderedDict
+
+import pygame
+
+COLOR_STEP = 8   # passo di quantizzazione dei canali di colore
+ALPHA_STEP = 8   # passo di quantizzazione dell'alpha
+
+
+def _quantize_table(step):
+    """Valore quantizzato per ogni livello 0-255 (al multiplo di step più vicino, al massimo 255)."""
+    return tuple(min(255, (value + step // 2) // step * step) for value in range(256))
+
+
+COLOR_LEVELS = _quantize_table(COLOR_STEP)
+ALPHA_LEVELS = _quantize_table(ALPHA_STEP)
+
+
+class CircleSpriteCache:
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self._sprites = OrderedDict()  # chiave -> Surface, dalla meno alla più usata di recente
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._sprites)
+
+    def get(self, radius, color, alpha=255, width=0):
+        """Sprite (2*radius x 2*radius) con un cerchio di colore `color` (RGB) e trasparenza `alpha`.
+
+        width > 0 traccia solo il bordo, come pygame.draw.circle.
+        """
+        levels = COLOR_LEVELS
+        return self.lookup((int(radius), levels[int(color[0])], levels[int(color[1])],
+                            levels[int(color[2])], ALPHA_LEVELS[int(alpha)], width))
+
+    def lookup(self, key):
+        """Come get, con la chiave (raggio, r, g, b, alpha, width) già quantizzata.
+
+        Per chi quantizza in blocco con COLOR_LEVELS e ALPHA_LEVELS (per esempio con NumPy).
+        """
+        sprites = self._sprites
+        sprite = sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            sprites.move_to_end(key)
+            return sprite
+        self.misses += 1
+        r = key[0]
+        sprite = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, key[1:5], (r, r), r, key[5])
+        sprites[key] = sprite
+        if len(sprites) > self.max_size:
+            sprites.popitem(last=False)
+            self.evictions += 1
+        return sprite
+
+    def clear(self):
+        self._sprites.clear()
+
+    def stats(self):
+        """Contatori della cache: sprite riusati, creati, scartati e percentuale di riuso."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._sprites),
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+CIRCLE_SPRITES = CircleSpriteCache()
+
+
+def circle_sprite(radius, color, alpha=255, width=0):
+    """Sprite condiviso dalla cache di modulo (vedi CircleSpriteCache.get)."""
+    return CIRCLE_SPRITES.get(radius, color, alpha, width)
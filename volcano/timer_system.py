@@ -0,0 +1,48 @@
+"""
+Sistema di temporizzazione a passo fisso per il gioco Volcano
+"""
+from constants import SIM_TICK_RATE, BASE_TICK_RATE, MAX_FRAME_TIME, MAX_SIM_STEPS
+
+
+def tick_scale(dt):
+    """Converte dt (secondi) in "frame a 60 Hz", l'unità su cui sono tarate le costanti di gioco."""
+    return dt * BASE_TICK_RATE
+
+
+def lerp(a, b, t):
+    return a + (b - a) * t
+
+
+class FixedTimestep:
+    """Accumulatore a passo fisso: la simulazione avanza sempre di dt costante,
+    indipendentemente dalla frequenza di rendering."""
+
+    def __init__(self, tick_rate=SIM_TICK_RATE, max_frame_time=MAX_FRAME_TIME, max_steps=MAX_SIM_STEPS):
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.max_frame_time = max_frame_time
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.ticks = 0
+
+    def advance(self, frame_time):
+        """Aggiunge il tempo reale del frame e restituisce quanti tick simulare."""
+        # Dopo un blocco lungo (caricamenti, finestra trascinata) non recuperare tutto il ritardo
+        self.accumulator += min(frame_time, self.max_frame_time)
+        steps = int(self.accumulator * self.tick_rate)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.dt
+            self.accumulator = max(0.0, self.accumulator)
+        self.ticks += steps
+        return steps
+
+    @property
+    def alpha(self):
+        """Frazione [0, 1) del prossimo tick già trascorsa: peso per interpolare il rendering."""
+        return min(1.0, self.accumulator * self.tick_rate)
+
+    def reset(self):
+        self.accumulator = 0.0
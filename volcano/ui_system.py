@@ -5,6 +5,7 @@ import pygame
 import sys
 from constants import SCREEN_WIDTH, SCREEN_HEIGHT, MENU, PLAYING, SCORE_LIST, ENTER_NAME, GAME_OVER
 from save_system import get_top_scores, add_score
+from fonts import get_font, render_text, glyph_atlas, TITLE_FACE
 
 class UISystem:
     @staticmethod
@@ -36,26 +37,27 @@ class UISystem:
                     gradient_surface = pygame.Surface((fill_width, 1), pygame.SRCALPHA)
                     gradient_surface.fill(gradient_color)
                     screen.blit(gradient_surface, (bar_x, bar_y + i))
-        font = pygame.font.SysFont(None, 24)
-        label_text = font.render("Raffreddamento", True, (255, 255, 255))
+        font = get_font(24)
+        label_text = render_text(font, "Raffreddamento", (255, 255, 255))
         label_rect = label_text.get_rect()
         label_rect.centerx = bar_x + bar_width // 2
         label_rect.bottom = bar_y - 5
         screen.blit(label_text, label_rect)
-        timer_font = pygame.font.SysFont(None, 20)
+        timer_font = get_font(20)
         time_remaining = max(0, int(current_time))
         minutes = time_remaining // 60
         seconds = time_remaining % 60
-        timer_text = timer_font.render(f"{minutes:02d}:{seconds:02d}", True, (255, 180, 0))
-        timer_rect = timer_text.get_rect()
+        timer_digits = glyph_atlas(timer_font, (255, 180, 0))
+        timer_str = f"{minutes:02d}:{seconds:02d}"
+        timer_rect = pygame.Rect((0, 0), timer_digits.size(timer_str))
         timer_rect.centerx = bar_x + bar_width // 2
         timer_rect.top = bar_y + bar_height + 5
-        screen.blit(timer_text, timer_rect)
+        timer_digits.draw(screen, timer_str, timer_rect.topleft)
     def __init__(self):
-        self.font_big = pygame.font.Font(None, 64)
-        self.font_medium = pygame.font.Font(None, 48)
-        self.font_small = pygame.font.Font(None, 32)
-        self.font_tiny = pygame.font.Font(None, 24)
+        self.font_big = get_font(64)
+        self.font_medium = get_font(48)
+        self.font_small = get_font(32)
+        self.font_tiny = get_font(24)
         
         # Colori
         self.white = (255, 255, 255)
@@ -65,6 +67,7 @@ class UISystem:
         self.gray = (128, 128, 128)
         self.dark_gray = (64, 64, 64)
         self.blue = (100, 150, 255)
+        self.yellow = (255, 255, 0)
         
         # Menu principale
         self.menu_selected = 0
@@ -78,7 +81,7 @@ class UISystem:
     def draw_how_to_play(self, screen):
         """Schermata di spiegazione del gioco."""
         screen.fill(self.black)
-        title = self.font_big.render("COME SI GIOCA", True, self.orange)
+        title = render_text(self.font_big, "COME SI GIOCA", self.orange)
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 100))
         screen.blit(title, title_rect)
 
@@ -95,7 +98,7 @@ class UISystem:
             "Premi ESC per tornare al menu."
         ]
         for i, line in enumerate(lines):
-            text = self.font_small.render(line, True, self.white)
+            text = render_text(self.font_small, line, self.white)
             text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, 180 + i * 40))
             screen.blit(text, text_rect)
         
@@ -107,22 +110,19 @@ class UISystem:
             pygame.draw.line(screen, (color_value, color_value // 2, 0), (0, y), (SCREEN_WIDTH, y))
         
         # Titolo accattivante
-        try:
-            font_title = pygame.font.SysFont("Comic Sans MS", 80, bold=True)
-        except:
-            font_title = pygame.font.Font(None, 80)
-        title = font_title.render("Buuum Jump!", True, (255, 80, 0))
+        font_title = get_font(80, TITLE_FACE, bold=True)
+        title = render_text(font_title, "Buuum Jump!", (255, 80, 0))
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 150))
         screen.blit(title, title_rect)
 
         # Effetto ombra
-        shadow = font_title.render("Buuum Jump!", True, (80, 0, 0))
+        shadow = render_text(font_title, "Buuum Jump!", (80, 0, 0))
         shadow_rect = shadow.get_rect(center=(SCREEN_WIDTH // 2 + 4, 154))
         screen.blit(shadow, shadow_rect)
 
         # Sottotitolo simpatico
-        font_sub = pygame.font.SysFont("Comic Sans MS", 40)
-        subtitle = font_sub.render("Salta, esplodi e divertiti!", True, (255, 200, 0))
+        font_sub = get_font(40, TITLE_FACE)
+        subtitle = render_text(font_sub, "Salta, esplodi e divertiti!", (255, 200, 0))
         subtitle_rect = subtitle.get_rect(center=(SCREEN_WIDTH // 2, 210))
         screen.blit(subtitle, subtitle_rect)
         
@@ -130,7 +130,7 @@ class UISystem:
         start_y = 300
         for i, option in enumerate(self.menu_options):
             color = self.orange if i == self.menu_selected else self.white
-            text = self.font_medium.render(option, True, color)
+            text = render_text(self.font_medium, option, color)
             text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, start_y + i * 60))
             
             # Evidenzia opzione selezionata
@@ -147,7 +147,7 @@ class UISystem:
         ]
         
         for i, instruction in enumerate(instructions):
-            text = self.font_tiny.render(instruction, True, self.gray)
+            text = render_text(self.font_tiny, instruction, self.gray)
             text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100 + i * 25))
             screen.blit(text, text_rect)
     
@@ -157,7 +157,7 @@ class UISystem:
         screen.fill(self.black)
         
         # Titolo
-        title = self.font_big.render("CLASSIFICHE", True, self.orange)
+        title = render_text(self.font_big, "CLASSIFICHE", self.orange)
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 80))
         screen.blit(title, title_rect)
         
@@ -165,7 +165,7 @@ class UISystem:
         scores = get_top_scores()
         
         if not scores:
-            no_scores = self.font_medium.render("Nessun punteggio ancora!", True, self.white)
+            no_scores = render_text(self.font_medium, "Nessun punteggio ancora!", self.white)
             no_scores_rect = no_scores.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
             screen.blit(no_scores, no_scores_rect)
         else:
@@ -175,7 +175,7 @@ class UISystem:
             header_positions = [100, 250, 400, 550]
             
             for i, header in enumerate(headers):
-                text = self.font_small.render(header, True, self.orange)
+                text = render_text(self.font_small, header, self.orange)
                 screen.blit(text, (header_positions[i], header_y))
             
             # Linea separatore
@@ -187,24 +187,24 @@ class UISystem:
                 color = self.white if i > 2 else [self.orange, self.white, (200, 200, 200)][i]
                 
                 # Posizione
-                pos_text = self.font_small.render(f"{i+1}.", True, color)
+                pos_text = render_text(self.font_small, f"{i+1}.", color)
                 screen.blit(pos_text, (header_positions[0], y_pos))
                 
                 # Nome
-                name_text = self.font_small.render(score['name'][:15], True, color)
+                name_text = render_text(self.font_small, score['name'][:15], color)
                 screen.blit(name_text, (header_positions[1], y_pos))
                 
                 # Punteggio
-                score_text = self.font_small.render(str(score['score']), True, color)
+                score_text = render_text(self.font_small, str(score['score']), color)
                 screen.blit(score_text, (header_positions[2], y_pos))
                 
                 # Data
                 date_str = score['date'].split(' ')[0]  # Solo la data, senza ora
-                date_text = self.font_small.render(date_str, True, color)
+                date_text = render_text(self.font_small, date_str, color)
                 screen.blit(date_text, (header_positions[3], y_pos))
         
         # Istruzioni per tornare
-        back_text = self.font_small.render("Premi ESC per tornare al menu", True, self.gray)
+        back_text = render_text(self.font_small, "Premi ESC per tornare al menu", self.gray)
         back_rect = back_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 50))
         screen.blit(back_text, back_rect)
     
@@ -226,17 +226,17 @@ class UISystem:
         pygame.draw.rect(screen, self.orange, (box_x, box_y, box_width, box_height), 3, 10)
         
         # Titolo
-        title = self.font_big.render("VITTORIA!", True, self.orange)
+        title = render_text(self.font_big, "VITTORIA!", self.orange)
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, box_y + 50))
         screen.blit(title, title_rect)
         
         # Punteggio
-        score_text = self.font_medium.render(f"Punteggio: {score}", True, self.white)
+        score_text = render_text(self.font_medium, f"Punteggio: {score}", self.white)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, box_y + 100))
         screen.blit(score_text, score_rect)
         
         # Label input
-        label = self.font_small.render("Inserisci il tuo nome:", True, self.white)
+        label = render_text(self.font_small, "Inserisci il tuo nome:", self.white)
         label_rect = label.get_rect(center=(SCREEN_WIDTH // 2, box_y + 150))
         screen.blit(label, label_rect)
         
@@ -250,7 +250,7 @@ class UISystem:
         pygame.draw.rect(screen, self.black, (input_x + 2, input_y + 2, input_box_width - 4, input_box_height - 4))
         
         # Testo input
-        input_surface = self.font_medium.render(self.input_text, True, self.white)
+        input_surface = render_text(self.font_medium, self.input_text, self.white)
         screen.blit(input_surface, (input_x + 10, input_y + 8))
         
         # Cursore lampeggiante
@@ -259,7 +259,7 @@ class UISystem:
             pygame.draw.line(screen, self.white, (cursor_x, input_y + 5), (cursor_x, input_y + input_box_height - 5), 2)
         
         # Istruzioni
-        instructions = self.font_tiny.render("Premi INVIO per salvare", True, self.gray)
+        instructions = render_text(self.font_tiny, "Premi INVIO per salvare", self.gray)
         instructions_rect = instructions.get_rect(center=(SCREEN_WIDTH // 2, box_y + 250))
         screen.blit(instructions, instructions_rect)
     
@@ -272,16 +272,16 @@ class UISystem:
         screen.blit(overlay, (0, 0))
         
         # Testo Game Over
-        game_over_text = self.font_big.render("GAME OVER", True, self.red)
+        game_over_text = render_text(self.font_big, "GAME OVER", self.red)
         game_over_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
         screen.blit(game_over_text, game_over_rect)
         
         # Istruzioni
-        restart_text = self.font_medium.render("R - Ricomincia", True, self.white)
+        restart_text = render_text(self.font_medium, "R - Ricomincia", self.white)
         restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20))
         screen.blit(restart_text, restart_rect)
         
-        menu_text = self.font_medium.render("ESC - Menu Principale", True, self.white)
+        menu_text = render_text(self.font_medium, "ESC - Menu Principale", self.white)
         menu_rect = menu_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60))
         screen.blit(menu_text, menu_rect)
     
@@ -306,7 +306,34 @@ class UISystem:
             elif len(self.input_text) < 15 and event.unicode.isprintable():
                 self.input_text += event.unicode
         return False
-    
+
+    def draw_overwrite_prompt(self, screen, name):
+        """Disegna la domanda per un nome già presente in classifica."""
+        msg = f"Il nome '{name}' esiste già. Sovrascrivere? (S/N)"
+        screen.blit(render_text(self.font_small, msg, self.yellow), (50, 200))
+
+    def handle_overwrite_input(self, event):
+        """Risposta alla domanda di sovrascrittura: True (S), False (N) o None."""
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_s:
+                return True
+            elif event.key == pygame.K_n:
+                return False
+        return None
+
+    def confirm_overwrite(self, screen, name):
+        """Mostra la domanda di sovrascrittura e attende S o N.
+
+        Restituisce True per sovrascrivere il punteggio esistente, False per salvarlo con un numero.
+        """
+        self.draw_overwrite_prompt(screen, name)
+        pygame.display.flip()
+        while True:
+            for event in pygame.event.get():
+                answer = self.handle_overwrite_input(event)
+                if answer is not None:
+                    return answer
+
     def update(self, dt):
         """Aggiorna l'UI (per cursore lampeggiante)."""
         self.cursor_timer += dt